@@ -0,0 +1,106 @@
+"""Per-file cache of repo_analyzer results, shared across projects by repo_url.
+
+A file is recognised as unchanged by its (size, mtime, inode) without being
+read; workspaces hardlinked from the same base checkout share inodes, so a
+second project on a repo hits on every file it has not written. Otherwise
+the analyzer hashes the file and only parses it when no result is cached
+for that content. Entries are versioned by repo_analyzer.ANALYZER_VERSION.
+
+load() and save() take a sync Session: load from a thread through
+database.run_in_session, since it reads and decodes every row of the repo;
+save is a db_writer command.
+"""
+import json
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database import FileAnalysis
+from repo_analyzer import ANALYZER_VERSION
+
+# Content versions kept per path; older ones are pruned on save
+MAX_VERSIONS_PER_PATH = 4
+
+
+class FileAnalysisCache:
+    def __init__(self, repo_url: str, rows: List[tuple]):
+        # rows: (id, path, content_hash, size, mtime_ns, inode, result), oldest first
+        self.repo_url = repo_url
+        self._by_path: Dict[str, List[tuple]] = defaultdict(list)
+        self._by_stat: Dict[tuple, dict] = {}
+        for row in rows:
+            self._by_path[row[1]].append(row)
+            self._by_stat[row[1], row[3], row[4], row[5]] = row[6]
+        self.inserts: List[dict] = []
+        self.restats: List[dict] = []
+
+    def lookup_stat(self, path: str, size: int, mtime_ns: int, inode: int) -> Optional[dict]:
+        return self._by_stat.get((path, size, mtime_ns, inode))
+
+    def hashes(self, path: str) -> FrozenSet[str]:
+        return frozenset(row[2] for row in self._by_path.get(path, ()))
+
+    def lookup_hash(self, path: str, content_hash: str) -> dict:
+        return next(row[6] for row in self._by_path[path] if row[2] == content_hash)
+
+    def record(self, result: dict, size: int, mtime_ns: int, inode: int):
+        """Remember a fresh result, or the new stat of a known content hash."""
+        path, content_hash = result["path"], result["hash"]
+        for row_id, _, row_hash, *row_stat, _ in self._by_path.get(path, ()):
+            if row_hash == content_hash:
+                if row_stat != [size, mtime_ns, inode]:
+                    self.restats.append({"row_id": row_id, "size": size, "mtime_ns": mtime_ns, "inode": inode})
+                return
+        self.inserts.append({
+            "repo_url": self.repo_url, "analyzer_version": ANALYZER_VERSION, "path": path,
+            "content_hash": content_hash, "size": size, "mtime_ns": mtime_ns, "inode": inode,
+            "result": json.dumps(result, sort_keys=True),
+        })
+
+    def pruned_ids(self) -> List[int]:
+        # Keep room for this run's new versions; the oldest go first
+        ids = []
+        for entry in self.inserts:
+            rows = self._by_path.get(entry["path"], ())
+            excess = len(rows) + 1 - MAX_VERSIONS_PER_PATH
+            ids.extend(row[0] for row in rows[:max(excess, 0)])
+        return ids
+
+
+def load(db: Session, repo_url: str) -> FileAnalysisCache:
+    """The cache of repo_url. Reads and decodes every row: call it from a thread."""
+    rows = db.execute(
+        select(FileAnalysis.id, FileAnalysis.path, FileAnalysis.content_hash, FileAnalysis.size,
+               FileAnalysis.mtime_ns, FileAnalysis.inode, FileAnalysis.result)
+        .where(FileAnalysis.repo_url == repo_url, FileAnalysis.analyzer_version == ANALYZER_VERSION)
+        .order_by(FileAnalysis.id)
+    ).all()
+    # One JSON document for all results: per-row json.loads costs more than parsing
+    results = json.loads("[" + ",".join(row[6] for row in rows) + "]")
+    return FileAnalysisCache(repo_url, [(*row[:6], result) for row, result in zip(rows, results)])
+
+
+def _insert_ignoring_duplicates(db: Session):
+    # Two projects on the same repo may analyse it at once; identical rows
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(FileAnalysis).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(FileAnalysis).on_conflict_do_nothing()
+    return insert(FileAnalysis)
+
+
+def save(db: Session, cache: FileAnalysisCache):
+    """db_writer command: persist what the last analyze() run recorded."""
+    stale = cache.pruned_ids()
+    if stale:
+        db.execute(delete(FileAnalysis).where(FileAnalysis.id.in_(stale)))
+    if cache.inserts:
+        db.execute(_insert_ignoring_duplicates(db), cache.inserts)
+    if cache.restats:
+        table = FileAnalysis.__table__
+        db.execute(update(table).where(table.c.id == bindparam("row_id")), cache.restats)
+    db.flush()
@@ -0,0 +1,132 @@
+"""Backfill and dictionary tooling for CompressedText columns.
+
+Rewrites every stored value of the compressed columns into the current
+encoding (COMPRESS_MIN_BYTES, COMPRESSION_DICT_ID, zstd when installed):
+rows written before compression existed, or under an older dictionary, are
+re-encoded in keyset-ordered batches with a commit per batch, so the API can
+keep running. Rows already in the current encoding are left untouched, so it
+is safe to re-run.
+
+    cd backend && python backfill_compression.py
+    cd backend && python backfill_compression.py --train-dictionary 2
+
+--train-dictionary N builds dictionaries/text-vN.dict from the templates and
+the stored content. Ship it, then bump COMPRESSION_DICT_ID and backfill;
+never overwrite a dictionary that rows already reference.
+"""
+import argparse
+import os
+from collections import Counter
+
+from sqlalchemy import LargeBinary, bindparam, text
+
+from database import COMPRESSION_DICTS_DIR, SessionLocal, compress_text, decompress_text, init_db
+from template_store import TEMPLATES_DIR
+
+# (table, primary key, compressed column)
+COMPRESSED_COLUMNS = [
+    ("execution_logs", "id", "content"),
+    ("blobs", "hash", "content"),
+]
+
+# zlib only looks back 32 KiB, so a larger dictionary is never used
+DICT_SIZE = 32 * 1024
+
+
+def _stored_size(value) -> int:
+    return len(value.encode("utf-8")) if isinstance(value, str) else len(value)
+
+
+def backfill(batch_size: int):
+    db = SessionLocal()
+    try:
+        for table, pk, column in COMPRESSED_COLUMNS:
+            select_batch = text(f"SELECT {pk}, {column} FROM {table} WHERE {pk} > :after ORDER BY {pk} LIMIT :limit")
+            # Values are already encoded; bind them as bytes, not through CompressedText
+            rewrite = text(f"UPDATE {table} SET {column} = :value WHERE {pk} = :key").bindparams(
+                bindparam("value", type_=LargeBinary)
+            )
+            after = "" if pk == "hash" else 0
+            rows_seen = rows_rewritten = bytes_before = bytes_after = 0
+            while True:
+                rows = db.execute(select_batch, {"after": after, "limit": batch_size}).all()
+                if not rows:
+                    break
+                updates = []
+                for key, stored in rows:
+                    encoded = compress_text(decompress_text(stored))
+                    bytes_before += _stored_size(stored)
+                    bytes_after += len(encoded)
+                    if isinstance(stored, str) or bytes(stored) != encoded:
+                        updates.append({"key": key, "value": encoded})
+                if updates:
+                    db.execute(rewrite, updates)
+                db.commit()
+                rows_seen += len(rows)
+                rows_rewritten += len(updates)
+                after = rows[-1][0]
+            saved = 100 * (1 - bytes_after / bytes_before) if bytes_before else 0.0
+            print(f"{table}.{column}: {rows_rewritten}/{rows_seen} rows rewritten, "
+                  f"{bytes_before} -> {bytes_after} bytes ({saved:.1f}% saved)")
+    finally:
+        db.close()
+
+
+def _training_samples() -> list:
+    samples = []
+    for root, _, files in os.walk(TEMPLATES_DIR):
+        for name in sorted(files):
+            with open(os.path.join(root, name), encoding="utf-8", errors="replace") as f:
+                samples.append(f.read())
+    db = SessionLocal()
+    try:
+        for table, pk, column in COMPRESSED_COLUMNS:
+            rows = db.execute(text(f"SELECT {column} FROM {table} ORDER BY {pk} DESC LIMIT 5000")).scalars()
+            samples.extend(decompress_text(stored) for stored in rows)
+    finally:
+        db.close()
+    return samples
+
+
+def train_dictionary(dict_id: int):
+    """Raw-content dictionary of the lines shared by the most samples.
+
+    Lines are ranked by how many samples contain them times their length;
+    the best end up last, closest to the data, where both zlib and zstd find
+    them with the shortest back-references.
+    """
+    path = os.path.join(COMPRESSION_DICTS_DIR, f"text-v{dict_id}.dict")
+    if os.path.exists(path):
+        raise SystemExit(f"{path} already exists; dictionaries are immutable once shipped")
+    samples = _training_samples()
+    document_frequency = Counter()
+    for sample in samples:
+        document_frequency.update({line for line in sample.splitlines() if len(line.strip()) >= 8})
+    ranked = sorted(
+        (line for line, count in document_frequency.items() if count >= 2),
+        key=lambda line: (document_frequency[line] * len(line), line),
+        reverse=True,
+    )
+    chosen, size = [], 0
+    for line in ranked:
+        encoded = line.encode("utf-8") + b"\n"
+        if size + len(encoded) > DICT_SIZE:
+            continue
+        chosen.append(encoded)
+        size += len(encoded)
+    os.makedirs(COMPRESSION_DICTS_DIR, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"".join(reversed(chosen)))
+    print(f"wrote {path}: {size} bytes, {len(chosen)} lines from {len(samples)} samples")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--train-dictionary", type=int, metavar="ID", help="write dictionaries/text-v<ID>.dict instead of backfilling")
+    args = parser.parse_args()
+    init_db()
+    if args.train_dictionary is not None:
+        train_dictionary(args.train_dictionary)
+    else:
+        backfill(args.batch_size)
@@ -0,0 +1,93 @@
+"""Fail if any hot endpoint query needs a full table scan.
+
+Builds a throwaway SQLite database through init_db (so the migrations run),
+then runs EXPLAIN QUERY PLAN on the queries behind the endpoints the UI
+polls. Exits non-zero and prints the offending plans if any step is a SCAN.
+
+    cd backend && python benchmarks/check_query_plans.py
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='plans-'), 'plans.db')}"
+
+from datetime import datetime  # noqa: E402
+
+from sqlalchemy import func, or_, select, text  # noqa: E402
+
+from database import (  # noqa: E402
+    engine, init_db, ExecutionLog, ExecutionState, Phase, Plan, PR, Project,
+    ProjectRevision, SymbolDefinition, SymbolFile, SymbolReference, SystemDesign, Task, TaskStatusCount,
+    WorkspaceCheckpoint,
+)
+
+HOT_QUERIES = {
+    "projects.get_project": select(Project).where(Project.id == 1),
+    "plan.get_plan": select(Plan).where(Plan.project_id == 1).order_by(Plan.id.desc()).limit(1),
+    "tasks.get_tasks revision": select(ProjectRevision.tasks_revision).where(ProjectRevision.project_id == 1),
+    "tasks.get_tasks tree": select(Phase.id, Task.id)
+        .outerjoin(Task, Task.phase_id == Phase.id)
+        .where(Phase.project_id == 1)
+        .order_by(Phase.phase_number, Task.task_number),
+    "design.get_design": select(SystemDesign).where(SystemDesign.phase_id == 1),
+    "design.approve_all phases": select(Phase).where(Phase.project_id == 1),
+    "execution.status state": select(ExecutionState).where(ExecutionState.project_id == 1),
+    "execution.status counters": select(TaskStatusCount.status, TaskStatusCount.count).where(TaskStatusCount.project_id == 1),
+    "execution.status counts fallback": select(Task.status, func.count()).where(Task.project_id == 1).group_by(Task.status),
+    "execution.logs": select(ExecutionLog).where(ExecutionLog.project_id == 1, ExecutionLog.id > 0)
+        .order_by(ExecutionLog.id).limit(500),
+    "execution.logs by task": select(ExecutionLog).where(
+        ExecutionLog.project_id == 1, ExecutionLog.id > 0, ExecutionLog.task_id == 1
+    ).order_by(ExecutionLog.id).limit(500),
+    "execution.logs newest": select(ExecutionLog).where(ExecutionLog.project_id == 1, ExecutionLog.id < 1000)
+        .order_by(ExecutionLog.id.desc()).limit(500),
+    "execution.pending tasks": select(Task, Phase.phase_number).join(Phase, Phase.id == Task.phase_id)
+        .where(Phase.project_id == 1, Task.status == "pending")
+        .order_by(Phase.phase_number, Task.task_number),
+    "execution.recovery sweep": select(ExecutionState.project_id).where(
+        ExecutionState.status.in_(("running", "paused")),
+        or_(ExecutionState.lease_owner.is_(None), ExecutionState.lease_expires_at < datetime.utcnow()),
+    ),
+    "testing.test_logs": select(ExecutionLog).where(
+        ExecutionLog.project_id == 1, ExecutionLog.log_type == "test_result"
+    ).order_by(ExecutionLog.id.desc()).limit(50),
+    "testing.test_logs since": select(ExecutionLog).where(
+        ExecutionLog.project_id == 1, ExecutionLog.log_type == "test_result", ExecutionLog.id > 0
+    ).order_by(ExecutionLog.id).limit(50),
+    "repos.find_symbol definitions": select(SymbolDefinition.name, SymbolFile.path)
+        .join(SymbolFile, SymbolFile.id == SymbolDefinition.file_id)
+        .where(SymbolDefinition.project_id == 1, SymbolDefinition.name == "handleHotkey")
+        .order_by(SymbolDefinition.name, SymbolDefinition.id).limit(100),
+    "repos.find_symbol references": select(SymbolReference.name, SymbolFile.path)
+        .join(SymbolFile, SymbolFile.id == SymbolReference.file_id)
+        .where(SymbolReference.project_id == 1, SymbolReference.name >= "handle", SymbolReference.name < "handlf")
+        .order_by(SymbolReference.name, SymbolReference.file_id).limit(100),
+    "repos.get_file_symbols": select(SymbolDefinition).where(SymbolDefinition.file_id == 1).order_by(SymbolDefinition.line),
+    "symbol_index.indexed_files": select(SymbolFile.path, SymbolFile.content_hash).where(SymbolFile.project_id == 1),
+    "repos.list_checkpoints": select(WorkspaceCheckpoint).where(WorkspaceCheckpoint.project_id == 1)
+        .order_by(WorkspaceCheckpoint.id.desc()).limit(100),
+    "pr.get_pr": select(PR).where(PR.project_id == 1).order_by(PR.id.desc()).limit(1),
+}
+
+
+def main() -> int:
+    init_db()
+    failures = 0
+    with engine.connect() as conn:
+        for name, query in HOT_QUERIES.items():
+            sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+            plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+            scans = [step for step in plan if step.startswith("SCAN")]
+            print(f"{'FAIL' if scans else 'ok  '}  {name}")
+            if scans:
+                failures += 1
+                for step in plan:
+                    print(f"        {step}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
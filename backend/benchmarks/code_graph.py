@@ -0,0 +1,107 @@
+"""Python import/call graph: parse, link and impact-query times.
+
+Generates --modules Python modules in --packages packages, each importing and
+calling a few modules of lower-numbered packages, plus a test module per
+package. Times repo_analyzer.scan (ast parsing in the worker pool) cold and
+against a warm analysis cache, code_graph.build, and impact queries for a
+leaf module and a core module.
+
+    cd backend && python benchmarks/code_graph.py --modules 20000
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORKDIR = tempfile.mkdtemp(prefix="graph-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORKDIR, 'graph.db')}"
+
+import analysis_cache  # noqa: E402
+import code_graph  # noqa: E402
+import repo_analyzer  # noqa: E402
+from database import SessionLocal, init_db  # noqa: E402
+
+REPO_URL = "https://github.com/example/graph-benchmark"
+
+
+def _generate(root: str, modules: int, packages: int):
+    rng = random.Random(0)
+    per_package = max(modules // packages, 1)
+    for n in range(modules):
+        package = n // per_package
+        directory = os.path.join(root, "service", f"pkg{package}")
+        os.makedirs(directory, exist_ok=True)
+        deps = sorted({rng.randrange(n) for _ in range(3)}) if n else []
+        lines = [f"from service.pkg{d // per_package}.mod{d} import Handler{d}\n" for d in deps]
+        lines.append(f"\n\nclass Handler{n}:\n    def __init__(self):\n")
+        lines += [f"        self.dep{d} = Handler{d}()\n" for d in deps] or ["        pass\n"]
+        lines.append("\n    def handle(self, request):\n")
+        lines += [f"        self.dep{d}.handle(request)\n" for d in deps]
+        lines.append("        return request\n")
+        with open(os.path.join(directory, f"mod{n}.py"), "w") as f:
+            f.write("".join(lines))
+    for package in range(packages):
+        tests = os.path.join(root, "tests", f"pkg{package}")
+        os.makedirs(tests, exist_ok=True)
+        first = package * per_package
+        with open(os.path.join(tests, "test_handlers.py"), "w") as f:
+            f.write(f"from service.pkg{package}.mod{first} import Handler{first}\n\n"
+                    f"def test_handle():\n    assert Handler{first}().handle(1) == 1\n")
+
+
+def _analyze(root: str):
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        cache = analysis_cache.load(db, REPO_URL)
+        scan = repo_analyzer.scan(root, 3600, cache=cache)
+        analysis_cache.save(db, cache)
+        db.commit()
+        return scan, time.perf_counter() - started
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, default=20_000)
+    parser.add_argument("--packages", type=int, default=200)
+    args = parser.parse_args()
+
+    root = os.path.join(WORKDIR, "repo")
+    try:
+        _generate(root, args.modules, args.packages)
+        init_db()
+        scan, cold = _analyze(root)
+        _, warm = _analyze(root)
+        started = time.perf_counter()
+        graph = code_graph.CodeGraph(code_graph.build(scan.results))
+        built = time.perf_counter() - started
+        edges = sum(map(len, graph.calls.values()))
+        print(f"{len(graph.modules)} modules, {edges} call edges; scan cold {cold:.1f} s, warm {warm:.1f} s "
+              f"with {repo_analyzer.ANALYZE_PROCESSES} process(es); build {built * 1000:.0f} ms")
+
+        per_package = max(args.modules // args.packages, 1)
+        for label, n in (("leaf module", args.modules - 1), ("core module", 0)):
+            path = os.path.join("service", f"pkg{n // per_package}", f"mod{n}.py")
+            durations = []
+            for _ in range(5):
+                started = time.perf_counter()
+                result = graph.impact([path])
+                durations.append(time.perf_counter() - started)
+            print(f"impact of {label:<12} {statistics.median(durations) * 1000:7.1f} ms: "
+                  f"{len(result['modules'])} modules, {len(result['tests'])} tests")
+    finally:
+        repo_analyzer.shutdown()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Trigram-indexed code search vs a brute-force scan of the workspace.
+
+Generates --files source files of about --file-bytes each, indexes them with
+code_search.update into a throwaway REPOS_DIR, then times the same queries
+through the index and by reading every file (a project without an index).
+Also times the incremental update after one file is rewritten.
+
+    cd backend && python benchmarks/code_search.py --files 20000
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORKDIR = tempfile.mkdtemp(prefix="search-")
+os.environ["REPOS_DIR"] = os.path.join(WORKDIR, "repos")
+
+import code_search  # noqa: E402
+import repo_analyzer  # noqa: E402
+
+INDEXED, UNINDEXED = 1, 2
+WORDS = ["request", "response", "handler", "session", "config", "render", "update", "model", "query", "cache",
+         "user", "order", "payment", "schema", "router", "token", "event", "stream", "buffer", "record"]
+QUERIES = [
+    ("rare literal", "computeInvoiceTotal_4242", False, False),
+    ("common literal", "return", False, False),
+    ("case-sensitive", "HandlerRegistry", False, True),
+    ("regex", r"def \w+_session_\d+\(", True, False),
+]
+
+
+def _generate(root: str, files: int, file_bytes: int) -> list:
+    rng = random.Random(0)
+    paths = []
+    for n in range(files):
+        rel_path = os.path.join("src", f"pkg{n % 100}", f"module{n}.py")
+        os.makedirs(os.path.join(root, os.path.dirname(rel_path)), exist_ok=True)
+        lines = [f"from pkg{rng.randrange(100)} import {rng.choice(WORDS)}\n"]
+        while sum(map(len, lines)) < file_bytes:
+            a, b = rng.choice(WORDS), rng.choice(WORDS)
+            lines.append(f"def {a}_{b}_{rng.randrange(10000)}({b}):\n    return {a}.{b}({rng.randrange(100)})\n")
+        if n % 5000 == 42:
+            lines.append("def computeInvoiceTotal_4242(order):\n    return HandlerRegistry.total(order)\n")
+        with open(os.path.join(root, rel_path), "w") as f:
+            f.write("".join(lines))
+        paths.append(rel_path)
+    return paths
+
+
+def _median_ms(fn, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--file-bytes", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    root = os.path.join(WORKDIR, "repo")
+    try:
+        paths = _generate(root, args.files, args.file_bytes)
+        source_bytes = sum(os.path.getsize(os.path.join(root, p)) for p in paths)
+        started = time.perf_counter()
+        stats = code_search.update(INDEXED, root, paths, time_budget=3600)
+        index_bytes = sum(os.path.getsize(os.path.join(code_search.index_dir(INDEXED), name))
+                          for name in os.listdir(code_search.index_dir(INDEXED)))
+        print(f"indexed {stats['indexed']} files ({source_bytes / 2**20:.0f} MiB) in {time.perf_counter() - started:.1f} s "
+              f"with {repo_analyzer.ANALYZE_PROCESSES} process(es): {stats['shards']} shards, "
+              f"{index_bytes / 2**20:.1f} MiB on disk")
+
+        print(f"{'query':<16} {'indexed':>10} {'brute force':>12}  candidates  matches")
+        for label, query, regex, case_sensitive in QUERIES:
+            def run(project_id):
+                return code_search.search(project_id, root, query, regex, case_sensitive, limit=100, time_budget=3600)
+            result = run(INDEXED)
+            assert result["matches"] == run(UNINDEXED)["matches"], label
+            indexed = _median_ms(lambda: run(INDEXED), args.repeat)
+            brute = _median_ms(lambda: run(UNINDEXED), max(args.repeat // 2, 1))
+            print(f"{label:<16} {indexed:8.1f} ms {brute:9.1f} ms  {result['candidates']:>10}  {len(result['matches']):>7}")
+
+        target = paths[len(paths) // 2]
+        with open(os.path.join(root, target), "a") as f:
+            f.write("def freshlyWrittenFunction():\n    pass\n")
+        started = time.perf_counter()
+        code_search.update(INDEXED, root, [target])
+        elapsed = (time.perf_counter() - started) * 1000
+        found = code_search.search(INDEXED, root, "freshlyWrittenFunction")["matches"]
+        print(f"update one file  {elapsed:8.1f} ms; found in {[m['path'] for m in found]}")
+    finally:
+        repo_analyzer.shutdown()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
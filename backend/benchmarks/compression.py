@@ -0,0 +1,101 @@
+"""Read/write cost of CompressedText against the bytes it saves.
+
+Takes every execution log and blob from an existing database as the corpus
+(run a few demo projects first) and encodes it as plain text, zlib, zlib
+with the shipped dictionary and, when zstandard is installed, zstd with and
+without it. Each configuration is then written to and read back from a
+throwaway SQLite table, to show the cost at the database boundary.
+
+    cd backend && python benchmarks/compression.py --source sqlite:///./build_agent.db
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, create_engine, insert, select, text  # noqa: E402
+
+import database  # noqa: E402
+from database import COMPRESSION_DICT_ID, CompressedText, decompress_text  # noqa: E402
+
+
+def _corpus(source: str) -> list:
+    source_engine = create_engine(source)
+    with source_engine.connect() as conn:
+        values = [decompress_text(v) for v in conn.execute(text("SELECT content FROM execution_logs")).scalars()]
+        values += [decompress_text(v) for v in conn.execute(text("SELECT content FROM blobs")).scalars()]
+    source_engine.dispose()
+    return values
+
+
+def _configurations() -> list:
+    configurations = [("plain", None, 0), ("zlib", "zlib", 0), (f"zlib+dict v{COMPRESSION_DICT_ID}", "zlib", COMPRESSION_DICT_ID)]
+    if database.zstandard is not None:
+        configurations += [("zstd", "zstd", 0), (f"zstd+dict v{COMPRESSION_DICT_ID}", "zstd", COMPRESSION_DICT_ID)]
+    return configurations
+
+
+def _measure(values: list, codec: str, dict_id: int, workdir: str) -> dict:
+    # CompressedText encodes with whatever codec and dictionary are current
+    zstandard, current_dict_id = database.zstandard, database.COMPRESSION_DICT_ID
+    database.zstandard = zstandard if codec == "zstd" else None
+    database.COMPRESSION_DICT_ID = dict_id
+    try:
+        column_type = CompressedText() if codec else Text()
+        started = time.perf_counter()
+        encoded = [database.compress_text(v) for v in values] if codec else [v.encode("utf-8") for v in values]
+        encode_time = time.perf_counter() - started
+        started = time.perf_counter()
+        for stored in encoded:
+            decompress_text(stored) if codec else stored.decode("utf-8")
+        decode_time = time.perf_counter() - started
+
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, f'{codec}-{dict_id}.db')}")
+        table = Table("samples", MetaData(), Column("id", Integer, primary_key=True), Column("content", column_type))
+        table.metadata.create_all(engine)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(insert(table), [{"content": v} for v in values])
+        write_time = time.perf_counter() - started
+        started = time.perf_counter()
+        with engine.connect() as conn:
+            assert conn.execute(select(table.c.content).order_by(table.c.id)).scalars().all() == values
+        read_time = time.perf_counter() - started
+        engine.dispose()
+    finally:
+        database.zstandard, database.COMPRESSION_DICT_ID = zstandard, current_dict_id
+    return {
+        "bytes": sum(len(e) for e in encoded),
+        "encode_us": encode_time / len(values) * 1e6,
+        "decode_us": decode_time / len(values) * 1e6,
+        "write_ms": write_time * 1000,
+        "read_ms": read_time * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=os.getenv("DATABASE_URL", "sqlite:///./build_agent.db"))
+    args = parser.parse_args()
+
+    values = _corpus(args.source)
+    if not values:
+        raise SystemExit("source database has no logs or blobs; run a demo project first")
+    print(f"{len(values)} values, threshold {database.COMPRESS_MIN_BYTES} bytes")
+    print(f"{'':<18} {'stored':>10} {'saved':>7} {'encode':>11} {'decode':>11} {'db write':>10} {'db read':>10}")
+    workdir = tempfile.mkdtemp(prefix="compression-")
+    baseline = None
+    for name, codec, dict_id in _configurations():
+        result = _measure(values, codec, dict_id, workdir)
+        baseline = baseline or result["bytes"]
+        print(f"{name:<18} {result['bytes']:>10} {100 * (1 - result['bytes'] / baseline):6.1f}% "
+              f"{result['encode_us']:8.1f} us {result['decode_us']:8.1f} us "
+              f"{result['write_ms']:7.1f} ms {result['read_ms']:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
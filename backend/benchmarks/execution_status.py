@@ -0,0 +1,112 @@
+"""Latency of GET /api/execution/status while many projects execute at once.
+
+Starts the API in a uvicorn subprocess against a throwaway SQLite database,
+drives N projects through plan -> tasks -> execution and polls the status
+endpoint of every project until all executions finish.
+
+    cd backend && python benchmarks/execution_status.py --projects 20
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _wait_until_up(client: httpx.AsyncClient, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("API did not start")
+
+
+async def _prepare_project(client: httpx.AsyncClient) -> int:
+    project = (await client.post("/api/projects/", json={"idea": "Keyboard shortcuts"})).json()
+    project_id = project["id"]
+    await client.post(f"/api/repos/select?project_id={project_id}", json={"repo_url": "https://github.com/azimuttapp/azimutt"})
+    await client.post(f"/api/plan/generate?project_id={project_id}")
+    await client.post(f"/api/tasks/generate?project_id={project_id}")
+    return project_id
+
+
+async def _poll(client: httpx.AsyncClient, project_id: int, interval: float, latencies: list):
+    seen_running = False
+    while True:
+        started = time.perf_counter()
+        response = await client.get(f"/api/execution/status/{project_id}")
+        latencies.append((time.perf_counter() - started) * 1000)
+        running = response.json().get("running")
+        seen_running = seen_running or running
+        if seen_running and not running:
+            return
+        await asyncio.sleep(interval)
+
+
+async def run(args):
+    port = _free_port()
+    workdir = tempfile.mkdtemp(prefix="bench-exec-")
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        REPOS_DIR=os.path.join(workdir, "repos"),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            await _wait_until_up(client)
+            project_ids = [await _prepare_project(client) for _ in range(args.projects)]
+
+            started = time.perf_counter()
+            await asyncio.gather(*(client.post(f"/api/execution/start?project_id={pid}") for pid in project_ids))
+            latencies = []
+            await asyncio.gather(*(_poll(client, pid, args.interval, latencies) for pid in project_ids))
+            elapsed = time.perf_counter() - started
+
+        print(f"projects executed:  {args.projects}")
+        print(f"wall clock:         {elapsed:.2f}s")
+        print(f"status requests:    {len(latencies)}")
+        print(f"status p50:         {statistics.median(latencies):.1f} ms")
+        print(f"status p95:         {_percentile(latencies, 95):.1f} ms")
+        print(f"status p99:         {_percentile(latencies, 99):.1f} ms")
+        print(f"status max:         {max(latencies):.1f} ms")
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.25, help="seconds between status polls per project")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,113 @@
+"""Latency of /api/repos/tree listings against the full nested tree, on a large synthetic workspace.
+
+Generates --files files over nested packages plus one --wide directory and
+a node_modules tree, then times the first listing (which walks the tree),
+warm listings of the root and of a page of the wide directory, a listing
+after a file in it is replaced, and the refresh execute_task does after a
+write. For comparison it times building and serializing the whole tree as
+one nested dict, as RepoAnalysis.directory_structure did without its caps.
+
+    cd backend && python benchmarks/file_tree.py --files 100000 --wide 20000
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import file_tree  # noqa: E402
+import workspaces  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix="tree-")
+
+
+def _generate(root: str, files: int, wide: int):
+    for n in range(files):
+        directory = os.path.join(root, "src", f"pkg{n % 100}", f"mod{n % 37}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file{n}.py"), "w") as f:
+            f.write("x = 1\n" * (n % 50))
+    directory = os.path.join(root, "assets", "icons")
+    os.makedirs(directory)
+    for n in range(wide):
+        with open(os.path.join(directory, f"icon{n:05d}.svg"), "w") as f:
+            f.write("<svg/>")
+    os.makedirs(os.path.join(root, "node_modules", "left-pad"))
+
+
+def _nested(root: str) -> dict:
+    tree: dict = {}
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in file_tree.SKIP_DIRS]
+        node = tree
+        rel_dir = os.path.relpath(directory, root)
+        for part in ([] if rel_dir == "." else rel_dir.split(os.sep)):
+            node = node.setdefault(part, {})
+        for name in names:
+            node[name] = os.path.getsize(os.path.join(directory, name))
+    return tree
+
+
+def _timed(fn, *args, repeat: int = 200) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--wide", type=int, default=20_000, help="entries of the one wide directory")
+    args = parser.parse_args()
+
+    root = os.path.join(WORKDIR, "repo")
+    try:
+        _generate(root, args.files, args.wide)
+
+        started = time.perf_counter()
+        full = json.dumps(_nested(root))
+        print(f"full nested tree    {(time.perf_counter() - started) * 1000:8.1f} ms, {len(full) / 1024 / 1024:.1f} MiB of JSON")
+
+        started = time.perf_counter()
+        etag, listing = file_tree.listing(root, "")
+        print(f"first listing       {(time.perf_counter() - started) * 1000:8.1f} ms (walks the tree; "
+              f"{listing['files']} files, {listing['size'] / 1024 / 1024:.1f} MiB)")
+        print(f"root listing        {_timed(file_tree.listing, root, ''):8.3f} ms (median), "
+              f"{len(json.dumps(listing))} bytes: {[e['name'] for e in listing['entries']]}")
+        wide = os.path.join("assets", "icons")
+        print(f"wide dir page       {_timed(file_tree.listing, root, wide, 10_000, 200):8.3f} ms (median), "
+              f"{file_tree.listing(root, wide)[1]['total']} entries")
+
+        # A write as execute_task makes it: replaced, then the tree refreshed
+        target = os.path.join(wide, "icon00042.svg")
+        started = time.perf_counter()
+        workspaces.write_file(os.path.join(root, target), "<svg>" + "x" * 10_000 + "</svg>")
+        file_tree.update(root, target)
+        print(f"write + refresh     {(time.perf_counter() - started) * 1000:8.1f} ms (rescans {args.wide} entries)")
+        new_etag, listing = file_tree.listing(root, "")
+        assert new_etag != etag and listing["size"] > 0
+        print(f"root after write    etag {etag} -> {new_etag}")
+
+        # An external change: only seen once its directory is listed
+        os.makedirs(os.path.join(root, "src", "pkg0", "added"))
+        with open(os.path.join(root, "src", "pkg0", "added", "new.py"), "w") as f:
+            f.write("y = 2\n")
+        started = time.perf_counter()
+        listing = file_tree.listing(root, os.path.join("src", "pkg0", "added"))[1]
+        print(f"new dir listing     {(time.perf_counter() - started) * 1000:8.3f} ms: {listing['entries']}")
+        assert file_tree.listing(root, "")[1]["files"] == args.files + args.wide + 1
+    finally:
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
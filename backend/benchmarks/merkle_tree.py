@@ -0,0 +1,107 @@
+"""Checkpoint and "changed since" cost of merkle_tree on a large synthetic workspace.
+
+Generates --files files over nested packages, then times, against a
+throwaway database: the first walk (hashing every file), the first
+checkpoint (storing every node), reloading the tree from that checkpoint
+after a restart (stats only), --changed writes recorded as execute_task
+does, and the query for what changed since the checkpoint. The reload is
+also what a full rescan costs, for comparison.
+
+    cd backend && python benchmarks/merkle_tree.py --files 100000 --changed 100
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORKDIR = tempfile.mkdtemp(prefix="merkle-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORKDIR, 'merkle.db')}"
+os.environ["MERKLE_WATCH"] = "0"
+
+import merkle_tree  # noqa: E402
+import workspaces  # noqa: E402
+from database import Project, SessionLocal, init_db  # noqa: E402
+
+
+def _generate(root: str, files: int):
+    paths = []
+    for n in range(files):
+        rel_path = os.path.join("src", f"pkg{n % 100}", f"mod{n % 37}", f"file{n}.py")
+        os.makedirs(os.path.join(root, os.path.dirname(rel_path)), exist_ok=True)
+        with open(os.path.join(root, rel_path), "w") as f:
+            f.write(f"def handler_{n}(request):\n    return {n}\n" * 20)
+        paths.append(rel_path)
+    return paths
+
+
+def _checkpoint(db, tree, label: str) -> dict:
+    # As the repos router does it
+    root_hash, unsaved = tree.snapshot()
+    record = merkle_tree.checkpoint(db, 1, root_hash, list(unsaved.values()), label)
+    db.commit()
+    tree.saved(unsaved)
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--changed", type=int, default=100)
+    args = parser.parse_args()
+
+    root = os.path.join(WORKDIR, "repo")
+    try:
+        paths = _generate(root, args.files)
+        init_db()
+        db = SessionLocal()
+        db.add(Project(id=1, idea="benchmark"))
+        db.commit()
+
+        started = time.perf_counter()
+        tree = merkle_tree.load(1, root, {})
+        walked = time.perf_counter()
+        first = _checkpoint(db, tree, "first")
+        stored = time.perf_counter()
+        print(f"first walk          {(walked - started) * 1000:8.0f} ms (hashes {args.files} files, {len(tree.nodes)} directories)")
+        print(f"first checkpoint    {(stored - walked) * 1000:8.0f} ms (stores every node)")
+
+        # After a restart: reconciled from the stored tree by stats alone
+        merkle_tree.close_all()
+        started = time.perf_counter()
+        seed = merkle_tree.read_tree(db, db.get(Project, 1).tree_hash)
+        tree = merkle_tree.load(1, root, seed)
+        assert tree.digest() == first["root_hash"]
+        print(f"reload / rescan     {(time.perf_counter() - started) * 1000:8.0f} ms (no file read)")
+
+        step = len(paths) // args.changed
+        durations = []
+        for i in range(args.changed):
+            rel_path = paths[i * step]
+            workspaces.write_file(os.path.join(root, rel_path), f"# rewritten {i}\n")
+            started = time.perf_counter()
+            merkle_tree.update(1, root, rel_path)
+            durations.append(time.perf_counter() - started)
+        print(f"record one write    {statistics.median(durations) * 1000:8.3f} ms (median)")
+
+        started = time.perf_counter()
+        changed = merkle_tree.changes(db, tree, first["root_hash"])
+        print(f"changes since       {(time.perf_counter() - started) * 1000:8.1f} ms: {len(changed['modified'])} modified, "
+              f"{len(changed['added'])} added, {len(changed['removed'])} removed")
+        assert len(changed["modified"]) == args.changed
+        started = time.perf_counter()
+        _checkpoint(db, tree, "second")
+        print(f"next checkpoint     {(time.perf_counter() - started) * 1000:8.1f} ms (stores changed nodes only)")
+        db.close()
+    finally:
+        merkle_tree.close_all()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
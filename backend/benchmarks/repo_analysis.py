@@ -0,0 +1,133 @@
+"""Wall time of repo_analyzer.analyze on a large synthetic repository.
+
+Generates --files source files (Python, TypeScript, Elm, SQL) spread over
+nested packages, plus a node_modules tree and binary assets that must be
+skipped, then runs the analyzer with the given time budget. With --cache it
+also runs against a throwaway database: cold, warm, after --changed files
+are rewritten, and on a hardlinked second workspace and a full copy.
+
+    cd backend && python benchmarks/repo_analysis.py --files 100000 --budget 20 --cache
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORKDIR = tempfile.mkdtemp(prefix="analysis-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORKDIR, 'analysis.db')}"
+
+import analysis_cache  # noqa: E402
+import repo_analyzer  # noqa: E402
+from database import SessionLocal, init_db  # noqa: E402
+
+SOURCES = {
+    ".py": 'from fastapi import APIRouter\nrouter = APIRouter()\n\n@router.get("/items/{n}")\ndef item_{n}():\n    return {n}\n',
+    ".ts": 'import express from "express"\nconst app = express()\napp.post("/orders/{n}", (req, res) => res.json({n}))\n',
+    ".tsx": "export function Widget{n}() {{\n  return <div>{n}</div>\n}}\n",
+    ".elm": "module Models.Thing{n} exposing (Thing)\n\ntype alias Thing = {{ id : Int }}\n",
+    ".sql": "CREATE TABLE table_{n} (\n  id INTEGER PRIMARY KEY,\n  name TEXT\n);\n",
+}
+
+
+def _generate(root: str, files: int, file_bytes: int):
+    extensions = list(SOURCES)
+    for n in range(files):
+        ext = extensions[n % len(extensions)]
+        directory = os.path.join(root, "src", f"pkg{n % 100}", f"mod{n % 37}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"file{n}{ext}"), "w") as f:
+            source = SOURCES[ext].format(n=n)
+            # Pad to a realistic size with comment lines
+            padding = max(0, file_bytes - len(source)) // 40
+            f.write(source + "".join(f"// helper line {i:04d} of file {n:06d}\n" for i in range(padding)))
+    vendored = os.path.join(root, "node_modules", "left-pad")
+    os.makedirs(vendored)
+    for n in range(1000):
+        with open(os.path.join(vendored, f"index{n}.js"), "w") as f:
+            f.write("module.exports = 1\n")
+    for n in range(200):
+        with open(os.path.join(root, "src", f"asset{n}.png"), "wb") as f:
+            f.write(b"\x89PNG\0" * 100)
+    with open(os.path.join(root, "package.json"), "w") as f:
+        f.write('{"dependencies": {"react": "18", "express": "4"}, "devDependencies": {"typescript": "5"}}')
+
+
+def _cached_run(label: str, root: str, budget: float):
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        cache = analysis_cache.load(db, "https://github.com/example/benchmark")
+        loaded = time.perf_counter()
+        stats = repo_analyzer.analyze(root, budget, cache=cache)["stats"]
+        analyzed = time.perf_counter()
+        analysis_cache.save(db, cache)
+        db.commit()
+        saved = time.perf_counter()
+    finally:
+        db.close()
+    print(f"{label:<22} total {(saved - started) * 1000:7.0f} ms (load {(loaded - started) * 1000:5.0f}, "
+          f"analyze {(analyzed - loaded) * 1000:5.0f}, save {(saved - analyzed) * 1000:5.0f})   "
+          f"{stats['cached']} cached, {stats['parsed'] - stats['cached']} parsed")
+
+
+def _rewrite(root: str, count: int):
+    rewritten = 0
+    for directory, _, names in os.walk(os.path.join(root, "src")):
+        for name in names:
+            if rewritten == count:
+                return
+            if name.endswith(".py"):
+                # Replace, as workspaces.write_file does
+                path = os.path.join(directory, name)
+                with open(path + ".tmp", "w") as f:
+                    f.write(f"# rewritten\nclass Thing{rewritten}(Base):\n    __tablename__ = 'things'\n")
+                os.replace(path + ".tmp", path)
+                rewritten += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--budget", type=float, default=repo_analyzer.ANALYZE_TIME_BUDGET)
+    parser.add_argument("--cache", action="store_true", help="also measure runs through analysis_cache")
+    parser.add_argument("--changed", type=int, default=100)
+    parser.add_argument("--file-bytes", type=int, default=4096, help="approximate size of each source file")
+    args = parser.parse_args()
+
+    root = os.path.join(WORKDIR, "repo")
+    os.makedirs(root)
+    try:
+        started = time.perf_counter()
+        _generate(root, args.files, args.file_bytes)
+        print(f"generated {args.files} files in {time.perf_counter() - started:.1f} s")
+        result = repo_analyzer.analyze(root, args.budget)
+        stats = result["stats"]
+        print(f"analyzed in {stats['elapsed_ms']:.0f} ms with {repo_analyzer.ANALYZE_PROCESSES} process(es): "
+              f"{stats['files']} files, {stats['parsed']} parsed, {stats['skipped']} skipped, truncated={stats['truncated']}")
+        print(f"tech_stack {result['tech_stack']}; {len(result['apis'])} apis, {len(result['components'])} components, "
+              f"{len(result['models'])} models, {len(result['db_schema'])} tables")
+
+        if args.cache:
+            init_db()
+            _cached_run("cold cache", root, args.budget)
+            _cached_run("warm cache", root, args.budget)
+            _rewrite(root, args.changed)
+            _cached_run(f"{args.changed} files rewritten", root, args.budget)
+            linked = os.path.join(WORKDIR, "linked")
+            shutil.copytree(root, linked, copy_function=os.link)
+            _cached_run("hardlinked workspace", linked, args.budget)
+            copied = os.path.join(WORKDIR, "copied")
+            shutil.copytree(root, copied)
+            _cached_run("copied workspace", copied, args.budget)
+    finally:
+        repo_analyzer.shutdown()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Cold-start cost of the API: import time and time to first response.
+
+Each sample starts a fresh interpreter, so nothing is shared with the
+previous run except the OS page cache. Import time is `import main` on its
+own; time to first response spawns uvicorn and polls /health until it
+answers, against a brand-new database (first boot) and against the same
+database again (every later boot). Medians are appended to
+benchmarks/history/startup.jsonl so regressions show up next to earlier runs.
+
+    cd backend && python benchmarks/startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_FILE = os.path.join(BACKEND_DIR, "benchmarks", "history", "startup.jsonl")
+
+IMPORT_PROBE = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _import_time(env: dict) -> float:
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND_DIR, env=env, text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def _first_response_time(env: dict, timeout: float = 60) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            time.sleep(0.005)
+        raise RuntimeError("API did not start")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _last_record() -> dict:
+    if not os.path.exists(HISTORY_FILE):
+        return {}
+    with open(HISTORY_FILE) as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else {}
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="bench-startup-")
+    try:
+        samples = {"import_ms": [], "first_response_fresh_db_ms": [], "first_response_ms": []}
+        for n in range(args.runs):
+            env = dict(
+                os.environ,
+                DATABASE_URL=f"sqlite:///{os.path.join(workdir, f'startup-{n}.db')}",
+                REPOS_DIR=os.path.join(workdir, "repos"),
+            )
+            samples["first_response_fresh_db_ms"].append(_first_response_time(env) * 1000)
+            samples["first_response_ms"].append(_first_response_time(env) * 1000)
+            samples["import_ms"].append(_import_time(env) * 1000)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        **{name: round(statistics.median(values), 1) for name, values in samples.items()},
+    }
+    previous = _last_record()
+    for name in samples:
+        change = ""
+        if name in previous:
+            change = f"   (previous {previous[name]:.1f} ms at {previous['commit']})"
+        print(f"{name:<28} {record[name]:8.1f} ms{change}")
+
+    if args.record:
+        os.makedirs(os.path.dirname(HISTORY_FILE), exist_ok=True)
+        with open(HISTORY_FILE, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-record", dest="record", action="store_false", help="do not append to the history file")
+    run(parser.parse_args())
@@ -0,0 +1,120 @@
+"""Symbol index build time, size and lookup latency on a large synthetic repo.
+
+Generates --files Python/TypeScript/Elm files of --lines lines each, where
+every file defines a few functions and calls functions of other files, then
+indexes the tree into a throwaway database as /api/repos/analyze does and
+times symbol_index.lookup for a rare name, a hot name and a prefix, and the
+re-index of one written file as execute_task does.
+
+    cd backend && python benchmarks/symbol_index.py --files 20000 --lines 100
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORKDIR = tempfile.mkdtemp(prefix="symbols-")
+DB_PATH = os.path.join(WORKDIR, "symbols.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import repo_analyzer  # noqa: E402
+import symbol_index  # noqa: E402
+from database import SessionLocal, init_db  # noqa: E402
+
+PROJECT_ID = 1
+
+
+def _source(n: int, ext: str, lines: int, files: int) -> str:
+    rng = random.Random(n)
+    calls = [f"handler_{rng.randrange(files)}_{rng.randrange(4)}" for _ in range(lines)]
+    if ext == ".py":
+        body = [f"def handler_{n}_{k}(request):\n    return dispatch(request)\n" for k in range(4)]
+        body += [f"    value = {call}(request) + shared_helper(value)\n" for call in calls]
+    elif ext == ".ts":
+        body = [f"export function handler_{n}_{k}(request: Request) {{\n  return dispatch(request)\n}}\n" for k in range(4)]
+        body += [f"const value{i} = {call}(request) + sharedHelper(value)\n" for i, call in enumerate(calls)]
+    else:
+        body = [f"handler_{n}_{k} request =\n    dispatch request\n" for k in range(4)]
+        body += [f"    |> {call} request\n" for call in calls]
+    return "".join(body)
+
+
+def _generate(root: str, files: int, lines: int):
+    paths, total_lines = [], 0
+    for n in range(files):
+        ext = (".py", ".ts", ".elm")[n % 3]
+        rel_path = os.path.join("src", f"pkg{n % 100}", f"module{n}{ext}")
+        os.makedirs(os.path.join(root, os.path.dirname(rel_path)), exist_ok=True)
+        source = _source(n, ext, lines, files)
+        with open(os.path.join(root, rel_path), "w") as f:
+            f.write(source)
+        paths.append(rel_path)
+        total_lines += source.count("\n")
+    return paths, total_lines
+
+
+def _timed(fn, *args, repeat: int = 50) -> float:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20_000)
+    parser.add_argument("--lines", type=int, default=100, help="call lines per file")
+    args = parser.parse_args()
+
+    root = os.path.join(WORKDIR, "repo")
+    try:
+        paths, total_lines = _generate(root, args.files, args.lines)
+        init_db()
+        db = SessionLocal()
+        started = time.perf_counter()
+        entries = repo_analyzer.index_files(root, paths, time_budget=3600)
+        extracted = time.perf_counter()
+        for i in range(0, len(entries), symbol_index.APPLY_BATCH_FILES):
+            symbol_index.apply(db, PROJECT_ID, entries[i:i + symbol_index.APPLY_BATCH_FILES])
+            db.commit()
+        stored = time.perf_counter()
+        print(f"indexed {args.files} files ({total_lines:,} lines) in {(stored - started):.1f} s "
+              f"(extract {extracted - started:.1f} s, store {stored - extracted:.1f} s); "
+              f"database {os.path.getsize(DB_PATH) / 1024 / 1024:.0f} MiB")
+
+        rare = f"handler_{args.files // 2}_1"
+        for label, name, prefix in (("rare name", rare, False), ("hot name", "dispatch", False),
+                                    ("prefix", f"handler_{args.files // 3}_", True)):
+            result = symbol_index.lookup(db, PROJECT_ID, name, prefix)
+            ms = _timed(symbol_index.lookup, db, PROJECT_ID, name, prefix)
+            print(f"lookup {label:<10} {ms:6.2f} ms (median)   {len(result['definitions'])} definitions, "
+                  f"{len(result['references'])} references")
+        print(f"file symbols        {_timed(symbol_index.file_symbols, db, PROJECT_ID, paths[0]):6.2f} ms (median)")
+
+        # One task write: replace a file and re-index it
+        target = next(path for path in paths[len(paths) // 2:] if path.endswith(".py"))
+        with open(os.path.join(root, target), "a") as f:
+            f.write("\ndef handler_written(request):\n    return dispatch(request)\n")
+        started = time.perf_counter()
+        entry = repo_analyzer.index_file(root, target)
+        symbol_index.apply(db, PROJECT_ID, [entry])
+        db.commit()
+        print(f"re-index one file   {(time.perf_counter() - started) * 1000:6.2f} ms; "
+              f"handler_written defined in {symbol_index.lookup(db, PROJECT_ID, 'handler_written')['definitions'][0]['path']}")
+        db.close()
+    finally:
+        repo_analyzer.shutdown()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Workspace provisioning time and disk use: full copy vs linked from the base.
+
+Builds a synthetic base checkout of --files files in a throwaway REPOS_DIR,
+then provisions --projects workspaces twice: as a full copy of the tree (the
+best case for rebuilding each workspace from scratch) and through
+workspaces.provision. Disk use counts the blocks of inodes a workspace does
+not share with the base.
+
+    cd backend && python benchmarks/workspaces.py --files 2000 --projects 20
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+WORKDIR = tempfile.mkdtemp(prefix="workspaces-")
+os.environ["REPOS_DIR"] = os.path.join(WORKDIR, "repos")
+
+import workspaces  # noqa: E402
+
+REPO_URL = "https://github.com/example/benchmark"
+
+
+def _build_base(files: int):
+    def populate(path, repo_url):
+        for n in range(files):
+            directory = os.path.join(path, f"pkg{n % 50}", f"mod{n % 7}")
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"file{n}.py"), "w") as f:
+                f.write(f"# file {n}\n" + "x = 1\n" * 600)
+    workspaces._populate_base = populate
+    workspaces.ensure_base(REPO_URL)
+
+
+def _own_bytes(path: str, shared_inodes: set) -> int:
+    # Directories are never shared; files are unless copied
+    total = 0
+    for root, dirs, names in os.walk(path):
+        total += os.lstat(root).st_blocks * 512
+        for name in names:
+            st = os.lstat(os.path.join(root, name))
+            if st.st_ino not in shared_inodes:
+                total += st.st_blocks * 512
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        _build_base(args.files)
+        base = workspaces.base_path(REPO_URL)
+        shared = {os.lstat(os.path.join(root, name)).st_ino for root, _, names in os.walk(base) for name in names}
+        results = {}
+        for mode in ("copy", "provision"):
+            durations, disk = [], 0
+            for project_id in range(args.projects):
+                started = time.perf_counter()
+                if mode == "copy":
+                    path = os.path.join(workspaces.REPOS_DIR, f"copy-{project_id}")
+                    shutil.copytree(base, path)
+                else:
+                    path = workspaces.provision(project_id, REPO_URL)
+                durations.append(time.perf_counter() - started)
+                disk += _own_bytes(path, shared)
+            results[mode] = (statistics.median(durations), disk / args.projects)
+        for mode, (duration, disk) in results.items():
+            print(f"{mode:<10} {duration * 1000:8.1f} ms/workspace (median)   {disk / 1024:10.1f} KiB extra disk/workspace")
+    finally:
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
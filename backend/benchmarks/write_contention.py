@@ -0,0 +1,107 @@
+"""Throughput and latency of concurrent small writes, with and without db_writer.
+
+Runs N writers that each commit M task status updates plus a log row against
+a throwaway SQLite database: once with every writer on its own session (the
+old pattern), once with every write submitted to db_writer.
+
+    cd backend && python benchmarks/write_contention.py --writers 32 --writes 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='writes-'), 'writes.db')}"
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from database import SessionLocal, db_writer, init_db, ExecutionLog, Phase, Project, Task  # noqa: E402
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _prepare(writers: int) -> list:
+    db = SessionLocal()
+    try:
+        project = Project(idea="benchmark")
+        db.add(project)
+        db.flush()
+        phase = Phase(project_id=project.id, phase_number=1, name="p")
+        db.add(phase)
+        db.flush()
+        tasks = [Task(project_id=project.id, phase_id=phase.id, task_number=n, name=f"t{n}") for n in range(writers)]
+        db.add_all(tasks)
+        db.commit()
+        return [(project.id, task.id) for task in tasks]
+    finally:
+        db.close()
+
+
+def _write(db, project_id: int, task_id: int, n: int):
+    db.get(Task, task_id).status = "in_progress" if n % 2 else "pending"
+    db.execute(insert(ExecutionLog), [{"project_id": project_id, "task_id": task_id, "log_type": "agent_message", "content": f"step {n}"}])
+    db.flush()
+
+
+def _write_own_session(project_id: int, task_id: int, n: int):
+    db = SessionLocal()
+    try:
+        _write(db, project_id, task_id, n)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _run(mode: str, targets: list, writes: int) -> dict:
+    latencies, errors = [], 0
+
+    async def writer(project_id, task_id):
+        nonlocal errors
+        for n in range(writes):
+            started = time.perf_counter()
+            try:
+                if mode == "sessions":
+                    await asyncio.to_thread(_write_own_session, project_id, task_id, n)
+                else:
+                    await db_writer.submit(_write, project_id, task_id, n)
+            except OperationalError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(project_id, task_id) for project_id, task_id in targets))
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "latencies": latencies, "errors": errors}
+
+
+def _report(mode: str, result: dict):
+    lat = result["latencies"]
+    print(f"{mode:<10} {len(lat) / result['elapsed']:8.0f} writes/s   "
+          f"p50 {_percentile(lat, 50) * 1000:7.1f} ms   p99 {_percentile(lat, 99) * 1000:7.1f} ms   "
+          f"max {max(lat) * 1000:7.1f} ms   errors {result['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=50)
+    args = parser.parse_args()
+
+    init_db()
+    targets = _prepare(args.writers)
+    for mode in ("sessions", "db_writer"):
+        _report(mode, asyncio.run(_run(mode, targets, args.writes)))
+    db_writer.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Content-addressed storage for large text artifacts.
+
+Plans, system designs and generated code are mostly identical across
+projects built from the same templates. Each distinct text is stored once in
+the blobs table under its sha256 hash; rows keep only the hash. Blobs are
+immutable, so writing a text that already exists costs one primary-key
+lookup and no write.
+
+All functions take a sync Session: db_writer commands call them directly,
+async handlers through `await db.run_sync(blob_store.put, text)`. Multi-MB
+texts are hashed and (de)compressed on the session's thread, so handlers
+read those through database.run_in_session in a worker thread and write
+them through db_writer.submit.
+"""
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from database import Blob
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _insert_missing(db: Session):
+    # Two writers may store the same new text at once; the loser's row is
+    # identical, so it is simply skipped
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(Blob).on_conflict_do_nothing(index_elements=["hash"])
+    if dialect == "postgresql":
+        return postgresql.insert(Blob).on_conflict_do_nothing(index_elements=["hash"])
+    return insert(Blob)
+
+
+def put_many(db: Session, texts: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """Store each text (None stays None) and return their hashes in order."""
+    texts = list(texts)
+    hashes = [content_hash(text) if text is not None else None for text in texts]
+    by_hash = {h: text for h, text in zip(hashes, texts) if h is not None}
+    if by_hash:
+        existing = set(db.scalars(select(Blob.hash).where(Blob.hash.in_(list(by_hash)))))
+        missing = [
+            {"hash": h, "content": text, "size": len(text.encode("utf-8"))}
+            for h, text in by_hash.items() if h not in existing
+        ]
+        if missing:
+            db.execute(_insert_missing(db), missing)
+    return hashes
+
+
+def put(db: Session, text: Optional[str]) -> Optional[str]:
+    return put_many(db, [text])[0]
+
+
+def get_many(db: Session, hashes: Iterable[Optional[str]]) -> Dict[str, str]:
+    """Contents by hash for every hash given (None entries are ignored)."""
+    wanted = list({h for h in hashes if h is not None})
+    if not wanted:
+        return {}
+    return dict(db.execute(select(Blob.hash, Blob.content).where(Blob.hash.in_(wanted))).all())
+
+
+def get(db: Session, blob_hash: Optional[str]) -> Optional[str]:
+    if blob_hash is None:
+        return None
+    return get_many(db, [blob_hash]).get(blob_hash)
@@ -0,0 +1,316 @@
+"""Import graph and approximate call graph of the Python files in a workspace.
+
+repo_analyzer parses each .py file with parse_python() in its worker pool,
+so per-file results are cached by content hash like the rest of the
+analysis. build() links them: imports resolve to workspace modules by dotted
+suffix (a workspace may hold several source roots), and calls resolve
+through the file's imports, its own top-level definitions and `self.`.
+Anything else (builtins, calls on local values, dynamic dispatch) is left
+out, so the call graph under-approximates.
+
+impact() answers which modules and tests are affected by changes to a set
+of files: the modules importing them, transitively, plus the modules of
+every transitive caller of their functions.
+
+The graph is stored as JSON in the blob store (Project.code_graph_hash);
+load() keeps recently used graphs in memory with their reverse edges;
+building those is CPU-bound, so callers fetch the blob and load it in a
+worker thread.
+"""
+import ast
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Set
+
+
+MAX_CACHED_GRAPHS = 8
+MAX_CALLERS = 500
+
+
+def module_name(rel_path: str) -> str:
+    parts = os.path.splitext(rel_path)[0].split(os.sep)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def is_test(rel_path: str) -> bool:
+    parts = rel_path.split(os.sep)
+    name = parts[-1]
+    return (name.startswith("test_") or name.endswith("_test.py") or name == "conftest.py"
+            or bool({"tests", "test"}.intersection(parts[:-1])))
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted(node.value)
+        return f"{base}.{node.attr}" if base else None
+    if isinstance(node, ast.Call):
+        # Service().evaluate(): a method of what the call constructs
+        return _dotted(node.func)
+    return None
+
+
+class _Visitor(ast.NodeVisitor):
+    def __init__(self, package: str):
+        self.package = package
+        self.imports: Set[str] = set()
+        self.names: Dict[str, str] = {}  # local name -> dotted target
+        self.defs: List[str] = []
+        self.calls: Dict[str, Set[str]] = {}
+        self.attrs: Dict[str, str] = {}  # Class.attr -> what self.attr was constructed by
+        # (qualname, is class, the definition calls inside it are attributed to)
+        self._scope: List[tuple] = []
+
+    def _absolute(self, level: int, name: Optional[str]) -> str:
+        if not level:
+            return name or ""
+        parts = self.package.split(".") if self.package else []
+        parts = parts[:len(parts) - (level - 1)]
+        return ".".join(parts + ([name] if name else []))
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self.imports.add(alias.name)
+            if alias.asname:
+                self.names[alias.asname] = alias.name
+            else:
+                top = alias.name.split(".")[0]
+                self.names.setdefault(top, top)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        base = self._absolute(node.level, node.module)
+        for alias in node.names:
+            if alias.name == "*":
+                self.imports.add(base)
+                continue
+            # Either a submodule or a name defined in base; build() tells which
+            target = f"{base}.{alias.name}" if base else alias.name
+            self.imports.add(target)
+            self.names[alias.asname or alias.name] = target
+
+    def _define(self, node):
+        qualname = ".".join([scope[0] for scope in self._scope[-1:]] + [node.name])
+        # Reachable from other modules only through module and class scopes;
+        # calls in nested functions count as calls of the enclosing definition
+        if all(scope[1] for scope in self._scope):
+            self.defs.append(qualname)
+            caller = qualname
+        else:
+            caller = self._scope[-1][2]
+        self._scope.append((qualname, isinstance(node, ast.ClassDef), caller))
+        self.generic_visit(node)
+        self._scope.pop()
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _define
+
+    def visit_Assign(self, node: ast.Assign):
+        # self.scorer = FraudScorer(): later self.scorer.score() calls FraudScorer.score
+        if isinstance(node.value, ast.Call) and len(self._scope) >= 2 and self._scope[-2][1]:
+            constructor = _dotted(node.value.func)
+            for target in node.targets:
+                if constructor and isinstance(target, ast.Attribute) and _dotted(target.value) == "self":
+                    self.attrs[f"{self._scope[-2][0]}.{target.attr}"] = constructor
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        callee = _dotted(node.func)
+        if callee:
+            caller = self._scope[-1][2] if self._scope else "<module>"
+            self.calls.setdefault(caller, set()).add(callee)
+        self.generic_visit(node)
+
+
+def parse_python(rel_path: str, text: str) -> Optional[dict]:
+    """Imports, definitions and calls of one file, or None if it does not parse."""
+    try:
+        tree = ast.parse(text, filename=rel_path)
+    except (SyntaxError, ValueError):
+        return None
+    module = module_name(rel_path)
+    package = module if rel_path.endswith("__init__.py") else module.rpartition(".")[0]
+    visitor = _Visitor(package)
+    visitor.visit(tree)
+    defined = {qualname.split(".")[0] for qualname in visitor.defs}
+    calls = {}
+    for caller, callees in visitor.calls.items():
+        # Keep what build() can resolve: imported names, own definitions, self.
+        kept = sorted(c for c in callees if c.split(".")[0] in visitor.names or c.split(".")[0] in defined
+                      or c.startswith("self."))
+        if kept:
+            calls[caller] = kept
+    return {
+        "module": module,
+        "imports": sorted(visitor.imports),
+        "names": visitor.names,
+        "defs": visitor.defs,
+        "calls": calls,
+        "attrs": visitor.attrs,
+    }
+
+
+class _Resolver:
+    def __init__(self, modules: Dict[str, dict]):
+        self.modules = modules
+        self.by_suffix: Dict[str, List[str]] = {}
+        for name in modules:
+            parts = name.split(".")
+            for i in range(len(parts)):
+                self.by_suffix.setdefault(".".join(parts[i:]), []).append(name)
+        self.defs = {name: set(info["defs"]) for name, info in modules.items()}
+
+    def module(self, dotted: str, importer: str) -> Optional[str]:
+        candidates = self.by_suffix.get(dotted)
+        if not candidates:
+            return None
+        if len(candidates) > 1:
+            # Prefer the module under the importer's own source root
+            same_root = [c for c in candidates if importer.startswith(c[:len(c) - len(dotted)])]
+            candidates = same_root or candidates
+        return min(candidates, key=len)
+
+    def target(self, dotted: str, importer: str) -> Optional[str]:
+        """'module:qualname' (or 'module:' for the module itself) for a dotted name."""
+        parts = dotted.split(".")
+        for i in range(len(parts), 0, -1):
+            module = self.module(".".join(parts[:i]), importer)
+            if module is None:
+                continue
+            qualname = ".".join(parts[i:])
+            if not qualname:
+                return f"{module}:"
+            # Calls on a class's attribute target the class
+            while qualname and qualname not in self.defs[module]:
+                qualname = qualname.rpartition(".")[0]
+            return f"{module}:{qualname}"
+        return None
+
+
+def build(results: List[dict]) -> dict:
+    """Graph of the "python" parts of repo_analyzer.scan results."""
+    modules = {}
+    for found in results:
+        parsed = found.get("python")
+        if parsed:
+            modules[parsed["module"]] = {**parsed, "path": found["path"]}
+    resolver = _Resolver(modules)
+    graph_modules, calls = {}, {}
+    for name, info in modules.items():
+        imports = set()
+        for dotted in info["imports"]:
+            target = resolver.target(dotted, name)
+            if target is not None and not target.startswith(f"{name}:"):
+                imports.add(target.split(":")[0])
+        graph_modules[name] = {"path": info["path"], "imports": sorted(imports), "defs": info["defs"],
+                               "test": is_test(info["path"])}
+        defined = set(info["defs"])
+        for caller, callees in info["calls"].items():
+            edges = set()
+            for callee in callees:
+                head, _, rest = callee.partition(".")
+                if head == "self":
+                    owner = caller.rpartition(".")[0]
+                    attr, _, method = rest.partition(".")
+                    constructor = info["attrs"].get(f"{owner}.{attr}")
+                    if constructor and method:
+                        callee = f"{constructor}.{method}"
+                        head, _, rest = callee.partition(".")
+                    else:
+                        local = f"{owner}.{rest}" if owner else rest
+                        if local in defined:
+                            edges.add(f"{name}:{local}")
+                        continue
+                if head in info["names"]:
+                    target = resolver.target(".".join(filter(None, [info["names"][head], rest])), name)
+                elif head in defined:
+                    target = f"{name}:{callee if callee in defined else head}"
+                else:
+                    target = None
+                if target is not None and not target.endswith(":"):
+                    edges.add(target)
+            if edges:
+                calls[f"{name}:{caller}"] = sorted(edges)
+    return {"modules": graph_modules, "calls": calls}
+
+
+class CodeGraph:
+    def __init__(self, graph: dict):
+        self.modules: Dict[str, dict] = graph["modules"]
+        self.calls: Dict[str, List[str]] = graph["calls"]
+        self.by_path = {info["path"]: name for name, info in self.modules.items()}
+        self.importers: Dict[str, Set[str]] = {}
+        for name, info in self.modules.items():
+            for imported in info["imports"]:
+                self.importers.setdefault(imported, set()).add(name)
+        self.callers: Dict[str, Set[str]] = {}
+        for caller, callees in self.calls.items():
+            for callee in callees:
+                self.callers.setdefault(callee, set()).add(caller)
+
+    def impact(self, paths: List[str], max_depth: Optional[int] = None) -> dict:
+        """Modules and tests affected by changes to paths."""
+        touched = [self.by_path[p] for p in paths if p in self.by_path]
+        distance = {name: 0 for name in touched}
+        queue = deque(touched)
+        while queue:
+            name = queue.popleft()
+            if max_depth is not None and distance[name] >= max_depth:
+                continue
+            for importer in self.importers.get(name, ()):
+                if importer not in distance:
+                    distance[importer] = distance[name] + 1
+                    queue.append(importer)
+
+        functions = {f"{name}:{qualname}" for name in touched for qualname in self.modules[name]["defs"]}
+        callers: Dict[str, int] = {}
+        queue = deque((function, 0) for function in functions)
+        while queue:
+            function, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for caller in self.callers.get(function, ()):
+                if caller not in callers and caller not in functions:
+                    callers[caller] = depth + 1
+                    queue.append((caller, depth + 1))
+        for caller in callers:
+            # Reached through calls only, e.g. via a module the import resolution missed
+            distance.setdefault(caller.split(":")[0], -1)
+
+        affected = sorted(distance.items(), key=lambda item: (item[1] < 0, item[1], item[0]))
+        return {
+            "touched": touched,
+            "unknown_files": [p for p in paths if p not in self.by_path],
+            "modules": [{"module": name, "path": self.modules[name]["path"], "distance": d} for name, d in affected],
+            "callers": sorted(callers)[:MAX_CALLERS],
+            "tests": sorted(self.modules[name]["path"] for name, _ in affected if self.modules[name]["test"]),
+        }
+
+
+_graphs: "OrderedDict[str, CodeGraph]" = OrderedDict()
+_graphs_lock = threading.Lock()
+
+
+def cached(graph_hash: str) -> Optional[CodeGraph]:
+    with _graphs_lock:
+        graph = _graphs.get(graph_hash)
+        if graph is not None:
+            _graphs.move_to_end(graph_hash)
+    return graph
+
+
+def load(graph_hash: str, text: str) -> CodeGraph:
+    """The stored graph (its blob text), kept in memory for repeated impact
+    queries. CPU-bound: call off the event loop."""
+    graph = cached(graph_hash)
+    if graph is not None:
+        return graph
+    graph = CodeGraph(json.loads(text))
+    with _graphs_lock:
+        _graphs[graph_hash] = graph
+        while len(_graphs) > MAX_CACHED_GRAPHS:
+            _graphs.popitem(last=False)
+    return graph
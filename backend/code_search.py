@@ -0,0 +1,392 @@
+"""Trigram index for literal and regex search over project workspaces.
+
+Zoekt-style: a workspace's index is a set of immutable shards under
+REPOS_DIR/.search/<project_id>, each covering up to SHARD_FILES files and
+mmapped for queries. A shard maps every trigram to the sorted ids of the
+documents containing it; a query intersects the posting lists of its
+trigrams and reads only the candidate files to find matching lines.
+
+Trigrams are taken within tokens (runs of word characters, or of other
+non-space bytes) of the lowercased text. A query token always lies inside a
+document token, so its trigrams are indexed, and the index is a fraction of
+one over every 3-byte window. Matches are verified against the files on
+disk, so case-sensitive and regex queries use the same index.
+
+manifest.json lists the shards and, for each path, the shard and document
+holding its live version and content hash. An update writes new shards for
+the changed files and repoints their paths; shards left without live
+documents are deleted, and small shards are merged once there are more than
+MAX_SMALL_SHARDS. Files the time budget did not reach are kept as pending and
+searched by reading them.
+"""
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import struct
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+import repo_analyzer
+import workspaces
+
+INDEX_DIR = os.path.join(workspaces.REPOS_DIR, ".search")
+CODE_SEARCH_TIME_BUDGET = float(os.getenv("CODE_SEARCH_TIME_BUDGET", "20"))
+SEARCH_TIME_BUDGET = float(os.getenv("SEARCH_TIME_BUDGET", "10"))
+SHARD_FILES = 1000
+MAX_SMALL_SHARDS = 8
+MAX_RESULTS = 1000
+MAX_LINE_CHARS = 300
+
+_TOKEN = re.compile(rb"\w+|[^\w\s]+")
+_HEADER = struct.Struct("<4sIII")  # magic, trigrams, postings, docs JSON bytes
+_MAGIC = b"TRG1"
+
+_project_locks: Dict[int, threading.Lock] = {}
+_project_locks_guard = threading.Lock()
+_manifests: Dict[int, Tuple[tuple, dict]] = {}
+
+
+def _trigrams(data: bytes) -> Set[tuple]:
+    grams: Set[tuple] = set()
+    for token in set(_TOKEN.findall(data)):
+        grams.update(zip(token, token[1:], token[2:]))
+    return grams
+
+
+def _key(gram: tuple) -> int:
+    return (gram[0] << 16) | (gram[1] << 8) | gram[2]
+
+
+def _build_shard(root: str, rel_paths: List[str], shard_path: str, deadline: float) -> Tuple[list, list]:
+    """Write a shard for rel_paths. Returns its documents as [path, hash]
+    and the paths that are gone or not text; files after the deadline are
+    in neither."""
+    postings: Dict[tuple, array] = {}
+    docs, unindexable = [], []
+    for rel_path in rel_paths:
+        if time.monotonic() >= deadline:
+            break
+        try:
+            with open(os.path.join(root, rel_path), "rb") as f:
+                data = f.read(repo_analyzer.ANALYZE_MAX_FILE_BYTES + 1)
+        except OSError:
+            unindexable.append(rel_path)
+            continue
+        if len(data) > repo_analyzer.ANALYZE_MAX_FILE_BYTES or b"\0" in data[:8192]:
+            unindexable.append(rel_path)
+            continue
+        doc = len(docs)
+        docs.append([rel_path, hashlib.blake2b(data, digest_size=20).hexdigest()])
+        for gram in _trigrams(data.lower()):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = ids = array("I")
+            ids.append(doc)
+    if not docs:
+        return docs, unindexable
+
+    grams = sorted(postings)
+    offsets, ids = array("I", [0]), array("I")
+    for gram in grams:
+        ids.extend(postings[gram])
+        offsets.append(len(ids))
+    docs_json = json.dumps(docs).encode("utf-8")
+    temp_path = f"{shard_path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(grams), len(ids), len(docs_json)))
+        f.write(array("I", map(_key, grams)).tobytes())
+        f.write(offsets.tobytes())
+        f.write(ids.tobytes())
+        f.write(docs_json)
+    os.replace(temp_path, shard_path)
+    return docs, unindexable
+
+
+class _Shard:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        magic, n_keys, n_ids, docs_bytes = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a search shard: {path}")
+        start = _HEADER.size
+        self.keys = view[start:start + 4 * n_keys].cast("I")
+        start += 4 * n_keys
+        self.offsets = view[start:start + 4 * (n_keys + 1)].cast("I")
+        start += 4 * (n_keys + 1)
+        self.ids = view[start:start + 4 * n_ids].cast("I")
+        start += 4 * n_ids
+        self.docs = json.loads(bytes(view[start:start + docs_bytes]))
+
+    def candidates(self, keys: Iterable[int]) -> Iterable[int]:
+        """Ids of the documents containing every trigram."""
+        ranges = []
+        for key in keys:
+            i = bisect_left(self.keys, key)
+            if i == len(self.keys) or self.keys[i] != key:
+                return ()
+            ranges.append((self.offsets[i], self.offsets[i + 1]))
+        if not ranges:
+            return range(len(self.docs))
+        ranges.sort(key=lambda r: r[1] - r[0])
+        found = set(self.ids[ranges[0][0]:ranges[0][1]])
+        for start, end in ranges[1:]:
+            if not found:
+                break
+            found.intersection_update(self.ids[start:end])
+        return found
+
+
+# Shards are immutable and uniquely named, so an open one never goes stale
+@lru_cache(maxsize=512)
+def _open_shard(path: str) -> _Shard:
+    return _Shard(path)
+
+
+def index_dir(project_id: int) -> str:
+    return os.path.join(INDEX_DIR, str(project_id))
+
+
+def _read_manifest(directory: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(directory, "manifest.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def has_index(project_id: int) -> bool:
+    # Cheap enough for the event loop, unlike load_manifest after an update
+    return os.path.exists(os.path.join(index_dir(project_id), "manifest.json"))
+
+
+def load_manifest(project_id: int) -> Optional[dict]:
+    """The project's manifest, or None if it has no index. Cached until the
+    file changes (another worker may update it)."""
+    path = os.path.join(index_dir(project_id), "manifest.json")
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # Every update replaces the file, so the inode changes with it
+    version = (st.st_ino, st.st_mtime_ns)
+    cached = _manifests.get(project_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    manifest = _read_manifest(index_dir(project_id))
+    if manifest is not None:
+        _manifests[project_id] = (version, manifest)
+    return manifest
+
+
+@contextmanager
+def _locked(project_id: int):
+    # Threads of this process, then other workers through the lock file
+    with _project_locks_guard:
+        lock = _project_locks.setdefault(project_id, threading.Lock())
+    with lock, open(os.path.join(index_dir(project_id), ".lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def changes(manifest: Optional[dict], results: List[dict], complete: bool) -> Tuple[List[str], List[str]]:
+    """(stale, removed) paths of the index against repo_analyzer.scan results."""
+    files = manifest["files"] if manifest else {}
+    current = {r["path"]: r["hash"] for r in results if "hash" in r and not r.get("skipped")}
+    stale = sorted(path for path, content_hash in current.items()
+                   if path not in files or files[path][2] != content_hash)
+    removed = [path for path in files if path not in current] if complete else []
+    return stale, removed
+
+
+def update(project_id: int, root: str, rel_paths: List[str], removed: Iterable[str] = (),
+           time_budget: float = CODE_SEARCH_TIME_BUDGET) -> dict:
+    """Index new or changed files and forget removed ones. Blocking."""
+    directory = index_dir(project_id)
+    os.makedirs(directory, exist_ok=True)
+    deadline = time.monotonic() + time_budget
+    rel_paths = list(dict.fromkeys(rel_paths))
+    chunks = [rel_paths[i:i + SHARD_FILES] for i in range(0, len(rel_paths), SHARD_FILES)]
+    names = [f"{uuid.uuid4().hex}.shard" for _ in chunks]
+    if len(rel_paths) <= 16:
+        # A task's writes: not worth a round trip to the worker pool
+        built = [_build_shard(root, chunk, os.path.join(directory, name), deadline) for chunk, name in zip(chunks, names)]
+    else:
+        with repo_analyzer.worker_pool() as pool:
+            # Workers stop at the deadline, so waiting on them is bounded
+            futures = [pool.submit(_build_shard, root, chunk, os.path.join(directory, name), deadline)
+                       for chunk, name in zip(chunks, names)]
+            built = [future.result() for future in futures]
+
+    removed = set(removed)
+    with _locked(project_id):
+        manifest = _read_manifest(directory) or {"shards": [], "files": {}, "pending": []}
+        files = manifest["files"]
+        reached = set(removed)
+        for name, (docs, unindexable) in zip(names, built):
+            if docs:
+                manifest["shards"].append(name)
+            for doc, (path, content_hash) in enumerate(docs):
+                files[path] = [name, doc, content_hash]
+            reached.update(path for path, _ in docs)
+            reached.update(unindexable)
+        for path in removed.union(*(unindexable for _, unindexable in built)):
+            files.pop(path, None)
+        manifest["pending"] = sorted(set(manifest["pending"]).union(rel_paths) - reached)
+
+        live: Dict[str, int] = {}
+        for name, _, _ in files.values():
+            live[name] = live.get(name, 0) + 1
+        dead = [name for name in manifest["shards"] if name not in live]
+        manifest["shards"] = [name for name in manifest["shards"] if name in live]
+        temp_path = os.path.join(directory, "manifest.json.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, os.path.join(directory, "manifest.json"))
+        # Readers holding the old manifest keep their mmaps; unlinking is safe
+        for name in dead:
+            os.unlink(os.path.join(directory, name))
+
+    small = [name for name in manifest["shards"] if live[name] < SHARD_FILES // 4]
+    if len(small) > MAX_SMALL_SHARDS:
+        # Merge by re-indexing their files: the old shards end up without live documents
+        merged = set(small)
+        update(project_id, root, sorted(path for path, entry in files.items() if entry[0] in merged),
+               time_budget=max(deadline - time.monotonic(), 0))
+    return {"indexed": len(reached - removed), "pending": len(manifest["pending"]), "shards": len(manifest["shards"])}
+
+
+def drop(project_id: int):
+    """Delete the project's index (its workspace is being replaced). Blocking."""
+    _manifests.pop(project_id, None)
+    shutil.rmtree(index_dir(project_id), ignore_errors=True)
+
+
+def _required_literals(parsed) -> List[str]:
+    # Literal runs every match must contain; alternations and optional parts are skipped
+    runs, current = [], []
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(arg))
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+        if op is sre_parse.SUBPATTERN:
+            runs += _required_literals(arg[-1])
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and arg[0] >= 1:
+            runs += _required_literals(arg[2])
+    if current:
+        runs.append("".join(current))
+    return runs
+
+
+def _query_keys(query: str, regex: bool, case_sensitive: bool) -> Set[int]:
+    literals = _required_literals(sre_parse.parse(query)) if regex else [query]
+    keys = set()
+    for literal in literals:
+        for gram in _trigrams(literal.encode("utf-8").lower()):
+            # Only ASCII is lowercased in the index: other bytes may differ in case
+            if case_sensitive or max(gram) < 0x80:
+                keys.add(_key(gram))
+    return keys
+
+
+def _walk(root: str) -> List[str]:
+    paths = []
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in repo_analyzer.SKIP_DIRS]
+        rel_dir = os.path.relpath(directory, root)
+        for name in names:
+            if os.path.splitext(name)[1].lower() not in repo_analyzer.BINARY_EXTENSIONS:
+                paths.append(os.path.normpath(os.path.join(rel_dir, name)))
+    return paths
+
+
+def _candidate_paths(project_id: int, manifest: dict, keys: Set[int]) -> Set[str]:
+    directory = index_dir(project_id)
+    files = manifest["files"]
+    paths = set(manifest["pending"])
+    for name in manifest["shards"]:
+        shard = _open_shard(os.path.join(directory, name))
+        for doc in shard.candidates(keys):
+            path = shard.docs[doc][0]
+            entry = files.get(path)
+            # Only the shard holding a path's live version counts
+            if entry is not None and entry[0] == name and entry[1] == doc:
+                paths.add(path)
+    return paths
+
+
+def search(project_id: int, root: str, query: str, regex: bool = False, case_sensitive: bool = False,
+           limit: int = 100, time_budget: float = SEARCH_TIME_BUDGET) -> dict:
+    """Lines of the workspace matching query. Without an index every file is
+    read. Raises re.error for an invalid regex. Blocking."""
+    started = time.monotonic()
+    flags = re.MULTILINE | (0 if case_sensitive else re.IGNORECASE)
+    pattern = re.compile(query if regex else re.escape(query), flags)
+    manifest = load_manifest(project_id)
+    if manifest is None:
+        paths = _walk(root)
+    else:
+        try:
+            paths = _candidate_paths(project_id, manifest, _query_keys(query, regex, case_sensitive))
+        except FileNotFoundError:
+            # An update replaced the manifest and deleted shards since it was
+            # read; a dropped index (workspace replaced) finds nothing
+            manifest = load_manifest(project_id)
+            paths = set() if manifest is None else _candidate_paths(
+                project_id, manifest, _query_keys(query, regex, case_sensitive)
+            )
+
+    matches, searched, truncated = [], 0, False
+    for rel_path in sorted(paths):
+        if truncated or time.monotonic() - started >= time_budget:
+            truncated = True
+            break
+        try:
+            with open(os.path.join(root, rel_path), "rb") as f:
+                data = f.read(repo_analyzer.ANALYZE_MAX_FILE_BYTES + 1)
+        except OSError:
+            continue
+        searched += 1
+        if len(data) > repo_analyzer.ANALYZE_MAX_FILE_BYTES or b"\0" in data[:8192]:
+            continue
+        text = data.decode("utf-8", errors="replace")
+        line, position, last_line = 1, 0, 0
+        for match in pattern.finditer(text):
+            line += text.count("\n", position, match.start())
+            position = match.start()
+            if line == last_line:
+                continue
+            last_line = line
+            start = text.rfind("\n", 0, position) + 1
+            end = text.find("\n", position)
+            matches.append({"path": rel_path, "line": line, "text": text[start:end if end >= 0 else len(text)][:MAX_LINE_CHARS]})
+            if len(matches) >= limit:
+                truncated = True
+                break
+    return {
+        "indexed": manifest is not None,
+        "candidates": len(paths),
+        "searched": searched,
+        "matches": matches,
+        "truncated": truncated,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+    }
@@ -1,8 +1,20 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, JSON, DateTime, Boolean
+from sqlalchemy import create_engine, event, func, inspect, insert, select, update, Column, Integer, String, Text, JSON, DateTime, Boolean, ForeignKey, Index, LargeBinary, TypeDecorator, BigInteger, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from collections import defaultdict, deque
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+import asyncio
+import logging
 import os
+import queue
+import threading
+import time
+import zlib
 
 # Handle database URL for Vercel serverless environment
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./build_agent.db")
@@ -25,10 +37,229 @@ if "sqlite" in DATABASE_URL and not DATABASE_URL.startswith("sqlite:////"):
         db_filename = os.path.basename(db_filename) if "/" in db_filename else db_filename
         DATABASE_URL = f"sqlite:////tmp/{db_filename}"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# The sync, async and writer engines each open their own connections, and an
+# in-memory SQLite database is private to the connection that opened it
+if IS_SQLITE and (":memory:" in DATABASE_URL or "mode=memory" in DATABASE_URL or DATABASE_URL.rstrip("/") == "sqlite:"):
+    raise RuntimeError("In-memory SQLite is not supported; set DATABASE_URL to a database file")
+
+# Applied to every new SQLite connection. WAL lets pollers read while the
+# executor writes; NORMAL sync is durable across app crashes under WAL
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB
+    "temp_store": "MEMORY",
+}
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+class _CheckoutTimer:
+    """Records how long each pool checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits = deque(maxlen=1000)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.recent_waits.append(waited)
+
+class TimedQueuePool(_CheckoutTimer, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    pass
+
+def _async_url(url: str):
+    """The async driver variant of DATABASE_URL: aiosqlite or asyncpg."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    if url.get_backend_name() in ("postgresql", "postgres"):
+        return url.set(drivername="postgresql+asyncpg")
+    return url
+
+def _engine_options(poolclass) -> dict:
+    return {
+        "connect_args": {"check_same_thread": False} if IS_SQLITE else {},
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": not IS_SQLITE,
+    }
+
+# The sync engine serves migrations and scripts; request handlers and the
+# executor use the async engine so queries never block the event loop
+engine = create_engine(DATABASE_URL, **_engine_options(TimedQueuePool))
+async_engine = create_async_engine(_async_url(DATABASE_URL), **_engine_options(TimedAsyncQueuePool))
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+# Connection used by db_writer. On SQLite the driver's own transaction
+# handling is turned off so savepoints work, and every transaction starts
+# with BEGIN IMMEDIATE so the write lock is taken up front
+if IS_SQLITE:
+    writer_engine = create_engine(
+        DATABASE_URL, connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0
+    )
+
+    @event.listens_for(writer_engine, "connect")
+    def _prepare_writer_connection(dbapi_connection, connection_record):
+        _apply_sqlite_pragmas(dbapi_connection, connection_record)
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(writer_engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+else:
+    writer_engine = engine
+
+def _pool_stats(pool) -> dict:
+    if not isinstance(pool, _CheckoutTimer):
+        return {"pool": type(pool).__name__}
+    waits = sorted(pool.recent_waits)
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "open": pool.checkedin() + pool.checkedout(),
+        "checked_out": pool.checkedout(),
+        "checkouts": pool.checkouts,
+        "wait_ms_avg": round(pool.total_wait / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+        "wait_ms_p99": round(waits[min(len(waits) - 1, int(len(waits) * 0.99))] * 1000, 3) if waits else 0.0,
+        "wait_ms_max": round(pool.max_wait * 1000, 3),
+    }
+
+def get_pool_stats() -> dict:
+    """Pool occupancy and checkout wait times, for /health."""
+    return {"async": _pool_stats(async_engine.pool), "sync": _pool_stats(engine.pool), "writer": db_writer.stats()}
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit: reading an expired attribute would need IO
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+def run_in_session(fn, *args):
+    """fn(session, *args) on a short-lived sync session. For reads too slow
+    for `AsyncSession.run_sync`, which runs on the event-loop thread: call
+    this through asyncio.to_thread."""
+    with SessionLocal() as session:
+        return fn(session, *args)
+
+# Large text columns are compressed above COMPRESS_MIN_BYTES. Stored values
+# are plain UTF-8, or a 3-byte header (NUL, codec, dictionary id) followed by
+# the compressed bytes. Dictionaries are never edited once shipped: a new one
+# gets a new id and old rows keep decoding with theirs
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "32"))
+COMPRESSION_DICTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dictionaries")
+COMPRESSION_DICT_ID = 1
+CODEC_RAW, CODEC_ZLIB, CODEC_ZSTD = b"R", b"Z", b"S"
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+@lru_cache(maxsize=None)
+def compression_dict(dict_id: int) -> bytes:
+    if dict_id == 0:
+        return b""
+    with open(os.path.join(COMPRESSION_DICTS_DIR, f"text-v{dict_id}.dict"), "rb") as f:
+        return f.read()
+
+@lru_cache(maxsize=None)
+def _zstd_dict(dict_id: int):
+    zdict = compression_dict(dict_id)
+    return zstandard.ZstdCompressionDict(zdict, dict_type=zstandard.DICT_TYPE_RAWCONTENT) if zdict else None
+
+@lru_cache(maxsize=None)
+def _zlib_compressor(dict_id: int):
+    # Priming with a 32 KiB dictionary costs far more than compressing a log
+    # line, so each value starts from a copy of a primed compressor. Raw
+    # deflate: no zlib header or checksum, which matter on short rows
+    zdict = compression_dict(dict_id)
+    return zlib.compressobj(6, zlib.DEFLATED, -15, zdict=zdict) if zdict else zlib.compressobj(6, zlib.DEFLATED, -15)
+
+def _stored_raw(data: bytes) -> bytes:
+    # Plain UTF-8 as is; a leading NUL would read back as a header
+    return b"\0" + CODEC_RAW + b"\0" + data if data.startswith(b"\0") else data
+
+def compress_text(value: str, dict_id: Optional[int] = None) -> bytes:
+    dict_id = COMPRESSION_DICT_ID if dict_id is None else dict_id
+    data = value.encode("utf-8")
+    if len(data) < COMPRESS_MIN_BYTES:
+        return _stored_raw(data)
+    if zstandard is not None:
+        codec = CODEC_ZSTD
+        packed = zstandard.ZstdCompressor(level=9, dict_data=_zstd_dict(dict_id)).compress(data)
+    else:
+        codec = CODEC_ZLIB
+        compressor = _zlib_compressor(dict_id).copy()
+        packed = compressor.compress(data) + compressor.flush()
+    if len(packed) + 3 >= len(data):
+        return _stored_raw(data)
+    return b"\0" + codec + bytes([dict_id]) + packed
+
+def decompress_text(stored) -> str:
+    if isinstance(stored, str):
+        # Written before the column was compressed (SQLite keeps it as TEXT)
+        return stored
+    stored = bytes(stored)
+    if not stored.startswith(b"\0"):
+        return stored.decode("utf-8")
+    codec, dict_id, packed = stored[1:2], stored[2], stored[3:]
+    if codec == CODEC_RAW:
+        return packed.decode("utf-8")
+    if codec == CODEC_ZLIB:
+        zdict = compression_dict(dict_id)
+        decompressor = zlib.decompressobj(-15, zdict=zdict) if zdict else zlib.decompressobj(-15)
+        return (decompressor.decompress(packed) + decompressor.flush()).decode("utf-8")
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Value is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor(dict_data=_zstd_dict(dict_id)).decompress(packed).decode("utf-8")
+    raise ValueError(f"Unknown compression codec {codec!r}")
+
+class CompressedText(TypeDecorator):
+    """Text column stored compressed (see compress_text); reads and writes str."""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value) if value is not None else None
 
 Base = declarative_base()
+logger = logging.getLogger(__name__)
 
 class Project(Base):
     __tablename__ = "projects"
@@ -37,60 +268,95 @@ class Project(Base):
     idea = Column(Text, nullable=False)
     repo_url = Column(String, nullable=True)
     repo_path = Column(String, nullable=True)
+    # Latest repo_analyzer result, as JSON in the blob store
+    analysis_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
+    analyzed_at = Column(DateTime, nullable=True)
+    # Python import/call graph from the same analysis (see code_graph)
+    code_graph_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
+    # Root of the workspace's Merkle tree as last stored (see merkle_tree)
+    tree_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
     status = Column(String, default="idea")  # idea, repo_selected, plan_generated, tasks_generated, design_approved, executing, testing, pr_created
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class Blob(Base):
+    """Content-addressed text, stored once however many rows reference it.
+    Plans, designs and generated code keep the sha256 hash (see blob_store)."""
+    __tablename__ = "blobs"
+
+    hash = Column(String(64), primary_key=True)
+    content = Column(CompressedText, nullable=False)
+    size = Column(Integer, nullable=False)  # bytes, UTF-8
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class Plan(Base):
     __tablename__ = "plans"
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     questions = Column(JSON, nullable=True)
     answers = Column(JSON, nullable=True)
-    plan_document = Column(Text, nullable=True)
+    plan_document_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_plans_project_id_id", "project_id", "id"),
+    )
+
 class Phase(Base):
     __tablename__ = "phases"
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     phase_number = Column(Integer, nullable=False)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(String, default="pending")  # pending, in_progress, completed, failed
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_phases_project_id_phase_number", "project_id", "phase_number"),
+    )
+
 class Task(Base):
     __tablename__ = "tasks"
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, nullable=False)
-    phase_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    phase_id = Column(Integer, ForeignKey("phases.id"), nullable=False)
     task_number = Column(Integer, nullable=False)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     file_path = Column(String, nullable=True)
     status = Column(String, default="pending")  # pending, in_progress, completed, failed
-    code_changes = Column(Text, nullable=True)
+    code_changes_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_tasks_phase_id_task_number", "phase_id", "task_number"),
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+    )
+
 class SystemDesign(Base):
     __tablename__ = "system_designs"
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, nullable=False)
-    phase_id = Column(Integer, nullable=False)
-    architecture = Column(Text, nullable=True)
-    sequence_diagram = Column(Text, nullable=True)
-    api_structure = Column(JSON, nullable=True)
-    db_changes = Column(JSON, nullable=True)
-    data_flow = Column(Text, nullable=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    phase_id = Column(Integer, ForeignKey("phases.id"), nullable=False)
+    architecture_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
+    sequence_diagram_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
+    api_structure_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)  # JSON
+    db_changes_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)  # JSON
+    data_flow_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=True)
     approved = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_system_designs_phase_id", "phase_id"),
+        Index("ix_system_designs_project_id", "project_id"),
+    )
+
 class ExecutionLog(Base):
     __tablename__ = "execution_logs"
     
@@ -98,38 +364,367 @@ class ExecutionLog(Base):
     project_id = Column(Integer, nullable=False)
     task_id = Column(Integer, nullable=False)
     log_type = Column(String, nullable=False)  # agent_message, code_change, error, test_result
-    content = Column(Text, nullable=False)
+    content = Column(CompressedText, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Keyset pagination walks logs by id within a project, optionally narrowed
+    # to one task or one log type
+    __table_args__ = (
+        Index("ix_execution_logs_project_id_id", "project_id", "id"),
+        Index("ix_execution_logs_project_id_task_id_id", "project_id", "task_id", "id"),
+        Index("ix_execution_logs_project_id_log_type_id", "project_id", "log_type", "id"),
+    )
+
+class FileAnalysis(Base):
+    """Per-file repo_analyzer result, shared by every project on the same
+    repo_url. One row per content version of a path; size/mtime/inode let an
+    unchanged file be recognised without reading it (see analysis_cache)."""
+    __tablename__ = "file_analyses"
+
+    id = Column(Integer, primary_key=True)
+    repo_url = Column(String, nullable=False)
+    analyzer_version = Column(Integer, nullable=False)
+    path = Column(String, nullable=False)
+    content_hash = Column(String(40), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    inode = Column(BigInteger, nullable=False)
+    result = Column(Text, nullable=False)  # JSON; small, so not worth CompressedText
+
+    __table_args__ = (
+        UniqueConstraint("repo_url", "analyzer_version", "path", "content_hash", name="uq_file_analyses_version"),
+    )
+
+class SymbolFile(Base):
+    """A workspace file in the symbol index, with the content hash its
+    definitions and references were extracted from (see symbol_index)."""
+    __tablename__ = "symbol_files"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    path = Column(String, nullable=False)
+    content_hash = Column(String(40), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("project_id", "path", name="uq_symbol_files_project_id_path"),
+    )
+
+class SymbolDefinition(Base):
+    __tablename__ = "symbol_definitions"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, nullable=False)
+    file_id = Column(Integer, ForeignKey("symbol_files.id"), nullable=False)
+    name = Column(String, nullable=False)
+    kind = Column(String, nullable=False)  # function, class, type, variable, table, ...
+    line = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_symbol_definitions_project_id_name", "project_id", "name"),
+        Index("ix_symbol_definitions_file_id", "file_id"),
+    )
+
+class SymbolReference(Base):
+    """Occurrences of a name in one file: one row per (file, name), not per
+    use. Clustered by name, so a lookup reads one contiguous range."""
+    __tablename__ = "symbol_references"
+
+    project_id = Column(Integer, primary_key=True)
+    name = Column(String, primary_key=True)
+    file_id = Column(Integer, ForeignKey("symbol_files.id"), primary_key=True)
+    count = Column(Integer, nullable=False)
+    lines = Column(Text, nullable=False)  # comma-separated, the first repo_analyzer.MAX_REFERENCE_LINES
+
+    __table_args__ = (
+        Index("ix_symbol_references_file_id", "file_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+class ExecutionState(Base):
+    __tablename__ = "execution_states"
+
+    project_id = Column(Integer, primary_key=True)
+    status = Column(String, default="idle")  # idle, running, paused, stopped
+    current_task_id = Column(Integer, nullable=True)
+    running_tasks = Column(JSON, nullable=True)
+    parallelism = Column(Integer, nullable=True)
+    lease_owner = Column(String, nullable=True)  # worker executing the project
+    lease_expires_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_execution_states_status_lease_expires_at", "status", "lease_expires_at"),
+    )
+
+class TaskStatusCount(Base):
+    """Number of tasks per status for a project, maintained on every flush
+    that changes Task.status so status polling never scans the tasks table."""
+    __tablename__ = "task_status_counts"
+
+    project_id = Column(Integer, primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class ProjectRevision(Base):
+    """Bumped in the same transaction as any change to a project's phases or
+    tasks; readers use it to validate cached task trees."""
+    __tablename__ = "project_revisions"
+
+    project_id = Column(Integer, primary_key=True)
+    tasks_revision = Column(Integer, nullable=False, default=0)
+
 class PR(Base):
     __tablename__ = "prs"
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     branch_name = Column(String, nullable=False)
     pr_url = Column(String, nullable=True)
     pr_number = Column(Integer, nullable=True)
     status = Column(String, default="pending")  # pending, created, merged
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_prs_project_id_id", "project_id", "id"),
+    )
+
+class WorkspaceCheckpoint(Base):
+    """A workspace's Merkle tree root at a point in time, to diff against later."""
+    __tablename__ = "workspace_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    root_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=False)
+    label = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_workspace_checkpoints_project_id_id", "project_id", "id"),
+    )
+
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+TASK_STATUSES = ("pending", "in_progress", "completed", "failed")
+
+def _ensure_task_counts(session: Session, project_id: int):
+    # First transition seen for a project (e.g. one created before counters
+    # existed): seed its rows from the tasks table as it stands pre-flush
+    exists = session.execute(
+        select(TaskStatusCount.status).where(TaskStatusCount.project_id == project_id).limit(1)
+    ).first()
+    if exists:
+        return
+    counts = dict.fromkeys(TASK_STATUSES, 0)
+    counts.update(session.execute(
+        select(Task.status, func.count()).where(Task.project_id == project_id).group_by(Task.status)
+    ).all())
+    session.execute(insert(TaskStatusCount), [
+        {"project_id": project_id, "status": status, "count": count} for status, count in counts.items()
+    ])
+
+@event.listens_for(Session, "before_flush")
+def _track_task_status_counts(session, flush_context, instances):
+    # Bulk query.update()/delete() on tasks bypass this hook; change task
+    # statuses through the ORM so the counters stay exact
+    deltas = defaultdict(int)
+    for obj in session.new:
+        if isinstance(obj, Task):
+            deltas[(obj.project_id, obj.status or "pending")] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            deltas[(obj.project_id, obj.status)] -= 1
+    for obj in session.dirty:
+        if not isinstance(obj, Task):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.added:
+            continue
+        if history.deleted:
+            old = history.deleted[0]
+        else:
+            # Status was expired when reassigned; read the stored value
+            old = session.execute(select(Task.status).where(Task.id == obj.id)).scalar()
+        new = history.added[0]
+        if old != new:
+            deltas[(obj.project_id, old)] -= 1
+            deltas[(obj.project_id, new)] += 1
+
+    for (project_id, status), delta in deltas.items():
+        if not delta:
+            continue
+        _ensure_task_counts(session, project_id)
+        result = session.execute(
+            update(TaskStatusCount)
+            .where(TaskStatusCount.project_id == project_id, TaskStatusCount.status == status)
+            .values(count=TaskStatusCount.count + delta)
+        )
+        if result.rowcount == 0:
+            session.execute(insert(TaskStatusCount).values(project_id=project_id, status=status, count=delta))
+
+@event.listens_for(Session, "before_flush")
+def _bump_task_tree_revision(session, flush_context, instances):
+    changed = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, (Phase, Task)):
+            changed.add(obj.project_id)
+    for obj in session.dirty:
+        if isinstance(obj, (Phase, Task)) and session.is_modified(obj):
+            changed.add(obj.project_id)
+
+    for project_id in changed:
+        result = session.execute(
+            update(ProjectRevision)
+            .where(ProjectRevision.project_id == project_id)
+            .values(tasks_revision=ProjectRevision.tasks_revision + 1)
+        )
+        if result.rowcount == 0:
+            session.execute(insert(ProjectRevision).values(project_id=project_id, tasks_revision=1))
+
+async def get_task_status_counts(db: AsyncSession, project_id: int) -> dict:
+    """Task counts per status for a project: a primary-key lookup on the
+    maintained counters, or one GROUP BY for projects without any yet."""
+    counts = dict.fromkeys(TASK_STATUSES, 0)
+    rows = (await db.execute(
+        select(TaskStatusCount.status, TaskStatusCount.count).where(TaskStatusCount.project_id == project_id)
+    )).all()
+    if not rows:
+        rows = (await db.execute(
+            select(Task.status, func.count()).where(Task.project_id == project_id).group_by(Task.status)
+        )).all()
+    for status, count in rows:
+        if status in counts:
+            counts[status] = count
+    return counts
+
 # Create tables lazily (only when needed, not at import time)
 _tables_created = False
 
 def init_db():
-    """Initialize database tables. Call this on app startup."""
+    """Initialize database tables and apply pending migrations. Call this on app startup."""
     global _tables_created
     if not _tables_created:
         try:
-            Base.metadata.create_all(bind=engine)
+            from migrations import migrate
+            migrate(engine)
             _tables_created = True
         except Exception as e:
             # Log error but don't fail if tables already exist
             import logging
             logging.warning(f"Database initialization warning: {e}")
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+class DatabaseWriter:
+    """Runs database writes on one dedicated thread and connection.
+
+    SQLite allows one writer at a time, so sessions writing on their own just
+    queue up on the lock. Commands given to the writer are functions taking a
+    Session; they may flush but must not commit. The thread takes every
+    command that is waiting, runs each in a savepoint so a failing one only
+    undoes itself, and commits the batch in one transaction.
+    """
+
+    def __init__(self, bind, batch_size: int = 64):
+        self._sessions = sessionmaker(bind=bind, autoflush=False, expire_on_commit=False)
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.commands = 0
+        self.batches = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    async def submit(self, fn, *args):
+        """Run fn(session, *args) on the writer thread; returns its result
+        once the transaction containing it has committed."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._ensure_started()
+        self._queue.put((fn, args, loop, future))
+        return await future
+
+    def stop(self, timeout: float = 5.0):
+        """Finish the commands already queued and stop the thread."""
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {"commands": self.commands, "batches": self.batches, "queued": self._queue.qsize()}
+
+    def _run(self):
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [command for command in batch if command is not None]
+            if batch:
+                self._execute(batch)
+
+    def _commit(self, batch) -> list:
+        outcomes = []
+        with self._sessions() as session, session.begin():
+            for fn, args, _, _ in batch:
+                try:
+                    with session.begin_nested():
+                        outcomes.append((fn(session, *args), None))
+                except Exception as exc:
+                    outcomes.append((None, exc))
+        return outcomes
+
+    def _execute(self, batch):
+        try:
+            outcomes = self._commit(batch)
+        except Exception as exc:
+            # Nothing from the batch was written; commit the commands one by
+            # one so a single bad command cannot fail the others
+            if len(batch) == 1:
+                outcomes = [(None, exc)]
+            else:
+                logger.warning("Batched write failed, retrying %d commands individually", len(batch), exc_info=True)
+                outcomes = []
+                for command in batch:
+                    try:
+                        outcomes.extend(self._commit([command]))
+                    except Exception as command_exc:
+                        outcomes.append((None, command_exc))
+        self.commands += len(batch)
+        self.batches += 1
+
+        for (_, _, loop, future), (result, exc) in zip(batch, outcomes):
+            try:
+                loop.call_soon_threadsafe(_resolve, future, result, exc)
+            except RuntimeError:
+                # The submitting loop has closed; nobody is waiting
+                pass
+
+def _resolve(future: asyncio.Future, result, exc: Exception = None):
+    if future.cancelled():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+db_writer = DatabaseWriter(writer_engine, batch_size=int(os.getenv("DB_WRITER_BATCH_SIZE", "64")))
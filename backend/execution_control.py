@@ -0,0 +1,99 @@
+"""Cooperative pause/stop signalling for in-flight execution tasks.
+
+An ExecutionControl is shared by every task of one project run. Tasks call
+checkpoint() between steps and sleep() instead of asyncio.sleep(), so a
+pause freezes them mid-step and a stop unwinds them with ExecutionStopped
+as soon as the command lands, rather than after the task finishes.
+"""
+import asyncio
+from typing import Awaitable, Optional
+
+
+class ExecutionStopped(Exception):
+    """Raised inside a task when its project execution is stopped."""
+
+
+class ExecutionControl:
+    def __init__(self, status: str = "running"):
+        self.status = status
+        self._changed = asyncio.Event()
+
+    @property
+    def paused(self) -> bool:
+        return self.status == "paused"
+
+    @property
+    def stopped(self) -> bool:
+        # "lost" means another worker took over the lease
+        return self.status in ("stopped", "lost")
+
+    def set_status(self, status: str):
+        if status == self.status:
+            return
+        self.status = status
+        # Wake everyone waiting on the old event; later waiters get a new one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_changed(self, timeout: Optional[float] = None) -> bool:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def checkpoint(self):
+        """Block while paused; raise ExecutionStopped once stopped."""
+        while True:
+            if self.stopped:
+                raise ExecutionStopped()
+            if not self.paused:
+                return
+            await self.wait_changed()
+
+    async def sleep(self, delay: float):
+        """Like asyncio.sleep, but the clock stops while paused and a stop
+        interrupts it immediately."""
+        loop = asyncio.get_running_loop()
+        remaining = delay
+        while True:
+            await self.checkpoint()
+            if remaining <= 0:
+                return
+            started = loop.time()
+            if not await self.wait_changed(remaining):
+                return
+            remaining -= loop.time() - started
+
+    async def run_with_timeout(self, awaitable: Awaitable, timeout: float):
+        """Await `awaitable`, cancelling it once it has been active (not
+        paused) for `timeout` seconds; raises asyncio.TimeoutError then."""
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(awaitable)
+        remaining = timeout
+        try:
+            while not task.done():
+                paused = self.paused
+                changed = asyncio.ensure_future(self._changed.wait())
+                started = loop.time()
+                try:
+                    await asyncio.wait(
+                        {task, changed},
+                        timeout=None if paused else max(remaining, 0),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                finally:
+                    changed.cancel()
+                if not paused:
+                    remaining -= loop.time() - started
+                    if remaining <= 0 and not task.done():
+                        task.cancel()
+                        try:
+                            await task
+                        except asyncio.CancelledError:
+                            pass
+                        raise asyncio.TimeoutError()
+            return task.result()
+        finally:
+            if not task.done():
+                task.cancel()
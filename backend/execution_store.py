@@ -0,0 +1,159 @@
+"""Execution state shared by every worker process, persisted in the database.
+
+A project is executed by the worker holding its lease. The holder renews the
+lease on every heartbeat and reads back the desired status, so pause/stop
+commands can be sent to any worker. If the holder dies its lease expires and
+another worker (or the restarted one) claims the project and resumes it from
+its pending tasks.
+
+Reads take an AsyncSession. Writes are db_writer commands: they take the
+writer's Session, flush but never commit.
+"""
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database import ExecutionState
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+LEASE_SECONDS = float(os.getenv("EXECUTION_LEASE_SECONDS", "15"))
+HEARTBEAT_INTERVAL = float(os.getenv("EXECUTION_HEARTBEAT_INTERVAL", "5"))
+
+# Statuses of an execution that still has work to do
+ACTIVE_STATUSES = ("running", "paused")
+
+
+def _lease_free(now: datetime):
+    return or_(ExecutionState.lease_owner.is_(None), ExecutionState.lease_expires_at < now)
+
+
+def _state(row: Optional[ExecutionState]) -> dict:
+    if not row:
+        return {
+            "status": "idle",
+            "running": False,
+            "current_task": None,
+            "running_tasks": [],
+            "lease_owner": None,
+            "heartbeat_at": None,
+        }
+    lease_live = row.lease_owner is not None and row.lease_expires_at is not None and row.lease_expires_at >= datetime.utcnow()
+    return {
+        "status": row.status,
+        "running": row.status == "running",
+        "current_task": row.current_task_id,
+        "running_tasks": row.running_tasks or [],
+        "lease_owner": row.lease_owner if lease_live else None,
+        "heartbeat_at": row.heartbeat_at.isoformat() if row.heartbeat_at else None,
+    }
+
+
+async def get_state(db: AsyncSession, project_id: int) -> dict:
+    return _state(await db.get(ExecutionState, project_id))
+
+
+def acquire(db: Session, project_id: int, parallelism: Optional[int] = None, status: str = "running") -> bool:
+    """Take the project's lease for this worker; False if another worker holds it."""
+    now = datetime.utcnow()
+    values = {
+        "status": status,
+        "lease_owner": WORKER_ID,
+        "lease_expires_at": now + timedelta(seconds=LEASE_SECONDS),
+        "heartbeat_at": now,
+        "running_tasks": [],
+    }
+    if parallelism is not None:
+        values["parallelism"] = parallelism
+
+    result = db.execute(
+        update(ExecutionState)
+        .where(ExecutionState.project_id == project_id, _lease_free(now))
+        .values(**values)
+    )
+    if result.rowcount == 1:
+        return True
+
+    if db.get(ExecutionState, project_id) is not None:
+        return False
+
+    try:
+        with db.begin_nested():
+            db.add(ExecutionState(project_id=project_id, **values))
+    except IntegrityError:
+        # Another worker inserted the row first
+        return False
+    return True
+
+
+def heartbeat(db: Session, project_id: int, current_task: Optional[int], running_tasks: List[int]) -> Optional[str]:
+    """Renew the lease and publish progress; returns the desired status, or
+    None if this worker no longer holds the lease."""
+    now = datetime.utcnow()
+    result = db.execute(
+        update(ExecutionState)
+        .where(ExecutionState.project_id == project_id, ExecutionState.lease_owner == WORKER_ID)
+        .values(
+            lease_expires_at=now + timedelta(seconds=LEASE_SECONDS),
+            heartbeat_at=now,
+            current_task_id=current_task,
+            running_tasks=running_tasks,
+        )
+    )
+    if result.rowcount != 1:
+        return None
+    return db.scalar(select(ExecutionState.status).where(ExecutionState.project_id == project_id))
+
+
+def set_status(db: Session, project_id: int, status: str) -> dict:
+    """Record a pause/play/stop command for whichever worker holds the lease."""
+    row = db.get(ExecutionState, project_id)
+    if status in ACTIVE_STATUSES and (row is None or row.status not in ACTIVE_STATUSES):
+        # Nothing to pause or resume; recording it would make the project
+        # look orphaned. Starting goes through acquire
+        return _state(row)
+    if row is None:
+        row = ExecutionState(project_id=project_id, status="idle", running_tasks=[])
+        db.add(row)
+    row.status = status
+    if status == "stopped":
+        row.current_task_id = None
+    db.flush()
+    return _state(row)
+
+
+def release(db: Session, project_id: int, status: str = "idle"):
+    db.execute(
+        update(ExecutionState)
+        .where(ExecutionState.project_id == project_id, ExecutionState.lease_owner == WORKER_ID)
+        .values(
+            status=status,
+            lease_owner=None,
+            lease_expires_at=None,
+            current_task_id=None,
+            running_tasks=[],
+        )
+    )
+
+
+def claim_orphans(db: Session) -> List[dict]:
+    """Claim active executions whose lease has expired (their worker died)."""
+    now = datetime.utcnow()
+    candidates = db.execute(
+        select(ExecutionState.project_id, ExecutionState.status, ExecutionState.parallelism).where(
+            ExecutionState.status.in_(ACTIVE_STATUSES),
+            _lease_free(now),
+        )
+    ).all()
+
+    claimed = []
+    for project_id, status, parallelism in candidates:
+        if acquire(db, project_id, status=status):
+            claimed.append({"project_id": project_id, "parallelism": parallelism})
+    return claimed
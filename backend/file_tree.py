@@ -0,0 +1,217 @@
+"""Workspace file tree listed one directory at a time, for /api/repos/tree.
+
+The first listing of a workspace walks it once into a TreeIndex: per
+directory, its files with their sizes and its subdirectories, plus the
+recursive size and file count of the whole directory. A listing then costs
+a stat of the listed directory and a slice of its cached sorted entries.
+
+Workspace files are only ever replaced (see workspaces), which changes the
+mtime of their directory, so a listed directory whose mtime moved is
+rescanned: one level, plus any new subdirectory. The size and file-count
+changes are carried up to its ancestors. execute_task refreshes the
+directory of each file it writes, so ancestor sizes stay current even
+before that directory is listed again. Vendored and build directories
+(repo_analyzer.SKIP_DIRS) are listed but not walked.
+
+Each directory has a version, bumped whenever its listing would change; it
+makes up the ETag of the listing.
+"""
+import itertools
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from repo_analyzer import SKIP_DIRS
+
+MAX_ENTRIES = 1000
+MAX_CACHED_TREES = 16
+
+
+class _Dir:
+    __slots__ = ("mtime_ns", "files", "subdirs", "skipped", "size", "count", "version", "order")
+
+    def __init__(self, mtime_ns: int):
+        self.mtime_ns = mtime_ns
+        self.files: Dict[str, int] = {}  # name -> size
+        self.subdirs: List[str] = []
+        self.skipped: List[str] = []
+        self.size = 0  # recursive, like count
+        self.count = 0
+        self.version = 0
+        self.order: Optional[List[Tuple[str, str]]] = None  # sorted (name, type), built on first listing
+
+
+class TreeIndex:
+    def __init__(self, root: str):
+        self.root = root
+        self.inode = os.stat(root).st_ino
+        self.token = uuid.uuid4().hex[:12]
+        self.dirs: Dict[str, _Dir] = {}
+        self.lock = threading.Lock()
+        self._versions = itertools.count(1)
+        self._build("")
+
+    def _scan(self, rel_dir: str) -> _Dir:
+        path = os.path.join(self.root, rel_dir)
+        # mtime before the listing, so a change during it is seen next time
+        node = _Dir(os.stat(path).st_mtime_ns)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    (node.skipped if entry.name in SKIP_DIRS else node.subdirs).append(entry.name)
+                    continue
+                try:
+                    node.files[entry.name] = entry.stat(follow_symlinks=False).st_size
+                except FileNotFoundError:
+                    continue
+        node.size = sum(node.files.values())
+        node.count = len(node.files)
+        node.version = next(self._versions)
+        return node
+
+    def _add_subdirs(self, rel_dir: str, node: _Dir, known=frozenset()):
+        for name in list(node.subdirs):
+            child_path = os.path.join(rel_dir, name)
+            child = self.dirs.get(child_path) if name in known else None
+            if child is None:
+                try:
+                    child = self._build(child_path)
+                except (FileNotFoundError, NotADirectoryError):
+                    node.subdirs.remove(name)
+                    continue
+            node.size += child.size
+            node.count += child.count
+
+    def _build(self, rel_dir: str) -> _Dir:
+        node = self._scan(rel_dir)
+        self._add_subdirs(rel_dir, node)
+        self.dirs[rel_dir] = node
+        return node
+
+    def _drop(self, rel_dir: str):
+        node = self.dirs.pop(rel_dir, None)
+        if node is not None:
+            for name in node.subdirs:
+                self._drop(os.path.join(rel_dir, name))
+
+    def _refresh(self, rel_dir: str):
+        old = self.dirs[rel_dir]
+        node = self._scan(rel_dir)
+        # Subdirectories still there keep their subtree; each is checked when listed
+        self._add_subdirs(rel_dir, node, known=frozenset(old.subdirs))
+        for name in set(old.subdirs).difference(node.subdirs):
+            self._drop(os.path.join(rel_dir, name))
+        self.dirs[rel_dir] = node
+        size, count = node.size - old.size, node.count - old.count
+        while rel_dir:
+            rel_dir = os.path.dirname(rel_dir)
+            ancestor = self.dirs[rel_dir]
+            ancestor.size += size
+            ancestor.count += count
+            ancestor.version = next(self._versions)
+
+    def current(self, rel_dir: str) -> Optional[_Dir]:
+        """The directory's node, rescanned first if it changed, or None if
+        it is not a (walked) directory of the workspace. Call under lock."""
+        node = self.dirs.get(rel_dir)
+        if node is None:
+            # Possibly created since its parent was scanned
+            if not rel_dir or self.current(os.path.dirname(rel_dir)) is None:
+                return None
+            return self.dirs.get(rel_dir)
+        try:
+            mtime_ns = os.stat(os.path.join(self.root, rel_dir)).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            # Removed: the parent's rescan drops it
+            if rel_dir:
+                self.current(os.path.dirname(rel_dir))
+            return None
+        if mtime_ns != node.mtime_ns:
+            self._refresh(rel_dir)
+            node = self.dirs[rel_dir]
+        return node
+
+    def listing(self, rel_dir: str, offset: int, limit: int) -> Optional[Tuple[str, dict]]:
+        with self.lock:
+            node = self.current(rel_dir)
+            if node is None:
+                return None
+            if node.order is None:
+                node.order = ([(name, "dir") for name in sorted(node.subdirs + node.skipped)]
+                              + [(name, "file") for name in sorted(node.files)])
+            entries = []
+            for name, kind in node.order[offset:offset + limit]:
+                if kind == "file":
+                    entries.append({"name": name, "type": "file", "size": node.files[name]})
+                    continue
+                child = self.dirs.get(os.path.join(rel_dir, name))
+                if child is None:
+                    entries.append({"name": name, "type": "dir", "skipped": True})
+                else:
+                    entries.append({"name": name, "type": "dir", "size": child.size, "files": child.count,
+                                    "children": len(child.files) + len(child.subdirs) + len(child.skipped)})
+            total = len(node.order)
+            return f'"{self.token}-{node.version}"', {
+                "path": rel_dir,
+                "size": node.size,
+                "files": node.count,
+                "total": total,
+                "offset": offset,
+                "entries": entries,
+                "has_more": offset + limit < total,
+            }
+
+
+_trees: "OrderedDict[str, TreeIndex]" = OrderedDict()
+_trees_lock = threading.Lock()
+_build_locks: Dict[str, threading.Lock] = {}
+
+
+def _cached(root: str) -> Optional[TreeIndex]:
+    with _trees_lock:
+        tree = _trees.get(root)
+        if tree is not None:
+            _trees.move_to_end(root)
+    # A re-provisioned workspace is a new directory at the same path
+    if tree is not None and tree.inode == os.stat(root).st_ino:
+        return tree
+    return None
+
+
+def load(root: str) -> TreeIndex:
+    """The tree index of the workspace at root, walking it on first use. Blocking."""
+    root = os.path.abspath(root)
+    tree = _cached(root)
+    if tree is not None:
+        return tree
+    with _trees_lock:
+        lock = _build_locks.setdefault(root, threading.Lock())
+    with lock:
+        tree = _cached(root)
+        if tree is None:
+            tree = TreeIndex(root)
+            with _trees_lock:
+                _trees[root] = tree
+                while len(_trees) > MAX_CACHED_TREES:
+                    evicted, _ = _trees.popitem(last=False)
+                    _build_locks.pop(evicted, None)
+    return tree
+
+
+def listing(root: str, rel_dir: str, offset: int = 0, limit: int = 200) -> Optional[Tuple[str, dict]]:
+    """(ETag, one page of the entries of rel_dir), or None if it is not a
+    directory of the workspace. Blocking."""
+    return load(root).listing(rel_dir, offset, limit)
+
+
+def update(root: str, rel_path: str):
+    """Refresh the directory of a file just written, if the tree is loaded."""
+    try:
+        tree = _cached(os.path.abspath(root))
+    except FileNotFoundError:
+        return
+    if tree is not None:
+        with tree.lock:
+            tree.current(os.path.dirname(rel_path))
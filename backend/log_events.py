@@ -0,0 +1,48 @@
+"""In-process wake-ups for execution log subscribers.
+
+Writers call notify(project_id) after committing ExecutionLog rows; SSE
+streams block in wait() instead of polling the database. Notifications are
+only a hint: subscribers always re-read rows after their cursor, so a missed
+wake-up (e.g. a write from another worker process) only costs one poll
+interval.
+"""
+import asyncio
+import threading
+from typing import Dict, List, Tuple
+
+_waiters: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+_lock = threading.Lock()
+
+
+def notify(project_id: int):
+    """Wake every subscriber of a project. Safe to call from any thread."""
+    with _lock:
+        waiters = _waiters.pop(project_id, [])
+    for loop, future in waiters:
+        loop.call_soon_threadsafe(_resolve, future)
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(True)
+
+
+async def wait(project_id: int, timeout: float) -> bool:
+    """Wait for the next notify(project_id); False if `timeout` elapsed first."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    entry = (loop, future)
+    with _lock:
+        _waiters.setdefault(project_id, []).append(entry)
+    try:
+        await asyncio.wait_for(future, timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        with _lock:
+            waiters = _waiters.get(project_id)
+            if waiters and entry in waiters:
+                waiters.remove(entry)
+                if not waiters:
+                    del _waiters[project_id]
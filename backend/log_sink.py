@@ -0,0 +1,114 @@
+"""Group-commit writer for ExecutionLog rows.
+
+execute_task produces a handful of log lines per task; committing each one
+costs an fsync on SQLite. The sink buffers entries in a bounded queue and a
+single flusher writes them in one transaction per batch, once `batch_size`
+entries are waiting or `flush_interval` seconds have passed since the first
+one. A full queue makes writers wait (backpressure) instead of growing
+without bound.
+"""
+import asyncio
+import logging
+import os
+from typing import List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from database import db_writer, ExecutionLog
+import log_events
+
+logger = logging.getLogger(__name__)
+
+
+class _FlushRequest:
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+
+
+class ExecutionLogSink:
+    def __init__(self, batch_size: int = 200, flush_interval: float = 0.05, max_queue: int = 10000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _ensure_started(self) -> asyncio.Queue:
+        # The queue and flusher belong to the loop that first uses them; a new
+        # loop (tests, reloads) gets a fresh pair.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._flusher is None or self._flusher.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._wakeup = asyncio.Event()
+            self._flusher = loop.create_task(self._run())
+        return self._queue
+
+    async def write(self, project_id: int, task_id: int, log_type: str, content: str):
+        """Queue a log entry; waits while the queue is full."""
+        entry = {"project_id": project_id, "task_id": task_id, "log_type": log_type, "content": content}
+        queue = self._ensure_started()
+        await queue.put(entry)
+        if queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        """Return once every entry queued before this call is committed;
+        raises the error if a batch since the previous flush was lost."""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        future = asyncio.get_running_loop().create_future()
+        await self._ensure_started().put(_FlushRequest(future))
+        self._wakeup.set()
+        await future
+
+    async def _run(self):
+        queue = self._queue
+        error: Optional[Exception] = None
+        while True:
+            self._wakeup.clear()
+            batch = [await queue.get()]
+            # Linger so concurrent writers share the commit, unless a flush was
+            # requested or a full batch is already waiting
+            if not isinstance(batch[0], _FlushRequest) and queue.qsize() < self.batch_size - 1:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            entries = [item for item in batch if isinstance(item, dict)]
+            if entries:
+                try:
+                    await db_writer.submit(_insert_entries, entries)
+                except Exception as e:
+                    # Keep the flusher alive; a lost batch must not wedge
+                    # writers, but the next flush reports it
+                    logger.exception("Failed to write %d execution log entries", len(entries))
+                    error = e
+                for project_id in {entry["project_id"] for entry in entries}:
+                    log_events.notify(project_id)
+
+            waiters = [item.future for item in batch if isinstance(item, _FlushRequest) and not item.future.done()]
+            for future in waiters:
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+            if waiters:
+                error = None
+
+
+def _insert_entries(db: Session, entries: List[dict]):
+    db.execute(insert(ExecutionLog), entries)
+
+
+log_sink = ExecutionLogSink(
+    batch_size=int(os.getenv("LOG_SINK_BATCH_SIZE", "200")),
+    flush_interval=float(os.getenv("LOG_SINK_FLUSH_INTERVAL", "0.05")),
+    max_queue=int(os.getenv("LOG_SINK_MAX_QUEUE", "10000")),
+)
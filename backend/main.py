@@ -13,6 +13,24 @@ app = FastAPI(title="Developer Build Agent API")
 async def startup_event():
     from database import init_db
     init_db()
+    # Resume executions left behind by crashed or restarted workers
+    import asyncio
+    from routers.execution import recover_executions
+    app.state.execution_recovery = asyncio.create_task(recover_executions())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.execution_recovery.cancel()
+    from log_sink import log_sink
+    await log_sink.flush()
+    import repo_analyzer
+    repo_analyzer.shutdown()
+    import merkle_tree
+    merkle_tree.close_all()
+    import asyncio
+    from database import async_engine, db_writer
+    await asyncio.to_thread(db_writer.stop)
+    await async_engine.dispose()
 
 app.add_middleware(
     CORSMiddleware,
@@ -40,7 +58,8 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    from database import get_pool_stats
+    return {"status": "healthy", "database": get_pool_stats()}
 
 if __name__ == "__main__":
     import uvicorn
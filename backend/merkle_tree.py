@@ -0,0 +1,402 @@
+"""Merkle tree of file hashes per workspace, to tell what changed since a checkpoint.
+
+Each directory is a node listing its entries sorted by name: files as
+[name, "f", content hash, size, mtime_ns], subdirectories as [name, "d",
+node hash]. A node's hash is the blob_store hash of its JSON, so equal hashes
+mean equal subtrees and a node is stored once however many checkpoints share
+it. A checkpoint is a stored root hash; the files changed since one are found
+by descending only into directories whose hashes differ, without touching
+the workspace.
+
+The current tree of a workspace is kept in memory (WorkspaceTree) and
+updated per path: by execute_task after each write, and by a watchfiles
+(inotify) watcher for edits made outside the app. Only nodes changed since
+the last checkpoint are rehashed and stored when the next one is taken.
+
+Loading a tree reconciles a stored one with the workspace: files whose size
+and mtime match their stored entry keep its hash, so only changed files are
+read. The stored tree is the project's last checkpoint, or for a fresh
+workspace that of another project on the same repo: workspaces are
+hardlinked from one base checkout, so their files' stats match it. Without
+watchfiles (or with MERKLE_WATCH=0) edits made outside the app are only seen
+by a rescan. Vendored and build directories (repo_analyzer.SKIP_DIRS) are
+not tracked.
+"""
+import hashlib
+import json
+import logging
+import os
+import stat
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+import blob_store
+from database import Project, WorkspaceCheckpoint
+from repo_analyzer import SKIP_DIRS
+
+try:
+    import watchfiles
+except ImportError:  # optional; edits outside the app then need a rescan
+    watchfiles = None
+
+MERKLE_WATCH = os.getenv("MERKLE_WATCH", "1") == "1"
+# Each watched workspace holds one inotify watch per directory
+MAX_LOADED_TREES = int(os.getenv("MERKLE_MAX_TREES", "8"))
+WATCH_DEBOUNCE_MS = 200
+_READ_CHUNK = 1024 * 1024
+_CHUNK = 500
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_file(path: str, st: os.stat_result) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    if stat.S_ISLNK(st.st_mode):
+        digest.update(os.readlink(path).encode("utf-8", "surrogateescape"))
+    else:
+        with open(path, "rb") as f:
+            while chunk := f.read(_READ_CHUNK):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_tree(db: Session, root_hash: Optional[str]) -> Dict[str, Dict[str, list]]:
+    """Entries by directory of a stored tree ({} for None), to seed a WorkspaceTree."""
+    tree: Dict[str, Dict[str, list]] = {}
+    level = {root_hash: [""]} if root_hash else {}
+    while level:
+        contents = {}
+        hashes = list(level)
+        for i in range(0, len(hashes), _CHUNK):
+            contents.update(blob_store.get_many(db, hashes[i:i + _CHUNK]))
+        next_level: Dict[str, List[str]] = {}
+        for node_hash, rel_dirs in level.items():
+            if node_hash not in contents:
+                continue
+            entries = {entry[0]: entry[1:] for entry in json.loads(contents[node_hash])}
+            for rel_dir in rel_dirs:
+                tree[rel_dir] = entries
+                for name, entry in entries.items():
+                    if entry[0] == "d":
+                        next_level.setdefault(entry[1], []).append(os.path.join(rel_dir, name))
+        level = next_level
+    return tree
+
+
+class _Node:
+    __slots__ = ("entries", "hash")
+
+    def __init__(self, entries: Dict[str, list]):
+        self.entries = entries
+        self.hash: Optional[str] = None  # None until digested, and again once changed
+
+
+class WorkspaceTree:
+    def __init__(self, root: str, seed: Dict[str, Dict[str, list]]):
+        self.root = root
+        self.inode = os.stat(root).st_ino
+        self.lock = threading.RLock()
+        self.stale = False  # set when the watcher fails: rescan before answering
+        self.nodes: Dict[str, _Node] = {}
+        # Node texts not yet in the blob store, by hash
+        self.unsaved: Dict[str, str] = {}
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        with self.lock:
+            self.nodes = self._walk("", seed)
+
+    def _walk(self, start: str, seed: Dict[str, Dict[str, list]]) -> Dict[str, _Node]:
+        """Nodes of the subtree at start, hashing only files whose size or
+        mtime differ from their seed entry."""
+        nodes = {}
+        stack = [start]
+        while stack:
+            rel_dir = stack.pop()
+            known = seed.get(rel_dir, {})
+            entries = {}
+            try:
+                scanner = os.scandir(os.path.join(self.root, rel_dir))
+            except (FileNotFoundError, NotADirectoryError):
+                continue  # removed meanwhile; digest drops its entry
+            with scanner:
+                for entry in scanner:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            entries[entry.name] = ["d", None]
+                            stack.append(os.path.join(rel_dir, entry.name))
+                        continue
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                        if not (stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode)):
+                            continue
+                        old = known.get(entry.name)
+                        if old and old[0] == "f" and old[2] == st.st_size and old[3] == st.st_mtime_ns:
+                            entries[entry.name] = list(old)
+                        else:
+                            entries[entry.name] = ["f", _hash_file(entry.path, st), st.st_size, st.st_mtime_ns]
+                    except FileNotFoundError:
+                        continue
+            nodes[rel_dir] = _Node(entries)
+        return nodes
+
+    def _touch(self, rel_dir: str):
+        while True:
+            self.nodes[rel_dir].hash = None
+            if not rel_dir:
+                return
+            rel_dir = os.path.dirname(rel_dir)
+
+    def _drop(self, rel_dir: str):
+        node = self.nodes.pop(rel_dir, None)
+        if node is not None:
+            for name, entry in node.entries.items():
+                if entry[0] == "d":
+                    self._drop(os.path.join(rel_dir, name))
+
+    def _directory(self, rel_dir: str) -> Optional[_Node]:
+        # The node of rel_dir, walking it in if it appeared since its parent was
+        node = self.nodes.get(rel_dir)
+        if node is not None or not rel_dir:
+            return node
+        parent = self._directory(os.path.dirname(rel_dir))
+        name = os.path.basename(rel_dir)
+        if parent is None or name in SKIP_DIRS or not os.path.isdir(os.path.join(self.root, rel_dir)):
+            return None
+        nodes = self._walk(rel_dir, {})
+        if rel_dir not in nodes:
+            return None
+        self.nodes.update(nodes)
+        parent.entries[name] = ["d", None]
+        self._touch(rel_dir)
+        return nodes[rel_dir]
+
+    def update(self, rel_path: str):
+        """Bring one path (file or directory) up to date with the workspace."""
+        rel_dir, name = os.path.split(rel_path)
+        if not name or SKIP_DIRS.intersection(rel_dir.split(os.sep)):
+            return
+        path = os.path.join(self.root, rel_path)
+        # Hash before taking the lock, so nobody waits on file IO; kept if the
+        # file has not changed again by the time the lock is held
+        hashed = None
+        try:
+            st = os.lstat(path)
+            node = self.nodes.get(rel_dir)
+            seen = node.entries.get(name) if node is not None else None
+            if (stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode)) and not (
+                    seen and seen[0] == "f" and seen[2] == st.st_size and seen[3] == st.st_mtime_ns):
+                hashed = ((st.st_ino, st.st_size, st.st_mtime_ns), _hash_file(path, st))
+        except FileNotFoundError:
+            pass
+        with self.lock:
+            parent = self._directory(rel_dir)
+            if parent is None:
+                return
+            old = parent.entries.get(name)
+            try:
+                st = os.lstat(path)
+                if stat.S_ISDIR(st.st_mode):
+                    if (old is None or old[0] != "d") and name not in SKIP_DIRS:
+                        parent.entries.pop(name, None)
+                        self._directory(rel_path)
+                    return
+                if not (stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode)):
+                    return
+                if old and old[0] == "f" and old[2] == st.st_size and old[3] == st.st_mtime_ns:
+                    return
+                if hashed is not None and hashed[0] == (st.st_ino, st.st_size, st.st_mtime_ns):
+                    content_hash = hashed[1]
+                else:
+                    content_hash = _hash_file(path, st)
+                entry = ["f", content_hash, st.st_size, st.st_mtime_ns]
+            except FileNotFoundError:
+                entry = None
+            if old and old[0] == "d":
+                self._drop(rel_path)
+            if entry is None:
+                if parent.entries.pop(name, None) is None:
+                    return
+            else:
+                parent.entries[name] = entry
+            self._touch(rel_dir)
+
+    def rescan(self):
+        """Reconcile with the workspace, rehashing files whose stats changed."""
+        with self.lock:
+            seed = {rel_dir: node.entries for rel_dir, node in self.nodes.items()}
+            self.nodes = self._walk("", seed)
+            self.stale = False
+
+    def _digest(self, rel_dir: str) -> Optional[str]:
+        node = self.nodes.get(rel_dir)
+        if node is None:
+            return None
+        if node.hash is None:
+            for name, entry in list(node.entries.items()):
+                if entry[0] == "d":
+                    child = self._digest(os.path.join(rel_dir, name))
+                    if child is None:
+                        del node.entries[name]
+                    else:
+                        entry[1] = child
+            text = json.dumps([[name, *entry] for name, entry in sorted(node.entries.items())], separators=(",", ":"))
+            node.hash = blob_store.content_hash(text)
+            self.unsaved[node.hash] = text
+        return node.hash
+
+    def digest(self) -> str:
+        """Root hash of the tree as it stands, hashing the nodes changed since."""
+        with self.lock:
+            return self._digest("")
+
+    def snapshot(self) -> Tuple[str, Dict[str, str]]:
+        """(root hash, texts of its nodes not yet stored) for checkpoint()."""
+        with self.lock:
+            root_hash = self._digest("")
+            # Nodes of states between checkpoints are not worth keeping
+            current = {node.hash for node in self.nodes.values()}
+            self.unsaved = {node_hash: text for node_hash, text in self.unsaved.items() if node_hash in current}
+            return root_hash, dict(self.unsaved)
+
+    def saved(self, hashes: Iterable[str]):
+        with self.lock:
+            for node_hash in hashes:
+                self.unsaved.pop(node_hash, None)
+
+    def _files(self, rel_dir: str) -> List[str]:
+        files = []
+        for name, entry in self.nodes[rel_dir].entries.items():
+            path = os.path.join(rel_dir, name)
+            files.extend(self._files(path) if entry[0] == "d" else [path])
+        return files
+
+    def diff(self, db: Session, since: str) -> dict:
+        """Files added, modified and removed since the stored tree `since`.
+        Only directories whose hashes differ are read. Call under lock."""
+        added, modified, removed = [], [], []
+        # (directory, its node hash in `since`, whether it still exists)
+        level = [("", since, True)]
+        while level:
+            contents = {}
+            hashes = list({node_hash for _, node_hash, _ in level})
+            for i in range(0, len(hashes), _CHUNK):
+                contents.update(blob_store.get_many(db, hashes[i:i + _CHUNK]))
+            next_level = []
+            for rel_dir, node_hash, exists in level:
+                old = {entry[0]: entry[1:] for entry in json.loads(contents[node_hash])}
+                new = self.nodes[rel_dir].entries if exists else {}
+                for name in old.keys() | new.keys():
+                    path = os.path.join(rel_dir, name)
+                    before, after = old.get(name), new.get(name)
+                    if before is not None and after is not None and before[:2] == after[:2]:
+                        continue
+                    if before is not None and before[0] == "d":
+                        next_level.append((path, before[1], after is not None and after[0] == "d"))
+                    elif before is not None and (after is None or after[0] == "d"):
+                        removed.append(path)
+                    elif before is not None:
+                        modified.append(path)
+                    if after is not None and after[0] == "d" and (before is None or before[0] != "d"):
+                        added.extend(self._files(path))
+                    elif after is not None and after[0] == "f" and (before is None or before[0] == "d"):
+                        added.append(path)
+            level = next_level
+        return {"added": sorted(added), "modified": sorted(modified), "removed": sorted(removed)}
+
+    def _watch(self):
+        try:
+            for changes in watchfiles.watch(self.root, watch_filter=None, debounce=WATCH_DEBOUNCE_MS,
+                                            stop_event=self._stop, raise_interrupt=False, ignore_permission_denied=True):
+                for _, path in changes:
+                    rel_path = os.path.relpath(path, self.root)
+                    if rel_path != "." and not rel_path.startswith(os.pardir):
+                        self.update(rel_path)
+        except Exception:
+            logger.exception("Stopped watching %s", self.root)
+            self.stale = True
+
+    def watch(self):
+        if watchfiles is not None and MERKLE_WATCH and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name="merkle-watch", daemon=True)
+            self._watcher.start()
+
+    def close(self, wait: bool = False):
+        self._stop.set()
+        # A watcher still inside watchfiles at interpreter exit aborts the process
+        if wait and self._watcher is not None:
+            self._watcher.join(timeout=2)
+
+
+_trees: "OrderedDict[int, WorkspaceTree]" = OrderedDict()
+_trees_lock = threading.Lock()
+
+
+def loaded(project_id: int, root: str) -> Optional[WorkspaceTree]:
+    """The project's tree if it is in memory and still of the workspace at root."""
+    with _trees_lock:
+        tree = _trees.get(project_id)
+        if tree is not None:
+            _trees.move_to_end(project_id)
+    try:
+        # A re-provisioned workspace is a new directory at the same path
+        if tree is not None and tree.root == root and tree.inode == os.stat(root).st_ino:
+            return tree
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def load(project_id: int, root: str, seed: Dict[str, Dict[str, list]]) -> WorkspaceTree:
+    """The project's tree, reconciled from seed (see read_tree) if not loaded. Blocking."""
+    tree = loaded(project_id, root)
+    if tree is not None:
+        return tree
+    tree = WorkspaceTree(root, seed)
+    tree.watch()
+    with _trees_lock:
+        previous = _trees.pop(project_id, None)
+        _trees[project_id] = tree
+        evicted = [previous] if previous is not None else []
+        while len(_trees) > MAX_LOADED_TREES:
+            evicted.append(_trees.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return tree
+
+
+def update(project_id: int, root: str, rel_path: str):
+    """Record a write to rel_path, if the project's tree is loaded. Blocking."""
+    tree = loaded(project_id, root)
+    if tree is not None:
+        tree.update(rel_path)
+
+
+def close_all():
+    with _trees_lock:
+        trees = list(_trees.values())
+        _trees.clear()
+    for tree in trees:
+        tree.close(wait=True)
+
+
+def checkpoint(db: Session, project_id: int, root_hash: str, texts: List[str], label: Optional[str] = None) -> dict:
+    """db_writer command: store the new node texts of a WorkspaceTree.snapshot()
+    and record its root. Mark them saved() on the tree once committed."""
+    blob_store.put_many(db, texts)
+    db.get(Project, project_id).tree_hash = root_hash
+    record = WorkspaceCheckpoint(project_id=project_id, root_hash=root_hash, label=label)
+    db.add(record)
+    db.flush()
+    return {"id": record.id, "root_hash": root_hash, "label": label, "created_at": record.created_at.isoformat()}
+
+
+def changes(db: Session, tree: WorkspaceTree, since: str) -> dict:
+    """Files changed in the tree since the stored root `since`. Takes the
+    tree's lock: call from a worker thread (database.run_in_session)."""
+    with tree.lock:
+        root_hash = tree.digest()
+        found = tree.diff(db, since) if root_hash != since else {"added": [], "modified": [], "removed": []}
+    return {"root_hash": root_hash, **found}
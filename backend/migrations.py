@@ -0,0 +1,203 @@
+"""Versioned schema migrations, applied at startup by database.init_db.
+
+Every schema change ships as a numbered migration here, new tables included
+(`Model.__table__.create(conn, checkfirst=True)`): a database already at
+LATEST_VERSION starts without running create_all. Applied versions are
+recorded in schema_migrations. A brand-new database is created from the
+models at the latest schema and stamped without replaying history.
+Migrations must be idempotent: a crash between running one and recording it
+re-runs it on the next start.
+"""
+import json
+import logging
+from typing import Callable, List, Tuple
+
+from sqlalchemy import LargeBinary, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+import blob_store
+from database import Base, Blob, FileAnalysis, SchemaMigration, SymbolDefinition, SymbolFile, SymbolReference, WorkspaceCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+def _create_router_indexes(conn: Connection):
+    # Composite indexes matching each router's filter + order patterns
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_plans_project_id_id ON plans (project_id, id)",
+        "CREATE INDEX IF NOT EXISTS ix_phases_project_id_phase_number ON phases (project_id, phase_number)",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_phase_id_task_number ON tasks (phase_id, task_number)",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_project_id_status ON tasks (project_id, status)",
+        "CREATE INDEX IF NOT EXISTS ix_system_designs_phase_id ON system_designs (phase_id)",
+        "CREATE INDEX IF NOT EXISTS ix_system_designs_project_id ON system_designs (project_id)",
+        "CREATE INDEX IF NOT EXISTS ix_execution_logs_project_id_id ON execution_logs (project_id, id)",
+        "CREATE INDEX IF NOT EXISTS ix_execution_logs_project_id_task_id_id ON execution_logs (project_id, task_id, id)",
+        "CREATE INDEX IF NOT EXISTS ix_execution_logs_project_id_log_type_id ON execution_logs (project_id, log_type, id)",
+        "CREATE INDEX IF NOT EXISTS ix_execution_states_status_lease_expires_at ON execution_states (status, lease_expires_at)",
+        "CREATE INDEX IF NOT EXISTS ix_prs_project_id_id ON prs (project_id, id)",
+    ]
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+def _add_foreign_keys(conn: Connection):
+    # SQLite can only gain constraints by rebuilding tables; new SQLite
+    # databases get them from the models. On Postgres add them NOT VALID so
+    # legacy orphan rows do not block startup.
+    if conn.dialect.name != "postgresql":
+        return
+    constraints = [
+        ("plans", "fk_plans_project_id", "project_id", "projects"),
+        ("phases", "fk_phases_project_id", "project_id", "projects"),
+        ("tasks", "fk_tasks_project_id", "project_id", "projects"),
+        ("tasks", "fk_tasks_phase_id", "phase_id", "phases"),
+        ("system_designs", "fk_system_designs_project_id", "project_id", "projects"),
+        ("system_designs", "fk_system_designs_phase_id", "phase_id", "phases"),
+        ("prs", "fk_prs_project_id", "project_id", "projects"),
+    ]
+    inspector = inspect(conn)
+    for table, name, column, referred in constraints:
+        if any(fk["constrained_columns"] == [column] for fk in inspector.get_foreign_keys(table)):
+            continue
+        conn.execute(text(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {referred} (id) NOT VALID"
+        ))
+
+
+# (table, legacy text column, stored as JSON) -> <column>_hash
+BLOB_COLUMNS = [
+    ("plans", "plan_document", False),
+    ("tasks", "code_changes", False),
+    ("system_designs", "architecture", False),
+    ("system_designs", "sequence_diagram", False),
+    ("system_designs", "api_structure", True),
+    ("system_designs", "db_changes", True),
+    ("system_designs", "data_flow", False),
+]
+
+
+def _move_to_blobs(conn: Connection):
+    # Legacy columns are emptied rather than dropped (SQLite cannot drop
+    # columns in place); VACUUM reclaims their space
+    Blob.__table__.create(conn, checkfirst=True)
+    inspector = inspect(conn)
+    for table, column, is_json in BLOB_COLUMNS:
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        if f"{column}_hash" not in columns:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column}_hash VARCHAR(64) REFERENCES blobs (hash)"))
+        if column not in columns:
+            continue
+        rows = conn.execute(text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")).all()
+        for row_id, content in rows:
+            if is_json:
+                # Same canonical form the design router writes
+                value = json.loads(content) if isinstance(content, str) else content
+                content = json.dumps(value, sort_keys=True) if value is not None else None
+            content_hash = blob_store.content_hash(content) if content is not None else None
+            if content_hash is not None:
+                conn.execute(
+                    text("INSERT INTO blobs (hash, content, size, created_at) "
+                         "SELECT :hash, :content, :size, CURRENT_TIMESTAMP "
+                         "WHERE NOT EXISTS (SELECT 1 FROM blobs WHERE hash = :hash)"),
+                    {"hash": content_hash, "content": content, "size": len(content.encode("utf-8"))},
+                )
+            conn.execute(
+                text(f"UPDATE {table} SET {column}_hash = :hash, {column} = NULL WHERE id = :id"),
+                {"hash": content_hash, "id": row_id},
+            )
+
+
+def _compress_text_columns(conn: Connection):
+    # SQLite stores the compressed bytes in the existing columns as they are,
+    # and legacy TEXT values still read back; run backfill_compression.py to
+    # compress them. Postgres needs the column type changed first.
+    if conn.dialect.name != "postgresql":
+        return
+    inspector = inspect(conn)
+    for table, column in (("execution_logs", "content"), ("blobs", "content")):
+        current = next(c["type"] for c in inspector.get_columns(table) if c["name"] == column)
+        if isinstance(current, LargeBinary):
+            continue
+        conn.execute(text(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BYTEA USING convert_to({column}, 'UTF8')"
+        ))
+
+
+def _add_project_analysis(conn: Connection):
+    columns = {c["name"] for c in inspect(conn).get_columns("projects")}
+    if "analysis_hash" not in columns:
+        conn.execute(text("ALTER TABLE projects ADD COLUMN analysis_hash VARCHAR(64) REFERENCES blobs (hash)"))
+    if "analyzed_at" not in columns:
+        conn.execute(text("ALTER TABLE projects ADD COLUMN analyzed_at TIMESTAMP"))
+
+
+def _create_file_analyses(conn: Connection):
+    FileAnalysis.__table__.create(conn, checkfirst=True)
+
+
+def _create_symbol_index(conn: Connection):
+    for model in (SymbolFile, SymbolDefinition, SymbolReference):
+        model.__table__.create(conn, checkfirst=True)
+
+
+def _add_project_code_graph(conn: Connection):
+    columns = {c["name"] for c in inspect(conn).get_columns("projects")}
+    if "code_graph_hash" not in columns:
+        conn.execute(text("ALTER TABLE projects ADD COLUMN code_graph_hash VARCHAR(64) REFERENCES blobs (hash)"))
+
+
+
+def _create_workspace_checkpoints(conn: Connection):
+    columns = {c["name"] for c in inspect(conn).get_columns("projects")}
+    if "tree_hash" not in columns:
+        conn.execute(text("ALTER TABLE projects ADD COLUMN tree_hash VARCHAR(64) REFERENCES blobs (hash)"))
+    WorkspaceCheckpoint.__table__.create(conn, checkfirst=True)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "router access-path indexes", _create_router_indexes),
+    (2, "foreign keys", _add_foreign_keys),
+    (3, "content-addressed blobs", _move_to_blobs),
+    (4, "compressed text columns", _compress_text_columns),
+    (5, "persisted repo analysis", _add_project_analysis),
+    (6, "per-file analysis cache", _create_file_analyses),
+    (7, "workspace symbol index", _create_symbol_index),
+    (8, "python code graph", _add_project_code_graph),
+    (9, "workspace merkle checkpoints", _create_workspace_checkpoints),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: Connection) -> int:
+    if not inspect(conn).has_table(SchemaMigration.__tablename__):
+        return 0
+    return conn.execute(text("SELECT MAX(version) FROM schema_migrations")).scalar() or 0
+
+
+def migrate(engine: Engine):
+    """Bring the database up to LATEST_VERSION."""
+    with engine.connect() as conn:
+        if current_version(conn) >= LATEST_VERSION:
+            # Fast path for every boot after the first: nothing to create
+            return
+
+    with engine.begin() as conn:
+        fresh = not inspect(conn).has_table("projects")
+        Base.metadata.create_all(bind=conn)
+        if fresh:
+            conn.execute(SchemaMigration.__table__.insert(), [
+                {"version": version, "name": name} for version, name, _ in MIGRATIONS
+            ])
+            return
+
+    with engine.connect() as conn:
+        version = current_version(conn)
+    for migration_version, name, apply in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        logger.info("Applying migration %d: %s", migration_version, name)
+        with engine.begin() as conn:
+            apply(conn)
+            conn.execute(SchemaMigration.__table__.insert().values(version=migration_version, name=name))
+
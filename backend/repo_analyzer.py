@@ -0,0 +1,531 @@
+"""Static analysis of a project workspace for /api/repos/analyze.
+
+The tree is walked by a thread pool (one scandir per directory, so slow
+disks overlap) while files stream in batches to a process pool that reads
+and parses them. Vendored and build directories, binaries and oversized
+files are skipped. The whole run is bounded by a time budget: whatever has
+been parsed when it runs out is reported, with stats.truncated set.
+
+Parsing is regex-based per language and fills the RepoAnalysis fields:
+manifests give the tech stack, source files give routes, API endpoints,
+components, models and table definitions. index_files() runs a second,
+symbol-level pass over source files for symbol_index.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+from bisect import bisect_right
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+import code_graph
+
+# Bump when parsing changes, so cached per-file results are not reused
+ANALYZER_VERSION = 2
+ANALYZE_TIME_BUDGET = float(os.getenv("ANALYZE_TIME_BUDGET", "20"))
+ANALYZE_WALK_THREADS = int(os.getenv("ANALYZE_WALK_THREADS", "16"))
+ANALYZE_PROCESSES = int(os.getenv("ANALYZE_PROCESSES", str(os.cpu_count() or 1)))
+ANALYZE_MAX_FILE_BYTES = int(os.getenv("ANALYZE_MAX_FILE_BYTES", str(1024 * 1024)))
+BATCH_SIZE = 256
+MAX_LIST_ENTRIES = 500
+MAX_DIR_ENTRIES = 100
+MAX_TREE_DEPTH = 10
+
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "bower_components", "vendor", "third_party", "elm-stuff",
+    "dist", "build", "out", "target", "coverage", "__pycache__", ".venv", "venv", ".tox", ".nox",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".next", ".nuxt", ".svelte-kit", ".gradle", ".idea",
+    ".vscode", "Pods",
+}
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".bmp", ".tiff", ".psd", ".pdf", ".zip", ".gz",
+    ".tgz", ".bz2", ".xz", ".7z", ".rar", ".jar", ".war", ".class", ".so", ".dylib", ".dll", ".exe",
+    ".bin", ".o", ".a", ".pyc", ".pyo", ".whl", ".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp3",
+    ".mp4", ".mov", ".avi", ".webm", ".wav", ".wasm", ".db", ".sqlite", ".sqlite3",
+}
+LANGUAGES = {
+    ".py": "Python", ".js": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript", ".jsx": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript", ".elm": "Elm", ".go": "Go", ".rb": "Ruby", ".java": "Java",
+    ".kt": "Kotlin", ".cs": "C#", ".php": "PHP", ".rs": "Rust", ".vue": "Vue", ".svelte": "Svelte",
+    ".sql": "SQL", ".prisma": "Prisma",
+}
+MANIFESTS = {
+    "package.json", "requirements.txt", "pyproject.toml", "Pipfile", "elm.json", "go.mod", "Cargo.toml",
+    "Gemfile", "pom.xml", "build.gradle", "composer.json",
+}
+FRAMEWORKS = {
+    "react": "React", "next": "Next.js", "vue": "Vue", "svelte": "Svelte", "@angular/core": "Angular",
+    "express": "Express", "fastify": "Fastify", "@nestjs/core": "NestJS", "vite": "Vite",
+    "tailwindcss": "TailwindCSS", "typescript": "TypeScript", "prisma": "Prisma", "@prisma/client": "Prisma",
+    "fastapi": "FastAPI", "django": "Django", "flask": "Flask", "sqlalchemy": "SQLAlchemy",
+    "github.com/gin-gonic/gin": "Gin", "rails": "Rails", "spring-boot-starter-web": "Spring Boot",
+    "laravel/framework": "Laravel", "actix-web": "Actix", "elm/browser": "Elm",
+}
+ROUTE_DIRS = {"routes", "router", "routers", "pages", "Pages", "PagesComponents", "app", "views", "controllers"}
+COMPONENT_DIRS = {"components", "Components", "widgets", "ui"}
+MODEL_DIRS = {"models", "Models", "entities", "schemas"}
+
+HTTP_ROUTE = re.compile(
+    r"""(?:@\w+|\b(?:app|router|api|server|blueprint|bp))\.(get|post|put|patch|delete|route)\(\s*["'`]([^"'`]*)["'`]""",
+    re.IGNORECASE,
+)
+PY_MODEL = re.compile(r"^class\s+(\w+)\((?:[\w.]*\.)?(Base|Model|BaseModel|SQLModel|Document)\b", re.MULTILINE)
+PY_TABLENAME = re.compile(r"""__tablename__\s*=\s*["'](\w+)["']""")
+PY_COLUMN = re.compile(r"^\s+(\w+)\s*(?::\s*[\w\[\], .]+)?=\s*(?:Column|mapped_column|models\.\w+Field)\(", re.MULTILINE)
+SQL_TABLE = re.compile(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[`\"\[]?(\w+)[`\"\]]?\s*\((.*?)\);", re.IGNORECASE | re.DOTALL)
+PRISMA_MODEL = re.compile(r"^model\s+(\w+)\s*\{(.*?)^\}", re.MULTILINE | re.DOTALL)
+JS_COMPONENT = re.compile(r"export\s+(?:default\s+)?(?:function|const|class)\s+([A-Z]\w*)")
+ELM_MODULE = re.compile(r"^(?:port\s+)?module\s+([\w.]+)\s+exposing", re.MULTILINE)
+
+# Symbol definitions per extension: (pattern, kind when it has no kind group)
+_JS_DEFINITIONS = [
+    (re.compile(r"^[ \t]*(?:export[ \t]+)?(?:default[ \t]+)?(?:declare[ \t]+)?(?:abstract[ \t]+)?(?:async[ \t]+)?"
+                r"(?P<kind>function|class|interface|type|enum)\*?[ \t]+(?P<name>[A-Za-z_$][\w$]*)", re.MULTILINE), None),
+    (re.compile(r"^(?:export[ \t]+)?(?:const|let|var)[ \t]+(?P<name>[A-Za-z_$][\w$]*)", re.MULTILINE), "variable"),
+]
+_CLASS_LIKE = (re.compile(
+    r"^[ \t]*(?:(?:public|private|protected|internal|static|final|abstract|sealed|open|data|override|async|partial|readonly)[ \t]+)*"
+    r"(?P<kind>class|interface|enum|object|record|struct|trait|fun|function)[ \t]+(?P<name>\w+)", re.MULTILINE), None)
+DEFINITIONS = {
+    ".py": [
+        (re.compile(r"^[ \t]*(?:async[ \t]+)?(?P<kind>def|class)[ \t]+(?P<name>\w+)", re.MULTILINE), None),
+        (re.compile(r"^(?P<name>[A-Za-z_]\w*)[ \t]*(?::[^=\n]*)?=(?!=)", re.MULTILINE), "variable"),
+    ],
+    ".elm": [
+        (re.compile(r"^(?P<kind>type)[ \t]+(?:alias[ \t]+)?(?P<name>[A-Z]\w*)", re.MULTILINE), None),
+        (re.compile(r"^port[ \t]+(?P<name>[a-z]\w*)[ \t]*:", re.MULTILINE), "function"),
+        # Top-level definition lines; their type annotations are not counted twice
+        (re.compile(r"^(?!type\b|port\b)(?P<name>[a-z]\w*)(?:[ \t]+\w+)*[ \t]*=(?!=)", re.MULTILINE), "function"),
+    ],
+    ".go": [
+        (re.compile(r"^func[ \t]+(?:\([^)]*\)[ \t]*)?(?P<name>\w+)", re.MULTILINE), "function"),
+        (re.compile(r"^type[ \t]+(?P<name>\w+)", re.MULTILINE), "type"),
+    ],
+    ".rb": [(re.compile(r"^[ \t]*(?P<kind>def|class|module)[ \t]+(?:self\.)?(?P<name>\w+[?!]?)", re.MULTILINE), None)],
+    ".rs": [(re.compile(r"^[ \t]*(?:pub(?:\([^)]*\))?[ \t]+)?(?:async[ \t]+)?(?:unsafe[ \t]+)?"
+                        r"(?P<kind>fn|struct|enum|trait|type|mod|const|static)[ \t]+(?P<name>\w+)", re.MULTILINE), None)],
+    ".java": [_CLASS_LIKE], ".kt": [_CLASS_LIKE], ".cs": [_CLASS_LIKE], ".php": [_CLASS_LIKE],
+    ".sql": [(re.compile(r"^[ \t]*CREATE[ \t]+(?:OR[ \t]+REPLACE[ \t]+)?(?:UNIQUE[ \t]+)?(?P<kind>TABLE|VIEW|FUNCTION|PROCEDURE|INDEX|TYPE)"
+                         r"[ \t]+(?:IF[ \t]+NOT[ \t]+EXISTS[ \t]+)?[`\"\[]?(?:\w+\.)?(?P<name>\w+)", re.MULTILINE | re.IGNORECASE), None)],
+    ".prisma": [(re.compile(r"^(?P<kind>model|enum|type)[ \t]+(?P<name>\w+)", re.MULTILINE), None)],
+    **{ext: _JS_DEFINITIONS for ext in (".js", ".mjs", ".cjs", ".jsx", ".ts", ".tsx", ".vue", ".svelte")},
+}
+KINDS = {
+    "def": "function", "fn": "function", "fun": "function", "object": "class", "record": "class",
+    "mod": "module", "model": "class", "static": "const",
+}
+IDENTIFIER = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]{2,}")
+# Not worth indexing as references: keywords and builtins common to the languages above
+REFERENCE_STOPWORDS = frozenset("""
+    and any are async await bool boolean break case catch char class const continue def default defer del delete
+    elif else enum exposing export extends false final finally float for from func function global import impl
+    int interface lambda let long module new nil none not null number object pass private protected public
+    raise return self static str string struct super switch then this throw true try type typeof undefined
+    var void where while with yield None True False alias port
+""".split())
+MAX_REFERENCE_LINES = 64
+
+
+def _decode(data: bytes) -> Optional[str]:
+    if len(data) > ANALYZE_MAX_FILE_BYTES or b"\0" in data[:8192]:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+def _manifest_dependencies(name: str, text: str) -> List[str]:
+    if name in ("package.json", "composer.json", "elm.json"):
+        data = json.loads(text)
+        deps = []
+        for key in ("dependencies", "devDependencies", "peerDependencies", "require", "require-dev"):
+            section = data.get(key) or {}
+            # elm.json nests direct/indirect
+            deps += list(section.get("direct", section) if isinstance(section, dict) else section)
+        return deps
+    # Other formats: every name-like token; only known frameworks are kept
+    return re.findall(r"[@\w][\w.\-/@]*\w", text)
+
+
+def _parse_file(rel_path: str, text: str) -> dict:
+    name = os.path.basename(rel_path)
+    ext = os.path.splitext(name)[1].lower()
+    parts = rel_path.split(os.sep)
+    found = {"path": rel_path, "language": LANGUAGES.get(ext)}
+
+    if name in MANIFESTS:
+        try:
+            found["dependencies"] = _manifest_dependencies(name, text)
+        except (ValueError, AttributeError, TypeError):
+            found["dependencies"] = []
+        if name == "elm.json":
+            found["dependencies"].append("elm/browser")
+
+    apis = [{"method": m.upper() if m.lower() != "route" else "ANY", "path": p, "file": rel_path}
+            for m, p in HTTP_ROUTE.findall(text)] if ext in (".py", ".js", ".mjs", ".cjs", ".ts", ".rb", ".php") else []
+    if apis:
+        found["apis"] = apis
+    found["routing"] = bool(apis) or (bool(ROUTE_DIRS.intersection(parts[:-1])) and ext in LANGUAGES)
+    found["component"] = ext in (".vue", ".svelte") or (
+        ext in (".jsx", ".tsx", ".elm") and bool(COMPONENT_DIRS.intersection(parts[:-1]))
+    ) or (ext in (".jsx", ".tsx") and bool(JS_COMPONENT.search(text)))
+
+    tables: Dict[str, List[str]] = {}
+    is_model = ext in LANGUAGES and bool(MODEL_DIRS.intersection(parts[:-1]))
+    if ext == ".py":
+        python = code_graph.parse_python(rel_path, text)
+        if python:
+            found["python"] = python
+        if PY_MODEL.search(text):
+            is_model = True
+        # One class per __tablename__; columns are those up to the next table
+        chunks = PY_TABLENAME.split(text)
+        for table, body in zip(chunks[1::2], chunks[2::2]):
+            tables[table] = PY_COLUMN.findall(body)
+    elif ext == ".sql":
+        for table, body in SQL_TABLE.findall(text):
+            columns = [line.strip().split()[0].strip('`"[]') for line in body.split(",") if line.strip()]
+            tables[table] = [c for c in columns if c.upper() not in ("PRIMARY", "FOREIGN", "UNIQUE", "CONSTRAINT", "KEY", "INDEX", "CHECK")]
+    elif ext == ".prisma":
+        for model, body in PRISMA_MODEL.findall(text):
+            is_model = True
+            tables[model] = [line.split()[0] for line in body.splitlines() if line.strip() and not line.strip().startswith(("@@", "//"))]
+    elif ext == ".elm":
+        module = ELM_MODULE.search(text)
+        if module and ".Models." in f".{module.group(1)}.":
+            is_model = True
+    found["model"] = is_model
+    if tables:
+        found["tables"] = tables
+    return found
+
+
+def _symbols(rel_path: str, text: str) -> dict:
+    """Definitions as [name, kind, line] and references as {name: [lines]}.
+    Definition sites are not references; at most MAX_REFERENCE_LINES lines
+    are kept per name, with the full count alongside."""
+    ext = os.path.splitext(rel_path)[1].lower()
+    definitions = []
+    patterns = DEFINITIONS.get(ext, ())
+    if patterns:
+        line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+        for pattern, default_kind in patterns:
+            for m in pattern.finditer(text):
+                kind = m.groupdict().get("kind") or default_kind
+                definitions.append([m.group("name"), KINDS.get(kind.lower(), kind.lower()), bisect_right(line_starts, m.start("name"))])
+        definitions.sort(key=lambda d: d[2])
+    defined_at = {(name, line) for name, _, line in definitions}
+    references: Dict[str, list] = {}
+    for line_number, line in enumerate(text.split("\n"), 1):
+        for name in IDENTIFIER.findall(line):
+            if name in REFERENCE_STOPWORDS or (name, line_number) in defined_at:
+                continue
+            entry = references.get(name)
+            if entry is None:
+                references[name] = [1, line_number]
+            elif entry[-1] != line_number:
+                entry[0] += 1
+                if len(entry) <= MAX_REFERENCE_LINES:
+                    entry.append(line_number)
+    return {"definitions": definitions, "references": {name: (entry[0], entry[1:]) for name, entry in references.items()}}
+
+
+def _parse_batch(root: str, items: List[Tuple[str, FrozenSet[str]]], deadline: float) -> List[dict]:
+    """Parse each (path, cached hashes) item. Files whose content hash is
+    already cached come back as {"cached": True} without being parsed.
+    Stops at the deadline (CLOCK_MONOTONIC is shared with worker processes)."""
+    results = []
+    for rel_path, cached_hashes in items:
+        if time.monotonic() >= deadline:
+            break
+        try:
+            with open(os.path.join(root, rel_path), "rb") as f:
+                # Oversized files hash their prefix: enough to know they are skipped
+                data = f.read(ANALYZE_MAX_FILE_BYTES + 1)
+        except OSError:
+            results.append({"path": rel_path, "skipped": True})
+            continue
+        content_hash = hashlib.blake2b(data, digest_size=20).hexdigest()
+        if content_hash in cached_hashes:
+            results.append({"path": rel_path, "hash": content_hash, "cached": True})
+            continue
+        text = _decode(data)
+        parsed = _parse_file(rel_path, text) if text is not None else {"path": rel_path, "skipped": True}
+        parsed["hash"] = content_hash
+        results.append(parsed)
+    return results
+
+
+def _index_batch(root: str, rel_paths: List[str], deadline: float) -> List[dict]:
+    # Symbol entries for symbol_index; unreadable or non-text files get an
+    # empty entry so they are not retried until their content changes
+    entries = []
+    for rel_path in rel_paths:
+        if time.monotonic() >= deadline:
+            break
+        try:
+            with open(os.path.join(root, rel_path), "rb") as f:
+                data = f.read(ANALYZE_MAX_FILE_BYTES + 1)
+        except FileNotFoundError:
+            entries.append({"path": rel_path, "hash": None})
+            continue
+        except OSError:
+            continue
+        entry = {"path": rel_path, "hash": hashlib.blake2b(data, digest_size=20).hexdigest(),
+                 "definitions": [], "references": {}}
+        text = _decode(data)
+        if text is not None:
+            entry.update(_symbols(rel_path, text))
+        entries.append(entry)
+    return entries
+
+
+def _scan(root: str, rel_dir: str):
+    dirs, files, skipped = [], [], 0
+    with os.scandir(os.path.join(root, rel_dir)) as entries:
+        for entry in entries:
+            rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            if entry.is_symlink():
+                continue
+            if entry.is_dir():
+                if entry.name in SKIP_DIRS:
+                    skipped += 1
+                else:
+                    dirs.append(rel_path)
+            elif entry.is_file():
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in BINARY_EXTENSIONS or entry.name.endswith((".min.js", ".map")):
+                    skipped += 1
+                else:
+                    st = entry.stat(follow_symlinks=False)
+                    files.append((rel_path, st.st_size, st.st_mtime_ns, st.st_ino))
+    return dirs, files, skipped
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _parse_pool():
+    # On a single CPU, worker processes only add pickling: parse on one
+    # thread of our own, alongside the walk
+    global _process_pool
+    if ANALYZE_PROCESSES <= 1:
+        return ThreadPoolExecutor(1, thread_name_prefix="analyze-parse")
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn: forking the multi-threaded API process is unsafe
+            _process_pool = ProcessPoolExecutor(ANALYZE_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+
+@contextmanager
+def worker_pool():
+    """The pool scan() parses in, for other per-file passes (index_files,
+    code_search). Leftover work is never waited for on exit."""
+    pool = _parse_pool()
+    try:
+        yield pool
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); start a fresh pool next time
+        shutdown()
+        raise
+    finally:
+        if pool is not _process_pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def _directory_structure(files: List[str]) -> dict:
+    tree: dict = {}
+    for rel_path in sorted(files):
+        parts = rel_path.split(os.sep)
+        if len(parts) > MAX_TREE_DEPTH:
+            continue
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        if len(node) < MAX_DIR_ENTRIES:
+            node[parts[-1]] = "file"
+        else:
+            node["..."] = node.get("...", 0) + 1
+    return tree
+
+
+def _aggregate(results: List[dict]) -> dict:
+    languages: Dict[str, int] = {}
+    frameworks: List[str] = []
+    routing, components, apis, models = [], [], [], []
+    db_schema: Dict[str, List[str]] = {}
+    for found in sorted(results, key=lambda r: r["path"]):
+        if found.get("language"):
+            languages[found["language"]] = languages.get(found["language"], 0) + 1
+        for dependency in found.get("dependencies", ()):
+            framework = FRAMEWORKS.get(dependency.lower())
+            if framework and framework not in frameworks:
+                frameworks.append(framework)
+        if found.get("routing"):
+            routing.append(found["path"])
+        if found.get("component"):
+            components.append(found["path"])
+        if found.get("model"):
+            models.append(found["path"])
+        apis.extend(found.get("apis", ()))
+        for table, columns in found.get("tables", {}).items():
+            db_schema.setdefault(table, columns)
+    tech_stack = [language for language, _ in sorted(languages.items(), key=lambda item: -item[1])]
+    tech_stack += [framework for framework in frameworks if framework not in tech_stack]
+    return {
+        "tech_stack": tech_stack,
+        "routing": routing[:MAX_LIST_ENTRIES],
+        "components": components[:MAX_LIST_ENTRIES],
+        "apis": apis[:MAX_LIST_ENTRIES],
+        "models": models[:MAX_LIST_ENTRIES],
+        "db_schema": dict(list(db_schema.items())[:MAX_LIST_ENTRIES]),
+    }
+
+
+class Scan(NamedTuple):
+    files: List[str]
+    results: List[dict]  # per file: _parse_file fields plus "hash", or {"path", "skipped"}
+    skipped: int
+    cached: int
+    truncated: bool
+    elapsed_ms: float
+
+
+def scan(root: str, time_budget: float = ANALYZE_TIME_BUDGET, cache=None) -> Scan:
+    """Walk and parse the tree at root. Blocking.
+
+    With a cache (analysis_cache.FileAnalysisCache), files whose stat or
+    content hash it knows are not parsed again, and fresh results are
+    recorded on it for the caller to save.
+    """
+    started = time.monotonic()
+    deadline = started + time_budget
+    files: List[str] = []
+    stats_by_path: Dict[str, tuple] = {}
+    results: List[dict] = []
+    skipped = cached = 0
+    truncated = False
+    walk_pool = ThreadPoolExecutor(ANALYZE_WALK_THREADS, thread_name_prefix="analyze")
+    parse_pool = _parse_pool()
+    scans = {walk_pool.submit(_scan, root, "")}
+    parses = set()
+    batch: List[Tuple[str, FrozenSet[str]]] = []
+    try:
+        while scans or parses or batch:
+            if batch and (len(batch) >= BATCH_SIZE or not scans):
+                parses.add(parse_pool.submit(_parse_batch, root, batch, deadline))
+                batch = []
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                truncated = True
+                break
+            done, _ = wait(scans | parses, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in scans:
+                    scans.discard(future)
+                    try:
+                        dirs, dir_files, dir_skipped = future.result()
+                    except OSError:
+                        continue
+                    skipped += dir_skipped
+                    manifests = []
+                    for rel_path, *file_stat in dir_files:
+                        files.append(rel_path)
+                        stats_by_path[rel_path] = file_stat
+                        hit = cache.lookup_stat(rel_path, *file_stat) if cache is not None else None
+                        if hit is not None:
+                            results.append(hit)
+                            cached += 1
+                            continue
+                        item = (rel_path, cache.hashes(rel_path) if cache is not None else frozenset())
+                        # Manifests decide the tech stack: parse them first
+                        (manifests if os.path.basename(rel_path) in MANIFESTS else batch).append(item)
+                    if manifests:
+                        parses.add(parse_pool.submit(_parse_batch, root, manifests, deadline))
+                    scans.update(walk_pool.submit(_scan, root, d) for d in dirs)
+                else:
+                    parses.discard(future)
+                    for found in future.result():
+                        if "hash" in found and cache is not None:
+                            if found.pop("cached", False):
+                                found = cache.lookup_hash(found["path"], found["hash"])
+                                cached += 1
+                            cache.record(found, *stats_by_path[found["path"]])
+                        results.append(found)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); start a fresh pool next time
+        shutdown()
+        raise
+    finally:
+        # Never wait on leftover work; running batches stop at the deadline
+        walk_pool.shutdown(wait=False, cancel_futures=True)
+        if parse_pool is not _process_pool:
+            parse_pool.shutdown(wait=False, cancel_futures=True)
+        for future in parses:
+            future.cancel()
+
+    # Batches cut short by the deadline return fewer results
+    truncated = truncated or len(results) < len(files)
+    return Scan(files, results, skipped, cached, truncated, round((time.monotonic() - started) * 1000, 1))
+
+
+def summarize(result: Scan) -> dict:
+    """RepoAnalysis fields plus stats for the outcome of scan()."""
+    parsed = [r for r in result.results if not r.get("skipped")]
+    return {
+        "directory_structure": _directory_structure(result.files),
+        **_aggregate(parsed),
+        "stats": {
+            "files": len(result.files),
+            "parsed": len(parsed),
+            "cached": result.cached,
+            "skipped": result.skipped + len(result.results) - len(parsed),
+            "elapsed_ms": result.elapsed_ms,
+            "truncated": result.truncated,
+        },
+    }
+
+
+def analyze(root: str, time_budget: float = ANALYZE_TIME_BUDGET, cache=None) -> dict:
+    """RepoAnalysis fields for the tree at root, plus stats. Blocking."""
+    return summarize(scan(root, time_budget, cache))
+
+
+def index_files(root: str, rel_paths: List[str], time_budget: float = ANALYZE_TIME_BUDGET) -> List[dict]:
+    """Symbol entries for rel_paths, parsed like scan() in the worker pool.
+    Files not reached within time_budget are left out. Blocking."""
+    deadline = time.monotonic() + time_budget
+    entries: List[dict] = []
+    with worker_pool() as pool:
+        futures = [pool.submit(_index_batch, root, rel_paths[i:i + BATCH_SIZE], deadline)
+                   for i in range(0, len(rel_paths), BATCH_SIZE)]
+        try:
+            for future in futures:
+                entries.extend(future.result(timeout=max(deadline - time.monotonic(), 0)))
+        except FutureTimeoutError:
+            pass
+        finally:
+            for future in futures:
+                future.cancel()
+    return entries
+
+
+def index_file(root: str, rel_path: str) -> Optional[dict]:
+    """Symbol entry for one file (None if unreadable), in the calling thread. Blocking."""
+    entries = _index_batch(root, [rel_path], float("inf"))
+    return entries[0] if entries else None
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db, Project, PR, Task
 from pydantic import BaseModel
-from github import Github
 import os
+import asyncio
 import subprocess
 from datetime import datetime
 
@@ -14,12 +15,11 @@ class PRCreate(BaseModel):
     base_branch: str = "main"
 
 @router.post("/create")
-async def create_pr(project_id: int, pr_data: PRCreate, db: Session = Depends(get_db)):
+async def create_pr(project_id: int, pr_data: PRCreate, db: AsyncSession = Depends(get_db)):
     # Hardcoded for demo
-    import time
-    time.sleep(3)  # Simulate PR creation
+    await asyncio.sleep(3)  # Simulate PR creation
 
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -39,7 +39,7 @@ async def create_pr(project_id: int, pr_data: PRCreate, db: Session = Depends(ge
     db.add(pr_record)
 
     project.status = "pr_created"
-    db.commit()
+    await db.commit()
 
     return {
         "pr_id": pr_record.id,
@@ -49,8 +49,8 @@ async def create_pr(project_id: int, pr_data: PRCreate, db: Session = Depends(ge
     }
 
 @router.get("/{project_id}")
-async def get_pr(project_id: int, db: Session = Depends(get_db)):
-    pr = db.query(PR).filter(PR.project_id == project_id).order_by(PR.id.desc()).first()
+async def get_pr(project_id: int, db: AsyncSession = Depends(get_db)):
+    pr = await db.scalar(select(PR).where(PR.project_id == project_id).order_by(PR.id.desc()).limit(1))
     if not pr:
         raise HTTPException(status_code=404, detail="PR not found")
 
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db, Project
 from pydantic import BaseModel
 from typing import Optional
@@ -15,11 +15,11 @@ class ProjectUpdate(BaseModel):
     repo_path: Optional[str] = None
     
 @router.post("/")
-async def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
+async def create_project(project: ProjectCreate, db: AsyncSession = Depends(get_db)):
     db_project = Project(idea=project.idea)
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     return {
         "id": db_project.id,
         "idea": db_project.idea,
@@ -28,8 +28,8 @@ async def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     }
 
 @router.get("/{project_id}")
-async def get_project(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def get_project(project_id: int, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     return {
@@ -43,8 +43,8 @@ async def get_project(project_id: int, db: Session = Depends(get_db)):
     }
 
 @router.patch("/{project_id}")
-async def update_project(project_id: int, project_update: ProjectUpdate, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def update_project(project_id: int, project_update: ProjectUpdate, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -55,8 +55,8 @@ async def update_project(project_id: int, project_update: ProjectUpdate, db: Ses
     if project_update.repo_path:
         project.repo_path = project_update.repo_path
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return {
         "id": project.id,
         "status": project.status,
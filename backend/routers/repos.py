@@ -1,13 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db, Project
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, db_writer, run_in_session, Project, WorkspaceCheckpoint
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+import asyncio
 import os
+import re
 import subprocess
 import json
 from pathlib import Path
-import shutil
+from datetime import datetime
+import analysis_cache
+import blob_store
+import code_graph
+import code_search
+import file_tree
+import merkle_tree
+import repo_analyzer
+import symbol_index
+import workspaces
 
 router = APIRouter()
 
@@ -15,6 +27,10 @@ class RepoSelect(BaseModel):
     repo_url: str
     github_token: Optional[str] = None
 
+class ImpactQuery(BaseModel):
+    files: List[str]
+    max_depth: Optional[int] = None
+
 class RepoAnalysis(BaseModel):
     directory_structure: dict
     tech_stack: list
@@ -24,43 +40,30 @@ class RepoAnalysis(BaseModel):
     models: list
     db_schema: dict
 
-REPOS_DIR = os.getenv("REPOS_DIR", "./repos")
-
 @router.post("/select")
-async def select_repo(project_id: int, repo: RepoSelect, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def select_repo(project_id: int, repo: RepoSelect, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # For demo: create a mock repo directory structure
-    os.makedirs(REPOS_DIR, exist_ok=True)
-
-    # Extract repo name from URL or use default
-    repo_name = repo.repo_url.split("/")[-1].replace(".git", "") if repo.repo_url else "azimutt"
-    repo_path = os.path.join(REPOS_DIR, f"{project_id}_{repo_name}")
+    repo_url = repo.repo_url or workspaces.DEFAULT_REPO_URL
 
-    # Create mock directory structure for demo (Azimutt Elm project)
+    # Linked from the cached base checkout of repo_url (see workspaces)
     try:
-        if os.path.exists(repo_path):
-            shutil.rmtree(repo_path)
-
-        os.makedirs(repo_path, exist_ok=True)
-        os.makedirs(os.path.join(repo_path, "frontend", "src"), exist_ok=True)
-        os.makedirs(os.path.join(repo_path, "frontend", "src", "PagesComponents", "Organization_", "Project_", "Updates"), exist_ok=True)
-        os.makedirs(os.path.join(repo_path, "frontend", "ts-src"), exist_ok=True)
-
-        # Create a basic README
-        with open(os.path.join(repo_path, "README.md"), 'w') as f:
-            f.write("# Azimutt\n\nDatabase schema explorer and visualizer with keyboard shortcuts support.\n")
-
-        # Create basic elm.json
-        with open(os.path.join(repo_path, "frontend", "elm.json"), 'w') as f:
-            f.write('{"type": "application", "elm-version": "0.19.1"}\n')
+        # The old workspace's indexes and analysis do not describe the new one
+        await asyncio.to_thread(code_search.drop, project_id)
+        await db_writer.submit(symbol_index.drop, project_id)
+        repo_path = await asyncio.to_thread(workspaces.provision, project_id, repo_url)
 
-        project.repo_url = repo.repo_url or "https://github.com/azimuttapp/azimutt"
+        project.repo_url = repo_url
         project.repo_path = repo_path
+        # A new workspace: its tree is seeded from the repo's other workspaces
+        project.tree_hash = None
+        project.analysis_hash = None
+        project.code_graph_hash = None
+        project.analyzed_at = None
         project.status = "repo_selected"
-        db.commit()
+        await db.commit()
 
         return {
             "repo_path": repo_path,
@@ -69,52 +72,214 @@ async def select_repo(project_id: int, repo: RepoSelect, db: Session = Depends(g
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to setup repo: {str(e)}")
 
+async def _workspace_tree(db: AsyncSession, project: Project) -> merkle_tree.WorkspaceTree:
+    # Trees take threading locks and hash files: never touched on the event loop
+    tree = await asyncio.to_thread(merkle_tree.loaded, project.id, project.repo_path)
+    if tree is None:
+        seed_hash = project.tree_hash or await db.scalar(
+            select(Project.tree_hash).where(Project.repo_url == project.repo_url, Project.tree_hash.isnot(None))
+            .order_by(Project.id.desc()).limit(1)
+        )
+        seed = await asyncio.to_thread(run_in_session, merkle_tree.read_tree, seed_hash)
+        tree = await asyncio.to_thread(merkle_tree.load, project.id, project.repo_path, seed)
+    return tree
+
+async def _checkpoint(project: Project, tree: merkle_tree.WorkspaceTree, label: Optional[str]) -> dict:
+    # Nodes are hashed here, so the db_writer thread only stores them
+    root_hash, unsaved = await asyncio.to_thread(tree.snapshot)
+    record = await db_writer.submit(merkle_tree.checkpoint, project.id, root_hash, list(unsaved.values()), label)
+    await asyncio.to_thread(tree.saved, unsaved)
+    return record
+
 @router.post("/analyze")
-async def analyze_repo(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def analyze_repo(project_id: int, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    if not project.repo_path or not os.path.isdir(project.repo_path):
+        raise HTTPException(status_code=400, detail="Repository not selected")
+
+    # Only files the cache does not know are parsed (see analysis_cache)
+    cache = await asyncio.to_thread(run_in_session, analysis_cache.load, project.repo_url)
+    scan = await asyncio.to_thread(repo_analyzer.scan, project.repo_path, cache=cache)
+    await db_writer.submit(analysis_cache.save, cache)
+    analysis = await asyncio.to_thread(repo_analyzer.summarize, scan)
+
+    # Symbols are extracted again only for files whose content changed
+    indexed = await asyncio.to_thread(run_in_session, symbol_index.indexed_files, project.id)
+    stale, removed = await asyncio.to_thread(symbol_index.changes, indexed, scan.results, not scan.truncated)
+    entries = await asyncio.to_thread(
+        repo_analyzer.index_files, project.repo_path, stale, symbol_index.SYMBOL_INDEX_TIME_BUDGET
+    )
+    if removed:
+        await db_writer.submit(symbol_index.apply, project.id, [], removed)
+    for i in range(0, len(entries), symbol_index.APPLY_BATCH_FILES):
+        await db_writer.submit(symbol_index.apply, project.id, entries[i:i + symbol_index.APPLY_BATCH_FILES])
+    analysis["stats"]["symbols"] = {"indexed": len(entries), "pending": len(stale) - len(entries), "removed": len(removed)}
+
+    manifest = await asyncio.to_thread(code_search.load_manifest, project.id)
+    stale, removed = await asyncio.to_thread(code_search.changes, manifest, scan.results, not scan.truncated)
+    if stale or removed:
+        analysis["stats"]["search"] = await asyncio.to_thread(code_search.update, project.id, project.repo_path, stale, removed)
+
+    # Later steps can ask what changed since this analysis
+    tree = await _workspace_tree(db, project)
+    analysis["stats"]["checkpoint"] = (await _checkpoint(project, tree, "analysis"))["id"]
 
-    # Hardcoded repo analysis for demo (Azimutt Elm project)
-    analysis = {
-        "directory_structure": {
-            "frontend": {
-                "src": {
-                    "Conf.elm": "file",
-                    "PagesComponents": {
-                        "Organization_": {
-                            "Project_": {
-                                "Updates": {
-                                    "Canvas.elm": "file",
-                                    "Hotkey.elm": "file"
-                                }
-                            }
-                        }
-                    }
-                },
-                "ts-src": {
-                    "services": {
-                        "hotkeys.ts": "file"
-                    }
-                },
-                "elm.json": "file"
-            },
-            "README.md": "file"
-        },
-        "tech_stack": ["Elm", "TypeScript", "Vite", "TailwindCSS"],
-        "routing": [
-            "frontend/src/PagesComponents/Organization_/Project_/Models.elm"
-        ],
-        "components": [
-            "frontend/src/Components/Atoms/Button.elm",
-            "frontend/src/Components/Molecules/Tooltip.elm"
-        ],
-        "apis": [],
-        "models": [
-            "frontend/src/Models/Project.elm",
-            "frontend/src/Models/Canvas.elm"
-        ],
-        "db_schema": {}
-    }
+    # Serialized in a thread; the blobs are hashed and compressed by db_writer
+    graph = await asyncio.to_thread(code_graph.build, scan.results)
+    text = await asyncio.to_thread(json.dumps, graph, sort_keys=True)
+    project.code_graph_hash = await db_writer.submit(blob_store.put, text)
+    text = await asyncio.to_thread(json.dumps, analysis, sort_keys=True)
+    project.analysis_hash = await db_writer.submit(blob_store.put, text)
+    project.analyzed_at = datetime.utcnow()
+    await db.commit()
 
     return analysis
+
+@router.get("/analysis/{project_id}")
+async def get_analysis(project_id: int, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not project.analysis_hash:
+        raise HTTPException(status_code=404, detail="Repository not analyzed")
+
+    text = await asyncio.to_thread(run_in_session, blob_store.get, project.analysis_hash)
+    analysis = await asyncio.to_thread(json.loads, text)
+    return {**analysis, "analyzed_at": project.analyzed_at}
+
+@router.get("/tree")
+async def get_tree(
+    project_id: int,
+    response: Response,
+    path: str = "",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=file_tree.MAX_ENTRIES),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """One page of the entries of one workspace directory, with sizes and counts."""
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not project.repo_path or not os.path.isdir(project.repo_path):
+        raise HTTPException(status_code=400, detail="Repository not selected")
+    rel_dir = os.path.normpath(path) if path else ""
+    if rel_dir == ".":
+        rel_dir = ""
+    if os.path.isabs(rel_dir) or rel_dir.split(os.sep)[0] == "..":
+        raise HTTPException(status_code=400, detail="Invalid path")
+
+    found = await asyncio.to_thread(file_tree.listing, project.repo_path, rel_dir, offset, limit)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Directory not found")
+    etag, listing = found
+    # no-cache: clients keep the listing but revalidate it with If-None-Match
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return listing
+
+@router.post("/checkpoints")
+async def create_checkpoint(project_id: int, label: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    """Record the workspace's current Merkle root, to ask for changes since later."""
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not project.repo_path or not os.path.isdir(project.repo_path):
+        raise HTTPException(status_code=400, detail="Repository not selected")
+
+    tree = await _workspace_tree(db, project)
+    return await _checkpoint(project, tree, label)
+
+@router.get("/checkpoints/{project_id}")
+async def list_checkpoints(project_id: int, limit: int = Query(100, ge=1, le=1000), db: AsyncSession = Depends(get_db)):
+    checkpoints = await db.scalars(
+        select(WorkspaceCheckpoint).where(WorkspaceCheckpoint.project_id == project_id)
+        .order_by(WorkspaceCheckpoint.id.desc()).limit(limit)
+    )
+    return [{"id": c.id, "root_hash": c.root_hash, "label": c.label, "created_at": c.created_at.isoformat()}
+            for c in checkpoints]
+
+@router.get("/changes")
+async def get_changes(project_id: int, since: int, rescan: bool = False, db: AsyncSession = Depends(get_db)):
+    """Workspace files added, modified and removed since checkpoint `since`."""
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not project.repo_path or not os.path.isdir(project.repo_path):
+        raise HTTPException(status_code=400, detail="Repository not selected")
+    checkpoint = await db.get(WorkspaceCheckpoint, since)
+    if not checkpoint or checkpoint.project_id != project_id:
+        raise HTTPException(status_code=404, detail="Checkpoint not found")
+
+    tree = await _workspace_tree(db, project)
+    # Edits outside the app are tracked by the watcher; rescan when it is not running
+    if rescan or tree.stale:
+        await asyncio.to_thread(tree.rescan)
+    return {"since": since, **await asyncio.to_thread(run_in_session, merkle_tree.changes, tree, checkpoint.root_hash)}
+
+@router.post("/impact")
+async def get_impact(project_id: int, query: ImpactQuery, db: AsyncSession = Depends(get_db)):
+    """Python modules and tests affected by changes to the given workspace files."""
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not project.code_graph_hash:
+        raise HTTPException(status_code=404, detail="Repository not analyzed")
+
+    # Graph building and the traversal are CPU-bound: off the event loop
+    graph = await asyncio.to_thread(code_graph.cached, project.code_graph_hash)
+    if graph is None:
+        text = await asyncio.to_thread(run_in_session, blob_store.get, project.code_graph_hash)
+        graph = await asyncio.to_thread(code_graph.load, project.code_graph_hash, text)
+    return await asyncio.to_thread(graph.impact, [os.path.normpath(path) for path in query.files], query.max_depth)
+
+@router.get("/search")
+async def search_code(
+    project_id: int,
+    q: str = Query(..., min_length=1),
+    regex: bool = False,
+    case_sensitive: bool = False,
+    limit: int = Query(100, ge=1, le=code_search.MAX_RESULTS),
+    db: AsyncSession = Depends(get_db),
+):
+    """Matching lines in the project's workspace, narrowed by its trigram index."""
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not project.repo_path or not os.path.isdir(project.repo_path):
+        raise HTTPException(status_code=400, detail="Repository not selected")
+
+    try:
+        return await asyncio.to_thread(code_search.search, project_id, project.repo_path, q, regex, case_sensitive, limit)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid regex: {e}")
+
+@router.get("/symbols/{project_id}")
+async def find_symbol(
+    project_id: int,
+    name: str = Query(..., min_length=1),
+    prefix: bool = False,
+    limit: int = Query(100, ge=1, le=symbol_index.MAX_RESULTS),
+    db: AsyncSession = Depends(get_db),
+):
+    """Where name is defined and used in the project's workspace."""
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return {"name": name, **await asyncio.to_thread(run_in_session, symbol_index.lookup, project_id, name, prefix, limit)}
+
+@router.get("/symbols/{project_id}/file")
+async def get_file_symbols(project_id: int, path: str, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    symbols = await asyncio.to_thread(run_in_session, symbol_index.file_symbols, project_id, os.path.normpath(path))
+    if symbols is None:
+        raise HTTPException(status_code=404, detail="File not indexed")
+    return symbols
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db, Project, Plan, Phase, Task
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, Project, Plan, Phase, ProjectRevision, Task
+import template_store
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from collections import OrderedDict
 import os
 import json
 
@@ -18,118 +21,18 @@ class PhaseItem(BaseModel):
     description: str
     tasks: List[TaskItem]
 
-# Intelligent phases and tasks for Azimutt keyboard shortcuts demo
-DEMO_PHASES = {
-    "phases": [
-        {
-            "name": "Phase 1: Zoom Shortcuts Implementation",
-            "description": "Add keyboard shortcuts for zoom in/out using = and - keys, reusing existing zoom functionality in the Elm canvas module",
-            "tasks": [
-                {
-                    "name": "Add zoom hotkey definitions to Conf.elm",
-                    "description": "Add hotkey entries for 'zoom-in' mapped to '=' and '+' keys, and 'zoom-out' mapped to '-' key. Use the existing hotkey record structure with key, ctrl, alt, shift, meta, target, onInput, preventDefault fields.",
-                    "file_path": "frontend/src/Conf.elm"
-                },
-                {
-                    "name": "Implement zoom hotkey handlers in Hotkey.elm",
-                    "description": "Add case handlers for 'zoom-in' and 'zoom-out' in the handleHotkey function. Calculate zoom delta as current zoom * 0.1 (10% increment). Emit Zoom message with positive delta for zoom-in, negative for zoom-out.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Updates/Hotkey.elm"
-                },
-                {
-                    "name": "Verify zoom limits and history integration",
-                    "description": "Ensure zoom respects min (0.001) and max (5) limits defined in Conf.canvas.zoom. Verify that keyboard zoom creates history entries for undo/redo support by checking performZoom function integration.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Updates/Canvas.elm"
-                }
-            ]
-        },
-        {
-            "name": "Phase 2: Canvas Panning Implementation",
-            "description": "Add Shift+Arrow key shortcuts for panning the canvas, creating new PanCanvas message type and handler",
-            "tasks": [
-                {
-                    "name": "Add pan hotkey definitions with Shift modifier",
-                    "description": "Add hotkey entries for 'pan-up', 'pan-down', 'pan-left', 'pan-right' mapped to Arrow keys with shift=True modifier. This avoids conflict with existing arrow keys that move selected tables.",
-                    "file_path": "frontend/src/Conf.elm"
-                },
-                {
-                    "name": "Create PanCanvas message type in Models.elm",
-                    "description": "Add 'PanCanvas Delta' variant to the Msg type union. Delta type should contain dx and dy Float fields for horizontal and vertical pan amounts.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Models.elm"
-                },
-                {
-                    "name": "Implement panCanvas function in Canvas.elm",
-                    "description": "Create panCanvas function that takes Delta and CanvasProps, returns updated CanvasProps with position moved by delta (adjusted for zoom level). Add history entry for undo support using Extra.history.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Updates/Canvas.elm"
-                },
-                {
-                    "name": "Add pan hotkey handlers in Hotkey.elm",
-                    "description": "Add case handlers for pan-up/down/left/right that emit PanCanvas message with 50px delta in appropriate direction. pan-up: dy=50, pan-down: dy=-50, pan-left: dx=50, pan-right: dx=-50.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Updates/Hotkey.elm"
-                }
-            ]
-        },
-        {
-            "name": "Phase 3: Tool & Feature Shortcuts",
-            "description": "Add keyboard shortcuts for arrange tables, tool switching, and table list toggle",
-            "tasks": [
-                {
-                    "name": "Add arrange tables hotkey with Alt modifier",
-                    "description": "Add hotkey entry for 'arrange-tables' mapped to 'a' key with alt=True modifier. Handler should emit ArrangeTables message with AutoLayoutMethod.Dagre as default layout algorithm.",
-                    "file_path": "frontend/src/Conf.elm"
-                },
-                {
-                    "name": "Add tool switching hotkeys",
-                    "description": "Add 'tool-select' mapped to 'v' key (industry standard) and 'tool-drag' mapped to 'd' with alt=True modifier. Handlers emit CursorMode message with CursorMode.Select or CursorMode.Drag.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Updates/Hotkey.elm"
-                },
-                {
-                    "name": "Add table list toggle hotkey",
-                    "description": "Add 'toggle-table-list' mapped to 't' key. Handler emits DetailsSidebarMsg with DetailsSidebar.Toggle to open/close the table list sidebar panel.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Updates/Hotkey.elm"
-                }
-            ]
-        },
-        {
-            "name": "Phase 4: UI Updates & Documentation",
-            "description": "Update Help modal and button tooltips to make shortcuts discoverable, then update changelog",
-            "tasks": [
-                {
-                    "name": "Update Help modal with new shortcuts",
-                    "description": "Add entries to shortcuts list in Help.elm viewShortcuts function: zoom (=/-), pan (Shift+Arrows), arrange (Alt+a), tools (v, Alt+d), table list (t). Group by category for better organization.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Views/Modals/Help.elm"
-                },
-                {
-                    "name": "Update button tooltips with shortcut hints",
-                    "description": "Modify tooltip strings in Commands.elm to include keyboard shortcuts: 'Zoom in (=)', 'Zoom out (-)', 'Select tool (v)', 'Drag tool (Alt+d)', 'Arrange tables (Alt+a)', 'Table list (t)'.",
-                    "file_path": "frontend/src/PagesComponents/Organization_/Project_/Views/Commands.elm"
-                },
-                {
-                    "name": "Write unit tests for new hotkey handlers",
-                    "description": "Create HotkeyTest.elm with tests for zoom-in/out, pan directions, tool switching. Test edge cases: zoom at limits, pan with no erd, arrange with no tables. Use elm-test framework.",
-                    "file_path": "frontend/tests/PagesComponents/Organization_/Project_/Updates/HotkeyTest.elm"
-                },
-                {
-                    "name": "Update CHANGELOG with feature entry",
-                    "description": "Add entry under [Unreleased]: 'Added: Keyboard shortcuts for zoom (=/-), canvas panning (Shift+Arrows), arrange tables (Alt+a), tool switching (v, Alt+d), table list (t). Fixes #350.'",
-                    "file_path": "CHANGELOG.md"
-                }
-            ]
-        }
-    ]
-}
-
 @router.post("/generate")
-async def generate_tasks(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
+async def generate_tasks(project_id: int, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    plan = db.query(Plan).filter(Plan.project_id == project_id).order_by(Plan.id.desc()).first()
+    plan = await db.scalar(select(Plan).where(Plan.project_id == project_id).order_by(Plan.id.desc()).limit(1))
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
     
     # Use hardcoded phases and tasks for demo
-    phases_data = DEMO_PHASES
+    phases_data = template_store.get_json("tasks/demo_phases.json")
     
     # Store phases and tasks
     created_phases = []
@@ -141,7 +44,7 @@ async def generate_tasks(project_id: int, db: Session = Depends(get_db)):
             description=phase_data.get("description", "")
         )
         db.add(phase)
-        db.flush()
+        await db.flush()
         
         created_tasks = []
         for task_num, task_data in enumerate(phase_data.get("tasks", []), 1):
@@ -169,36 +72,69 @@ async def generate_tasks(project_id: int, db: Session = Depends(get_db)):
             "tasks": created_tasks
         })
     
-    db.commit()
+    await db.commit()
     
     project.status = "tasks_generated"
-    db.commit()
+    await db.commit()
     
     return {
         "phases": created_phases
     }
 
+# Serialized task trees keyed by project, each tagged with the project's
+# tasks_revision when it was built; any Phase/Task change bumps the revision
+TASK_TREE_CACHE_SIZE = int(os.getenv("TASK_TREE_CACHE_SIZE", "1024"))
+_task_tree_cache: "OrderedDict[int, Tuple[int, dict]]" = OrderedDict()
+
+async def _load_task_tree(db: AsyncSession, project_id: int) -> dict:
+    # One query for the whole tree; only the columns the response needs, so
+    # large fields such as code_changes are never read
+    rows = (await db.execute(select(
+        Phase.id, Phase.phase_number, Phase.name, Phase.description, Phase.status,
+        Task.id, Task.task_number, Task.name, Task.description, Task.file_path, Task.status
+    ).outerjoin(Task, Task.phase_id == Phase.id).where(
+        Phase.project_id == project_id
+    ).order_by(Phase.phase_number, Task.task_number))).all()
+
+    phases = OrderedDict()
+    for (phase_id, phase_number, phase_name, phase_description, phase_status,
+         task_id, task_number, task_name, task_description, file_path, task_status) in rows:
+        phase = phases.get(phase_id)
+        if phase is None:
+            phase = phases[phase_id] = {
+                "id": phase_id,
+                "phase_number": phase_number,
+                "name": phase_name,
+                "description": phase_description,
+                "status": phase_status,
+                "tasks": []
+            }
+        if task_id is not None:
+            phase["tasks"].append({
+                "id": task_id,
+                "task_number": task_number,
+                "name": task_name,
+                "description": task_description,
+                "file_path": file_path,
+                "status": task_status
+            })
+
+    return {"phases": list(phases.values())}
+
 @router.get("/{project_id}")
-async def get_tasks(project_id: int, db: Session = Depends(get_db)):
-    phases = db.query(Phase).filter(Phase.project_id == project_id).order_by(Phase.phase_number).all()
-    
-    result = []
-    for phase in phases:
-        tasks = db.query(Task).filter(Task.phase_id == phase.id).order_by(Task.task_number).all()
-        result.append({
-            "id": phase.id,
-            "phase_number": phase.phase_number,
-            "name": phase.name,
-            "description": phase.description,
-            "status": phase.status,
-            "tasks": [{
-                "id": task.id,
-                "task_number": task.task_number,
-                "name": task.name,
-                "description": task.description,
-                "file_path": task.file_path,
-                "status": task.status
-            } for task in tasks]
-        })
-    
-    return {"phases": result}
+async def get_tasks(project_id: int, db: AsyncSession = Depends(get_db)):
+    # Read the revision before the tree: a concurrent change can only make the
+    # cached entry look older than it is, never newer
+    revision = await db.scalar(select(ProjectRevision.tasks_revision).where(ProjectRevision.project_id == project_id)) or 0
+    cached = _task_tree_cache.get(project_id)
+    if cached and cached[0] == revision:
+        _task_tree_cache.move_to_end(project_id)
+        return cached[1]
+
+    tree = await _load_task_tree(db, project_id)
+    _task_tree_cache[project_id] = (revision, tree)
+    _task_tree_cache.move_to_end(project_id)
+    while len(_task_tree_cache) > TASK_TREE_CACHE_SIZE:
+        _task_tree_cache.popitem(last=False)
+
+    return tree
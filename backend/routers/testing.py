@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db, Project, ExecutionLog
+from log_sink import log_sink
 from pydantic import BaseModel
 from typing import Optional
 import subprocess
+import asyncio
 import os
 
 router = APIRouter()
@@ -13,10 +16,9 @@ class TestCommand(BaseModel):
     args: Optional[list] = None
 
 @router.post("/run-command")
-async def run_test_command(project_id: int, test_cmd: TestCommand, db: Session = Depends(get_db)):
+async def run_test_command(project_id: int, test_cmd: TestCommand, db: AsyncSession = Depends(get_db)):
     # Hardcoded for demo - Elm keyboard shortcuts tests
-    import time
-    time.sleep(2)  # Simulate test execution
+    await asyncio.sleep(2)  # Simulate test execution
 
     # Hardcoded test results for Elm hotkey implementation
     test_output = """Running Elm keyboard shortcuts tests...
@@ -38,14 +40,14 @@ HotkeyTest.elm::test_toggle_table_list PASSED
 
 ======================== 12 passed in 1.84s ========================"""
 
-    log = ExecutionLog(
-        project_id=project_id,
-        task_id=0,  # General test
-        log_type="test_result",
-        content=f"Command: {test_cmd.command}\nOutput: {test_output}\nError: \nReturn code: 0"
+    # Written through the log sink so it shares a commit with execution logs
+    await log_sink.write(
+        project_id,
+        0,  # General test
+        "test_result",
+        f"Command: {test_cmd.command}\nOutput: {test_output}\nError: \nReturn code: 0"
     )
-    db.add(log)
-    db.commit()
+    await log_sink.flush()
 
     return {
         "stdout": test_output,
@@ -54,17 +56,36 @@ HotkeyTest.elm::test_toggle_table_list PASSED
     }
 
 @router.get("/test-logs/{project_id}")
-async def get_test_logs(project_id: int, db: Session = Depends(get_db)):
+async def get_test_logs(
+    project_id: int,
+    since_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db)
+):
     # Hardcoded for demo
     from datetime import datetime, timedelta
 
-    logs = db.query(ExecutionLog).filter(
+    # Newest first. Without a cursor this is the newest page; pass
+    # prev_cursor as before_id for the page of older results, or next_cursor
+    # as since_id for results recorded since. has_more is for the direction
+    # paged: newer results with since_id, older ones otherwise
+    query = select(ExecutionLog).where(
         ExecutionLog.project_id == project_id,
         ExecutionLog.log_type == "test_result"
-    ).order_by(ExecutionLog.created_at.desc()).limit(50).all()
+    )
+    if since_id is not None:
+        # Oldest rows after the cursor first so none are skipped, then
+        # flipped to keep the newest-first response order
+        logs = list(await db.scalars(query.where(ExecutionLog.id > since_id).order_by(ExecutionLog.id).limit(limit)))
+        logs.reverse()
+    else:
+        if before_id is not None:
+            query = query.where(ExecutionLog.id < before_id)
+        logs = list(await db.scalars(query.order_by(ExecutionLog.id.desc()).limit(limit)))
 
     # If no logs, return hardcoded demo logs
-    if not logs:
+    if not logs and since_id is None and before_id is None:
         demo_logs = [
             {
                 "id": 1,
@@ -77,12 +98,15 @@ async def get_test_logs(project_id: int, db: Session = Depends(get_db)):
                 "created_at": (datetime.now() - timedelta(minutes=10)).isoformat()
             }
         ]
-        return {"logs": demo_logs}
+        return {"logs": demo_logs, "next_cursor": None, "prev_cursor": None, "has_more": False}
 
     return {
         "logs": [{
             "id": log.id,
             "content": log.content,
             "created_at": log.created_at.isoformat()
-        } for log in logs]
+        } for log in logs],
+        "next_cursor": logs[0].id if logs else since_id,
+        "prev_cursor": logs[-1].id if logs else before_id,
+        "has_more": len(logs) == limit
     }
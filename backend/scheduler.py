@@ -0,0 +1,97 @@
+"""Dependency-aware scheduling of tasks within a project execution.
+
+Tasks form a DAG: every task of a phase waits for all tasks of the previous
+phase, and tasks of the same phase that write the same file run in
+task_number order. Everything else may run concurrently.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+
+@dataclass
+class ScheduledTask:
+    id: int
+    phase_number: int
+    task_number: int
+    file_path: Optional[str] = None
+
+
+def build_task_graph(tasks: List[ScheduledTask]) -> Dict[int, Set[int]]:
+    """Map each task id to the ids of the tasks it must wait for."""
+    ordered = sorted(tasks, key=lambda t: (t.phase_number, t.task_number))
+    deps: Dict[int, Set[int]] = {}
+    previous_phase: List[int] = []
+    current_phase: List[int] = []
+    current_number = None
+    last_writer: Dict[str, int] = {}
+
+    for task in ordered:
+        if task.phase_number != current_number:
+            # Phase barrier; the previous phase already waits on everything
+            # before it, so depending on it alone is enough.
+            if current_phase:
+                previous_phase = current_phase
+            current_phase = []
+            current_number = task.phase_number
+            last_writer = {}
+
+        task_deps = set(previous_phase)
+        if task.file_path:
+            if task.file_path in last_writer:
+                task_deps.add(last_writer[task.file_path])
+            last_writer[task.file_path] = task.id
+
+        deps[task.id] = task_deps
+        current_phase.append(task.id)
+
+    return deps
+
+
+async def run_task_graph(
+    tasks: List[ScheduledTask],
+    run: Callable[[int], Awaitable[None]],
+    width: int,
+    should_continue: Callable[[], bool] = lambda: True,
+):
+    """Run tasks respecting the graph, with at most `width` in flight.
+
+    No new task is started once `should_continue` returns False; tasks
+    already running are awaited. A failing task does not block its
+    dependents, matching the sequential executor.
+    """
+    deps = build_task_graph(tasks)
+    order = [t.id for t in sorted(tasks, key=lambda t: (t.phase_number, t.task_number))]
+    position = {task_id: index for index, task_id in enumerate(order)}
+    dependents: Dict[int, List[int]] = {task_id: [] for task_id in order}
+    for task_id, task_deps in deps.items():
+        for dep in task_deps:
+            dependents[dep].append(task_id)
+
+    remaining = {task_id: len(deps[task_id]) for task_id in order}
+    ready = [task_id for task_id in order if remaining[task_id] == 0]
+    in_flight: Dict[asyncio.Task, int] = {}
+    width = max(1, width)
+
+    while ready or in_flight:
+        while ready and len(in_flight) < width and should_continue():
+            task_id = ready.pop(0)
+            in_flight[asyncio.ensure_future(run(task_id))] = task_id
+
+        if not in_flight:
+            break
+
+        done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            task_id = in_flight.pop(future)
+            if not future.cancelled() and future.exception() is not None:
+                # Surface unexpected errors in the log without stopping siblings
+                asyncio.get_running_loop().call_exception_handler({
+                    "message": f"Task {task_id} raised",
+                    "exception": future.exception(),
+                })
+            for dependent in dependents[task_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        ready.sort(key=position.__getitem__)
@@ -0,0 +1,178 @@
+"""Per-workspace symbol index: where each name is defined and used.
+
+repo_analyzer.index_files extracts definitions (name, kind, line) and
+references (every identifier occurrence outside a definition) per source
+file. Each project's index lives in three tables: symbol_files maps a
+workspace path to the content hash it was indexed at, and its definitions
+and references hang off that row. References are one row per (file, name)
+holding the line numbers, so a hot name costs one row per file using it.
+
+/api/repos/analyze re-extracts only files whose hash changed since they were
+indexed; execute_task re-indexes each file it writes. A name defined or
+used in a file is found by one index range scan on (project_id, name).
+
+Reads take a sync Session, run from a thread through database.run_in_session;
+apply is a db_writer command.
+"""
+import os
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from database import SymbolDefinition, SymbolFile, SymbolReference
+from repo_analyzer import LANGUAGES
+
+SYMBOL_INDEX_TIME_BUDGET = float(os.getenv("SYMBOL_INDEX_TIME_BUDGET", "20"))
+MAX_RESULTS = 1000
+# Files per apply() when indexing a whole tree, so one db_writer command never
+# holds the write lock for long
+APPLY_BATCH_FILES = 500
+
+# Bound parameters per IN (...) list
+_CHUNK = 500
+
+
+def _chunks(items: list) -> Iterable[list]:
+    for i in range(0, len(items), _CHUNK):
+        yield items[i:i + _CHUNK]
+
+
+def _insert_rows(db: Session, table, columns: Tuple[str, ...], rows: List[tuple]):
+    # Driver-level executemany: SQLAlchemy's per-row parameter processing
+    # costs more than the inserts themselves at this volume
+    conn = db.connection()
+    marker = "?" if conn.dialect.paramstyle == "qmark" else "%s"
+    conn.exec_driver_sql(
+        f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join([marker] * len(columns))})", rows
+    )
+
+
+def is_indexed(rel_path: str) -> bool:
+    return os.path.splitext(rel_path)[1].lower() in LANGUAGES
+
+
+def indexed_files(db: Session, project_id: int) -> Dict[str, str]:
+    """path -> content hash of every file in the project's index."""
+    return dict(db.execute(
+        select(SymbolFile.path, SymbolFile.content_hash).where(SymbolFile.project_id == project_id)
+    ).all())
+
+
+def changes(indexed: Dict[str, str], results: List[dict], complete: bool) -> Tuple[List[str], List[str]]:
+    """(stale, removed) paths of the index against repo_analyzer.scan results.
+    Removals are only known from a complete scan."""
+    current = {r["path"]: r["hash"] for r in results
+               if "hash" in r and not r.get("skipped") and is_indexed(r["path"])}
+    stale = sorted(path for path, content_hash in current.items() if indexed.get(path) != content_hash)
+    removed = [path for path in indexed if path not in current] if complete else []
+    return stale, removed
+
+
+def apply(db: Session, project_id: int, entries: List[dict], removed: Iterable[str] = ()):
+    """db_writer command: replace the symbols of each entry's file (entries
+    from repo_analyzer.index_files) and drop removed paths."""
+    live = sorted((e for e in entries if e["hash"] is not None), key=lambda e: e["path"])
+    gone = list(removed) + [e["path"] for e in entries if e["hash"] is None]
+    file_ids: Dict[str, int] = {}
+    for chunk in _chunks([e["path"] for e in live] + gone):
+        file_ids.update(db.execute(
+            select(SymbolFile.path, SymbolFile.id).where(SymbolFile.project_id == project_id, SymbolFile.path.in_(chunk))
+        ).all())
+    for chunk in _chunks(list(file_ids.values())):
+        db.execute(delete(SymbolDefinition).where(SymbolDefinition.file_id.in_(chunk)))
+        db.execute(delete(SymbolReference).where(SymbolReference.file_id.in_(chunk)))
+    for chunk in _chunks([file_ids.pop(path) for path in gone if path in file_ids]):
+        db.execute(delete(SymbolFile).where(SymbolFile.id.in_(chunk)))
+
+    rehashed = [{"row_id": file_ids[e["path"]], "content_hash": e["hash"]} for e in live if e["path"] in file_ids]
+    if rehashed:
+        table = SymbolFile.__table__
+        db.execute(update(table).where(table.c.id == bindparam("row_id")), rehashed)
+    new_paths = [e["path"] for e in live if e["path"] not in file_ids]
+    if new_paths:
+        hashes = {e["path"]: e["hash"] for e in live}
+        db.execute(insert(SymbolFile.__table__), [
+            {"project_id": project_id, "path": path, "content_hash": hashes[path]} for path in new_paths
+        ])
+        for chunk in _chunks(new_paths):
+            file_ids.update(db.execute(
+                select(SymbolFile.path, SymbolFile.id).where(SymbolFile.project_id == project_id, SymbolFile.path.in_(chunk))
+            ).all())
+
+    definitions, references = [], []
+    for entry in live:
+        file_id = file_ids[entry["path"]]
+        definitions.extend((project_id, file_id, name, kind, line) for name, kind, line in entry["definitions"])
+        references.extend((project_id, name, file_id, count, ",".join(map(str, lines)))
+                          for name, (count, lines) in entry["references"].items())
+    if definitions:
+        _insert_rows(db, SymbolDefinition.__table__, ("project_id", "file_id", "name", "kind", "line"), definitions)
+    if references:
+        # In key order: appends to the clustered index rather than random inserts
+        references.sort(key=itemgetter(1))
+        _insert_rows(db, SymbolReference.__table__, ("project_id", "name", "file_id", "count", "lines"), references)
+    db.flush()
+
+
+def drop(db: Session, project_id: int):
+    """db_writer command: delete the project's index (its workspace is being replaced)."""
+    db.execute(delete(SymbolDefinition).where(SymbolDefinition.project_id == project_id))
+    db.execute(delete(SymbolReference).where(SymbolReference.project_id == project_id))
+    db.execute(delete(SymbolFile).where(SymbolFile.project_id == project_id))
+    db.flush()
+
+
+def _name_matches(column, name: str, prefix: bool):
+    if not prefix:
+        return column == name
+    # A range rather than LIKE, so the (project_id, name) index is used
+    return and_(column >= name, column < name[:-1] + chr(ord(name[-1]) + 1))
+
+
+def lookup(db: Session, project_id: int, name: str, prefix: bool = False, limit: int = 100) -> dict:
+    """Definitions and references of name (or of every name starting with it)."""
+    definitions = db.execute(
+        select(SymbolDefinition.name, SymbolDefinition.kind, SymbolFile.path, SymbolDefinition.line)
+        .join(SymbolFile, SymbolFile.id == SymbolDefinition.file_id)
+        .where(SymbolDefinition.project_id == project_id, _name_matches(SymbolDefinition.name, name, prefix))
+        .order_by(SymbolDefinition.name, SymbolDefinition.id)
+        .limit(limit)
+    ).all()
+    references = db.execute(
+        select(SymbolReference.name, SymbolFile.path, SymbolReference.count, SymbolReference.lines)
+        .join(SymbolFile, SymbolFile.id == SymbolReference.file_id)
+        .where(SymbolReference.project_id == project_id, _name_matches(SymbolReference.name, name, prefix))
+        .order_by(SymbolReference.name, SymbolReference.file_id)
+        .limit(limit)
+    ).all()
+    return {
+        "definitions": [{"name": n, "kind": kind, "path": path, "line": line} for n, kind, path, line in definitions],
+        "references": [{"name": n, "path": path, "count": count, "lines": [int(line) for line in lines.split(",")]}
+                       for n, path, count, lines in references],
+    }
+
+
+def file_symbols(db: Session, project_id: int, path: str) -> Optional[dict]:
+    """What the index holds for one file, or None if it is not indexed."""
+    row = db.execute(
+        select(SymbolFile.id, SymbolFile.content_hash).where(SymbolFile.project_id == project_id, SymbolFile.path == path)
+    ).first()
+    if row is None:
+        return None
+    file_id, content_hash = row
+    definitions = db.execute(
+        select(SymbolDefinition.name, SymbolDefinition.kind, SymbolDefinition.line)
+        .where(SymbolDefinition.file_id == file_id).order_by(SymbolDefinition.line)
+    ).all()
+    references = db.execute(
+        select(SymbolReference.name, SymbolReference.count).where(SymbolReference.file_id == file_id)
+        .order_by(SymbolReference.name)
+    ).all()
+    return {
+        "path": path,
+        "content_hash": content_hash,
+        "definitions": [{"name": name, "kind": kind, "line": line} for name, kind, line in definitions],
+        "references": [{"name": name, "count": count} for name, count in references],
+    }
@@ -0,0 +1,60 @@
+"""On-disk store for the demo templates: plan document, phases, designs and
+generated code.
+
+These used to be module-level literals, parsed and kept resident in every
+worker at import time. They now live under backend/templates and are read on
+first use through mmap, so workers share the OS page cache, with the most
+recently used ones kept in an LRU cache. Names are paths relative to the
+template root, e.g. "plan/comprehensive_plan.md".
+
+Cached values are shared between callers; treat them as read-only.
+"""
+import json
+import mmap
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+TEMPLATES_DIR = os.getenv("TEMPLATES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+TEMPLATE_CACHE_SIZE = int(os.getenv("TEMPLATE_CACHE_SIZE", "64"))
+
+
+def _resolve(name: str) -> Optional[str]:
+    # Names can come from task data (file paths); never leave the template root
+    root = os.path.realpath(TEMPLATES_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        return None
+    return path
+
+
+def _read(name: str) -> Optional[str]:
+    path = _resolve(name)
+    if path is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, "utf-8")
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_text(name: str) -> Optional[str]:
+    """Template contents, or None if there is no such template."""
+    return _read(name)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def get_json(name: str) -> Any:
+    """Parsed JSON template, or None if there is no such template."""
+    text = _read(name)
+    return json.loads(text) if text is not None else None
+
+
+def clear_cache():
+    get_text.cache_clear()
+    get_json.cache_clear()
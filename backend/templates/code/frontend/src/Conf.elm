@@ -0,0 +1,112 @@
+module Conf exposing (..)
+
+{-| Configuration module for Azimutt.
+Contains hotkey definitions, canvas settings, and application constants.
+-}
+
+import Dict exposing (Dict)
+import Models.Project.CanvasProps exposing (ZoomLevel)
+
+
+-- HOTKEY DEFINITIONS
+
+type alias Hotkey =
+    { key : String
+    , ctrl : Bool
+    , alt : Bool
+    , shift : Bool
+    , meta : Bool
+    , target : Maybe String
+    , onInput : Bool
+    , preventDefault : Bool
+    }
+
+
+defaultHotkey : Hotkey
+defaultHotkey =
+    { key = ""
+    , ctrl = False
+    , alt = False
+    , shift = False
+    , meta = False
+    , target = Nothing
+    , onInput = False
+    , preventDefault = True
+    }
+
+
+{-| All keyboard shortcuts for the application.
+Keys are hotkey IDs, values are lists of alternative key combinations.
+-}
+hotkeys : Dict String (List Hotkey)
+hotkeys =
+    Dict.fromList
+        [ -- Navigation
+          ( "search", [ { defaultHotkey | key = "/" } ] )
+        , ( "help", [ { defaultHotkey | key = "?" } ] )
+
+        -- Element actions
+        , ( "notes", [ { defaultHotkey | key = "n" } ] )
+        , ( "memo", [ { defaultHotkey | key = "m" } ] )
+        , ( "group", [ { defaultHotkey | key = "g" } ] )
+        , ( "collapse", [ { defaultHotkey | key = "c" } ] )
+        , ( "show", [ { defaultHotkey | key = "s" } ] )
+        , ( "hide", [ { defaultHotkey | key = "h" }, { defaultHotkey | key = "Backspace" }, { defaultHotkey | key = "Delete" } ] )
+
+        -- Table movement (existing)
+        , ( "move-up", [ { defaultHotkey | key = "ArrowUp" } ] )
+        , ( "move-down", [ { defaultHotkey | key = "ArrowDown" } ] )
+        , ( "move-left", [ { defaultHotkey | key = "ArrowLeft" } ] )
+        , ( "move-right", [ { defaultHotkey | key = "ArrowRight" } ] )
+
+        -- Zoom shortcuts (NEW - Issue #350)
+        , ( "zoom-in", [ { defaultHotkey | key = "=" }, { defaultHotkey | key = "+" } ] )
+        , ( "zoom-out", [ { defaultHotkey | key = "-" } ] )
+
+        -- Canvas panning (NEW - Issue #350)
+        , ( "pan-up", [ { defaultHotkey | key = "ArrowUp", shift = True } ] )
+        , ( "pan-down", [ { defaultHotkey | key = "ArrowDown", shift = True } ] )
+        , ( "pan-left", [ { defaultHotkey | key = "ArrowLeft", shift = True } ] )
+        , ( "pan-right", [ { defaultHotkey | key = "ArrowRight", shift = True } ] )
+
+        -- Arrange tables (NEW - Issue #350)
+        , ( "arrange-tables", [ { defaultHotkey | key = "a", alt = True } ] )
+
+        -- Tool switching (NEW - Issue #350)
+        , ( "tool-select", [ { defaultHotkey | key = "v" } ] )
+        , ( "tool-drag", [ { defaultHotkey | key = "d", alt = True } ] )
+
+        -- Table list (NEW - Issue #350)
+        , ( "toggle-table-list", [ { defaultHotkey | key = "t" } ] )
+
+        -- Undo/Redo
+        , ( "undo", [ { defaultHotkey | key = "z", ctrl = True } ] )
+        , ( "redo", [ { defaultHotkey | key = "z", ctrl = True, shift = True } ] )
+
+        -- Zoom controls
+        , ( "reset-zoom", [ { defaultHotkey | key = "0", ctrl = True } ] )
+        , ( "fit-to-screen", [ { defaultHotkey | key = "0", ctrl = True, alt = True } ] )
+
+        -- Save
+        , ( "save", [ { defaultHotkey | key = "s", ctrl = True } ] )
+        ]
+
+
+-- CANVAS CONFIGURATION
+
+canvas :
+    { zoom :
+        { min : ZoomLevel
+        , max : ZoomLevel
+        , speed : Float
+        }
+    , grid : Int
+    }
+canvas =
+    { zoom =
+        { min = 0.001
+        , max = 5
+        , speed = 0.001
+        }
+    , grid = 10
+    }
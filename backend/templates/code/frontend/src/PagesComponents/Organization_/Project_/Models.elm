@@ -0,0 +1,56 @@
+module PagesComponents.Organization_.Project_.Models exposing
+    ( Model
+    , Msg(..)
+    )
+
+{-| Main model and message types for the project page.
+-}
+
+import Models.Delta exposing (Delta)
+import Models.Project.CanvasProps exposing (CanvasProps)
+import PagesComponents.Organization_.Project_.Models.CursorMode exposing (CursorMode)
+import PagesComponents.Organization_.Project_.Models.Erd exposing (Erd)
+
+
+type alias Model =
+    { erd : Maybe Erd
+    , erdElem : ErdProps
+    , cursorMode : CursorMode
+    , detailsSidebar : Maybe DetailsSidebar
+    , contextMenu : Maybe ContextMenu
+    , modal : Maybe Modal
+    , history : History
+    }
+
+
+{-| All possible messages in the project page.
+-}
+type Msg
+    = Noop
+      -- Canvas operations
+    | Zoom Float
+    | FitToScreen
+    | ResetZoom
+    | PanCanvas Delta  -- NEW: Issue #350 - Canvas panning via keyboard
+    | SetView_ CanvasProps
+      -- Table operations
+    | SelectTable TableId
+    | MoveSelectedTables Delta
+    | CollapseTable TableId
+    | ShowTable TableId
+    | HideTable TableId
+    | ArrangeTables AutoLayoutMethod
+      -- Cursor mode (Issue #350)
+    | CursorMode CursorMode
+      -- Sidebar
+    | DetailsSidebarMsg DetailsSidebarMsg
+      -- History
+    | Undo
+    | Redo
+      -- Search
+    | SearchMsg SearchMsg
+      -- Other
+    | GotHotkey String
+    | ContextMenuMsg ContextMenuMsg
+    | ModalMsg ModalMsg
+    | ToastMsg ToastMsg
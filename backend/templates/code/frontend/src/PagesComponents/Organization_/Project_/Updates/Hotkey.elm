@@ -0,0 +1,132 @@
+module PagesComponents.Organization_.Project_.Updates.Hotkey exposing (handleHotkey)
+
+{-| Hotkey handler module.
+Processes keyboard shortcuts and dispatches appropriate messages.
+-}
+
+import Conf
+import Models.Delta exposing (Delta)
+import PagesComponents.Organization_.Project_.Models exposing (Model, Msg(..))
+import PagesComponents.Organization_.Project_.Models.CursorMode as CursorMode
+import PagesComponents.Organization_.Project_.Models.Erd as Erd
+import PagesComponents.Organization_.Project_.Updates.Extra as Extra exposing (Extra)
+import Services.Lenses exposing (mapErdM)
+
+
+{-| Handle a hotkey press and return updated model with commands.
+-}
+handleHotkey : String -> Model -> ( Model, Extra Msg )
+handleHotkey hotkey model =
+    case hotkey of
+        -- Zoom shortcuts (Issue #350)
+        "zoom-in" ->
+            ( model
+            , model.erd
+                |> Maybe.map
+                    (\e ->
+                        let
+                            currentZoom =
+                                e |> Erd.currentLayout |> .canvas |> .zoom
+
+                            zoomDelta =
+                                currentZoom * 0.1  -- 10% increment
+                        in
+                        Zoom zoomDelta
+                    )
+                |> Extra.msgM
+            )
+
+        "zoom-out" ->
+            ( model
+            , model.erd
+                |> Maybe.map
+                    (\e ->
+                        let
+                            currentZoom =
+                                e |> Erd.currentLayout |> .canvas |> .zoom
+
+                            zoomDelta =
+                                currentZoom * -0.1  -- 10% decrement
+                        in
+                        Zoom zoomDelta
+                    )
+                |> Extra.msgM
+            )
+
+        -- Canvas panning shortcuts (Issue #350)
+        "pan-up" ->
+            ( model, PanCanvas { dx = 0, dy = 50 } |> Extra.msg )
+
+        "pan-down" ->
+            ( model, PanCanvas { dx = 0, dy = -50 } |> Extra.msg )
+
+        "pan-left" ->
+            ( model, PanCanvas { dx = 50, dy = 0 } |> Extra.msg )
+
+        "pan-right" ->
+            ( model, PanCanvas { dx = -50, dy = 0 } |> Extra.msg )
+
+        -- Arrange tables shortcut (Issue #350)
+        "arrange-tables" ->
+            ( model, ArrangeTables AutoLayoutMethod.Dagre |> Extra.msg )
+
+        -- Tool switching shortcuts (Issue #350)
+        "tool-select" ->
+            ( model, CursorMode CursorMode.Select |> Extra.msg )
+
+        "tool-drag" ->
+            ( model, CursorMode CursorMode.Drag |> Extra.msg )
+
+        -- Table list toggle (Issue #350)
+        "toggle-table-list" ->
+            ( model, DetailsSidebarMsg DetailsSidebar.Toggle |> Extra.msg )
+
+        -- Existing shortcuts
+        "move-up" ->
+            moveTables { dx = 0, dy = -Conf.canvas.grid } model
+
+        "move-down" ->
+            moveTables { dx = 0, dy = Conf.canvas.grid } model
+
+        "move-left" ->
+            moveTables { dx = -Conf.canvas.grid, dy = 0 } model
+
+        "move-right" ->
+            moveTables { dx = Conf.canvas.grid, dy = 0 } model
+
+        "collapse" ->
+            ( model, collapseSelectedElements model |> Extra.msg )
+
+        "show" ->
+            ( model, showSelectedElements model |> Extra.msg )
+
+        "hide" ->
+            ( model, hideSelectedElements model |> Extra.msg )
+
+        "undo" ->
+            ( model, Undo |> Extra.msg )
+
+        "redo" ->
+            ( model, Redo |> Extra.msg )
+
+        _ ->
+            ( model, Extra.none )
+
+
+{-| Move selected tables by delta.
+-}
+moveTables : Delta -> Model -> ( Model, Extra Msg )
+moveTables delta model =
+    case model.erd of
+        Just erd ->
+            let
+                selected =
+                    erd |> Erd.currentLayout |> .tables |> List.filter .selected
+            in
+            if List.isEmpty selected then
+                ( model, Extra.none )
+            else
+                ( model, MoveSelectedTables delta |> Extra.msg )
+
+        Nothing ->
+            ( model, Extra.none )
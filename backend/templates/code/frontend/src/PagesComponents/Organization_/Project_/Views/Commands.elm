@@ -0,0 +1,117 @@
+module PagesComponents.Organization_.Project_.Views.Commands exposing (viewCommands)
+
+{-| Command toolbar view with zoom controls, tools, and layout options.
+Updated with keyboard shortcut hints in tooltips (Issue #350).
+-}
+
+import Html exposing (Html, button, div, i, span, text)
+import Html.Attributes exposing (class, title)
+import Html.Events exposing (onClick)
+import PagesComponents.Organization_.Project_.Models exposing (Msg(..))
+import PagesComponents.Organization_.Project_.Models.CursorMode as CursorMode exposing (CursorMode)
+
+
+{-| Render the command toolbar.
+-}
+viewCommands : CursorMode -> Float -> Html Msg
+viewCommands cursorMode zoom =
+    div [ class "commands-toolbar" ]
+        [ viewZoomControls zoom
+        , viewToolButtons cursorMode
+        , viewLayoutControls
+        , viewTableListButton
+        ]
+
+
+{-| Zoom control buttons with keyboard shortcut hints.
+-}
+viewZoomControls : Float -> Html Msg
+viewZoomControls zoom =
+    div [ class "zoom-controls" ]
+        [ button
+            [ class "zoom-btn"
+            , onClick (Zoom -0.1)
+            , title "Zoom out (-)"  -- Updated with shortcut hint
+            ]
+            [ i [ class "icon-minus" ] [] ]
+        , span [ class "zoom-level" ]
+            [ text (String.fromInt (round (zoom * 100)) ++ "%") ]
+        , button
+            [ class "zoom-btn"
+            , onClick (Zoom 0.1)
+            , title "Zoom in (=)"  -- Updated with shortcut hint
+            ]
+            [ i [ class "icon-plus" ] [] ]
+        , button
+            [ class "zoom-btn"
+            , onClick FitToScreen
+            , title "Fit to screen (Ctrl+Alt+0)"
+            ]
+            [ i [ class "icon-fit" ] [] ]
+        , button
+            [ class "zoom-btn"
+            , onClick ResetZoom
+            , title "Reset zoom (Ctrl+0)"
+            ]
+            [ i [ class "icon-reset" ] [] ]
+        ]
+
+
+{-| Tool selection buttons with keyboard shortcut hints.
+-}
+viewToolButtons : CursorMode -> Html Msg
+viewToolButtons cursorMode =
+    div [ class "tool-buttons" ]
+        [ button
+            [ class
+                (if cursorMode == CursorMode.Select then
+                    "tool-btn active"
+                 else
+                    "tool-btn"
+                )
+            , onClick (CursorMode CursorMode.Select)
+            , title "Select tool (v)"  -- Updated with shortcut hint
+            ]
+            [ i [ class "icon-cursor" ] [] ]
+        , button
+            [ class
+                (if cursorMode == CursorMode.Drag then
+                    "tool-btn active"
+                 else
+                    "tool-btn"
+                )
+            , onClick (CursorMode CursorMode.Drag)
+            , title "Drag tool (Alt+d)"  -- Updated with shortcut hint
+            ]
+            [ i [ class "icon-hand" ] [] ]
+        ]
+
+
+{-| Layout control buttons with keyboard shortcut hints.
+-}
+viewLayoutControls : Html Msg
+viewLayoutControls =
+    div [ class "layout-controls" ]
+        [ button
+            [ class "layout-btn"
+            , onClick (ArrangeTables AutoLayoutMethod.Dagre)
+            , title "Auto-arrange tables (Alt+a)"  -- Updated with shortcut hint
+            ]
+            [ i [ class "icon-layout" ] []
+            , span [] [ text "Arrange" ]
+            ]
+        ]
+
+
+{-| Table list toggle button with keyboard shortcut hint.
+-}
+viewTableListButton : Html Msg
+viewTableListButton =
+    button
+        [ class "table-list-btn"
+        , onClick (DetailsSidebarMsg DetailsSidebar.Toggle)
+        , title "Toggle table list (t)"  -- Updated with shortcut hint
+        ]
+        [ i [ class "icon-list" ] []
+        , span [] [ text "Tables" ]
+        ]
@@ -0,0 +1,102 @@
+module PagesComponents.Organization_.Project_.Views.Modals.Help exposing (viewHelp)
+
+{-| Help modal showing keyboard shortcuts and documentation.
+-}
+
+import Html exposing (Html, div, h3, kbd, span, table, tbody, td, text, th, thead, tr)
+import Html.Attributes exposing (class)
+
+
+{-| Render the help modal content.
+-}
+viewHelp : Html msg
+viewHelp =
+    div [ class "help-modal" ]
+        [ h3 [] [ text "Keyboard Shortcuts" ]
+        , viewShortcutsTable
+        ]
+
+
+{-| Render the shortcuts table organized by category.
+Updated with Issue #350 shortcuts.
+-}
+viewShortcutsTable : Html msg
+viewShortcutsTable =
+    table [ class "shortcuts-table" ]
+        [ thead []
+            [ tr []
+                [ th [] [ text "Shortcut" ]
+                , th [] [ text "Action" ]
+                ]
+            ]
+        , tbody []
+            (List.concat
+                [ viewCategory "Navigation & Zoom"
+                    [ ( [ "/" ], "Open search" )
+                    , ( [ "=" ], "Zoom in" )  -- NEW
+                    , ( [ "-" ], "Zoom out" )  -- NEW
+                    , ( [ "Ctrl", "0" ], "Reset zoom to 100%" )
+                    , ( [ "Ctrl", "Alt", "0" ], "Fit to screen" )
+                    , ( [ "Shift", "↑↓←→" ], "Pan canvas" )  -- NEW
+                    ]
+                , viewCategory "Tools"
+                    [ ( [ "v" ], "Select tool" )  -- NEW
+                    , ( [ "Alt", "d" ], "Drag/Pan tool" )  -- NEW
+                    , ( [ "t" ], "Toggle table list" )  -- NEW
+                    , ( [ "Alt", "a" ], "Auto-arrange tables (Dagre)" )  -- NEW
+                    ]
+                , viewCategory "Elements"
+                    [ ( [ "n" ], "Open notes" )
+                    , ( [ "m" ], "Create memo" )
+                    , ( [ "g" ], "Create group" )
+                    , ( [ "c" ], "Collapse element" )
+                    , ( [ "s" ], "Show element" )
+                    , ( [ "h", "Backspace", "Delete" ], "Hide element" )
+                    ]
+                , viewCategory "Selection & Movement"
+                    [ ( [ "↑↓←→" ], "Move selected tables" )
+                    , ( [ "Ctrl", "a" ], "Select all" )
+                    , ( [ "Ctrl", "↑↓" ], "Move table layer order" )
+                    ]
+                , viewCategory "History"
+                    [ ( [ "Ctrl", "z" ], "Undo" )
+                    , ( [ "Ctrl", "Shift", "z" ], "Redo" )
+                    , ( [ "Ctrl", "s" ], "Save project" )
+                    ]
+                , viewCategory "Other"
+                    [ ( [ "?" ], "Open this help" )
+                    , ( [ "Escape" ], "Cancel / Close" )
+                    ]
+                ]
+            )
+        ]
+
+
+{-| Render a category of shortcuts.
+-}
+viewCategory : String -> List ( List String, String ) -> List (Html msg)
+viewCategory categoryName shortcuts =
+    tr [ class "category-header" ]
+        [ td [ class "category-name" ] [ text categoryName ]
+        , td [] []
+        ]
+        :: List.map viewShortcut shortcuts
+
+
+{-| Render a single shortcut row.
+-}
+viewShortcut : ( List String, String ) -> Html msg
+viewShortcut ( keys, description ) =
+    tr [ class "shortcut-row" ]
+        [ td [ class "shortcut-keys" ]
+            [ span [] (List.intersperse (text " + ") (List.map viewKey keys))
+            ]
+        , td [ class "shortcut-description" ] [ text description ]
+        ]
+
+
+{-| Render a keyboard key.
+-}
+viewKey : String -> Html msg
+viewKey key =
+    kbd [ class "key" ] [ text key ]
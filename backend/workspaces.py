@@ -0,0 +1,147 @@
+"""Project workspaces under REPOS_DIR, provisioned from a shared base checkout.
+
+Each repo_url gets one base checkout, built once under REPOS_DIR/.base. A
+project workspace is a hardlink farm of that base: directories are created,
+files are linked, so provisioning costs one link per file and no file data
+is copied. Files are shared until written; everything that writes into a
+workspace must replace files (write_file: temp file + os.replace) rather
+than modify them in place, which would change the base and every other
+workspace. Base files are made read-only so an in-place write fails instead.
+
+When hardlinks are unavailable (e.g. REPOS_DIR spans filesystems), files are
+copied instead.
+"""
+import errno
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import uuid
+
+REPOS_DIR = os.getenv("REPOS_DIR", "./repos")
+BASE_DIR = os.path.join(REPOS_DIR, ".base")
+TRASH_DIR = os.path.join(REPOS_DIR, ".trash")
+
+DEFAULT_REPO_URL = "https://github.com/azimuttapp/azimutt"
+
+_base_locks = {}
+_base_locks_guard = threading.Lock()
+
+
+def repo_name(repo_url: str) -> str:
+    return repo_url.split("/")[-1].replace(".git", "") if repo_url else "azimutt"
+
+
+def workspace_path(project_id: int, repo_url: str) -> str:
+    return os.path.join(REPOS_DIR, f"{project_id}_{repo_name(repo_url)}")
+
+
+def base_path(repo_url: str) -> str:
+    key = hashlib.sha256(repo_url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(BASE_DIR, f"{repo_name(repo_url)}-{key}")
+
+
+def _populate_base(path: str, repo_url: str):
+    # For demo: a mock checkout of the Azimutt Elm project
+    os.makedirs(os.path.join(path, "frontend", "src", "PagesComponents", "Organization_", "Project_", "Updates"), exist_ok=True)
+    os.makedirs(os.path.join(path, "frontend", "ts-src"), exist_ok=True)
+
+    with open(os.path.join(path, "README.md"), 'w') as f:
+        f.write("# Azimutt\n\nDatabase schema explorer and visualizer with keyboard shortcuts support.\n")
+
+    with open(os.path.join(path, "frontend", "elm.json"), 'w') as f:
+        f.write('{"type": "application", "elm-version": "0.19.1"}\n')
+
+
+def _freeze(path: str):
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            mode = os.stat(file_path).st_mode
+            os.chmod(file_path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def ensure_base(repo_url: str) -> str:
+    """Path of the base checkout for repo_url, building it on first use."""
+    path = base_path(repo_url)
+    if os.path.isdir(path):
+        return path
+    with _base_locks_guard:
+        lock = _base_locks.setdefault(path, threading.Lock())
+    with lock:
+        if os.path.isdir(path):
+            return path
+        os.makedirs(BASE_DIR, exist_ok=True)
+        # Built aside and renamed into place, so a crash never leaves a partial base
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=BASE_DIR)
+        try:
+            _populate_base(staging, repo_url)
+            _freeze(staging)
+            os.rename(staging, path)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+    return path
+
+
+def _link_tree(source: str, target: str):
+    os.makedirs(target)
+    with os.scandir(source) as entries:
+        for entry in entries:
+            destination = os.path.join(target, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                _link_tree(entry.path, destination)
+            elif entry.is_symlink():
+                os.symlink(os.readlink(entry.path), destination)
+            else:
+                try:
+                    os.link(entry.path, destination)
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                        raise
+                    shutil.copy2(entry.path, destination)
+                    os.chmod(destination, os.stat(destination).st_mode | stat.S_IWUSR)
+
+
+def _discard(path: str):
+    # Renaming is instant; the tree itself is deleted off the request path
+    os.makedirs(TRASH_DIR, exist_ok=True)
+    doomed = os.path.join(TRASH_DIR, f"{os.path.basename(path)}-{uuid.uuid4().hex}")
+    os.rename(path, doomed)
+    threading.Thread(target=shutil.rmtree, args=(doomed,), kwargs={"ignore_errors": True}, daemon=True).start()
+
+
+def provision(project_id: int, repo_url: str) -> str:
+    """Fresh workspace for the project, replacing any previous one. Blocking."""
+    base = ensure_base(repo_url)
+    path = workspace_path(project_id, repo_url)
+    staging = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        _link_tree(base, staging)
+        if os.path.exists(path):
+            _discard(path)
+        os.rename(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return path
+
+
+def write_file(file_path: str, content: str):
+    """Write a workspace file by replacing it, never in place (see module docstring)."""
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
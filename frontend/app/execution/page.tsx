@@ -629,6 +629,8 @@ function ExecutionPageContent() {
   const [codeEditorWidth, setCodeEditorWidth] = useState(40); // percentage
   const logsEndRef = useRef<HTMLDivElement>(null);
   const logIntervalRef = useRef<NodeJS.Timeout | null>(null);
+  // Id of the newest log row shown, or null before the first page
+  const logCursorRef = useRef<number | null>(null);
   const logsContainerRef = useRef<HTMLDivElement>(null);
   const shouldAutoScroll = useRef(true);
   const executingRef = useRef(false);
@@ -807,8 +809,22 @@ function ExecutionPageContent() {
 
   const loadLogs = async () => {
     try {
-      const result = await getExecutionLogs(projectId);
-      setLogs(result.logs || []);
+      if (logCursorRef.current === null) {
+        // First load: the newest page, then only what was written since
+        const result = await getExecutionLogs(projectId, undefined, undefined, { latest: true });
+        logCursorRef.current = result.next_cursor;
+        setLogs(result.logs || []);
+        return;
+      }
+      let hasMore = true;
+      while (hasMore) {
+        const result = await getExecutionLogs(projectId, undefined, logCursorRef.current);
+        logCursorRef.current = result.next_cursor;
+        hasMore = result.has_more;
+        if (result.logs?.length) {
+          setLogs((prev) => [...prev, ...result.logs]);
+        }
+      }
     } catch (error) {
       console.error("Failed to load logs:", error);
     }
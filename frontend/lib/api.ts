@@ -44,6 +44,14 @@ export async function analyzeRepo(projectId: number) {
   return res.json();
 }
 
+export async function getRepoTree(projectId: number, path = "", offset = 0, limit = 200) {
+  // The browser revalidates with the listing's ETag and reuses it on 304
+  const params = new URLSearchParams({ project_id: String(projectId), path, offset: String(offset), limit: String(limit) });
+  const res = await fetch(`${API_BASE}/api/repos/tree?${params}`);
+  if (!res.ok) throw new Error("Failed to get repo tree");
+  return res.json();
+}
+
 export async function generatePlanQuestions(projectId: number) {
   const res = await fetch(`${API_BASE}/api/plan/questions?project_id=${projectId}`, {
     method: "POST",
@@ -142,13 +150,37 @@ export async function executionCommand(projectId: number, command: string) {
   return res.json();
 }
 
-export async function getExecutionLogs(projectId: number, taskId?: number) {
-  const url = `${API_BASE}/api/execution/logs/${projectId}${taskId ? `?task_id=${taskId}` : ""}`;
+export async function getExecutionLogs(
+  projectId: number,
+  taskId?: number,
+  sinceId?: number,
+  options: { beforeId?: number; latest?: boolean } = {}
+) {
+  // Pages come oldest first: pass next_cursor as sinceId for newer rows,
+  // latest for the newest page and prev_cursor as beforeId for older ones
+  const params = new URLSearchParams();
+  if (taskId) params.set("task_id", String(taskId));
+  if (sinceId) params.set("since_id", String(sinceId));
+  if (options.beforeId !== undefined) params.set("before_id", String(options.beforeId));
+  if (options.latest) params.set("latest", "true");
+  const url = `${API_BASE}/api/execution/logs/${projectId}${params.toString() ? `?${params}` : ""}`;
   const res = await fetch(url);
   if (!res.ok) throw new Error("Failed to get logs");
   return res.json();
 }
 
+export function streamExecutionLogs(
+  projectId: number,
+  onLog: (log: any) => void,
+  taskId?: number
+) {
+  // EventSource resends the last received id as Last-Event-ID on reconnect
+  const url = `${API_BASE}/api/execution/stream/${projectId}${taskId ? `?task_id=${taskId}` : ""}`;
+  const source = new EventSource(url);
+  source.addEventListener("log", (event) => onLog(JSON.parse((event as MessageEvent).data)));
+  return () => source.close();
+}
+
 export async function getExecutionStatus(projectId: number) {
   const res = await fetch(`${API_BASE}/api/execution/status/${projectId}`);
   if (!res.ok) throw new Error("Failed to get status");
@@ -165,8 +197,14 @@ export async function runTestCommand(projectId: number, command: string, args?:
   return res.json();
 }
 
-export async function getTestLogs(projectId: number) {
-  const res = await fetch(`${API_BASE}/api/testing/test-logs/${projectId}`);
+export async function getTestLogs(projectId: number, sinceId?: number, beforeId?: number) {
+  // Newest first: pass next_cursor as sinceId for newer results, prev_cursor
+  // as beforeId for older ones
+  const params = new URLSearchParams();
+  if (sinceId !== undefined) params.set("since_id", String(sinceId));
+  if (beforeId !== undefined) params.set("before_id", String(beforeId));
+  const query = params.toString() ? `?${params}` : "";
+  const res = await fetch(`${API_BASE}/api/testing/test-logs/${projectId}${query}`);
   if (!res.ok) throw new Error("Failed to get test logs");
   return res.json();
 }